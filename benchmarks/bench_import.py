@@ -0,0 +1,59 @@
+"""
+Import-time benchmark
+
+Measures, in fresh interpreters, the time spent in 'import modal' (numpy is
+imported beforehand so that it is not counted) and the time of the first
+get_mode call, which triggers the lazy table construction.
+
+Usage:
+    python benchmarks/bench_import.py [--runs N] [--path CHECKOUT]
+
+--path points at another checkout (e.g. an older revision extracted with
+'git worktree add') so that the two can be compared on the same machine.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPET = '''
+import json, time
+import numpy
+t0 = time.perf_counter()
+import modal
+t1 = time.perf_counter()
+modal.modal.Modal().get_mode('C', 'major', 0)
+t2 = time.perf_counter()
+print(json.dumps({'import': t1 - t0, 'first_get_mode': t2 - t1}))
+'''
+
+
+def measure(path: str = ROOT, runs: int = 20) -> dict:
+    """
+    Measure import and first-call times
+    :param path: directory containing the modal package
+    :param runs: number of fresh interpreters
+    :return: median times in seconds
+    """
+    env = dict(os.environ, PYTHONPATH=path)
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', SNIPPET], env=env, cwd=path,
+                             capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(out))
+    return {key: statistics.median(s[key] for s in samples) for key in samples[0]}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--path', default=ROOT)
+    args = parser.parse_args()
+
+    result = measure(args.path, args.runs)
+    for key, value in result.items():
+        print('%-16s %8.2f ms' % (key, value * 1000))
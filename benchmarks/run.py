@@ -0,0 +1,191 @@
+"""
+Benchmark suite
+
+Measures import time, single-call latency and throughput of the Chord and
+Modal lookups, harmonization and rendering, and a full sweep over every
+(root, scale, mode). The plain cases measure warm caches (repeated calls);
+the '.cold' cases drop the Modal caches before every call, so they measure
+the work done on a miss. Results are written as JSON; when a baseline file
+is given, any benchmark slower than the baseline by more than the tolerance
+is reported and the exit status is 1.
+
+Every benchmark keeps the best of its timing repetitions and records their
+median too. A benchmark is slower than the baseline when its best timing
+exceeds the baseline median by more than the tolerance. Slower benchmarks
+are run a second time and only reported if the best of both runs still is,
+so a single noisy run does not fail the comparison.
+
+benchmarks/baseline.json holds reference numbers; its metadata records the
+interpreter, numpy version, platform and the commit it was measured at.
+Regenerate it with --output at the tip of any series of changes that moves
+the numbers on purpose, and commit it with them, so that the next comparison
+starts from the current code. Timings are machine specific: to compare on
+another machine, first regenerate the baseline there at its recorded commit.
+
+Usage:
+    python benchmarks/run.py [--output results.json] [--baseline baseline.json] [--tolerance 0.5]
+                             [--filter NAME] [--quick]
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import timeit
+
+import numpy as np
+
+import bench_import
+
+sys.path.insert(0, bench_import.ROOT)
+
+from modal.chord import Chord  # noqa: E402
+from modal.modal import Modal  # noqa: E402
+from modal.symbol import chromatic  # noqa: E402
+
+
+def _cases():
+    chord = Chord()
+    modal = Modal()
+    ionian = np.array([0, 2, 4, 5, 7, 9, 11])
+    scales = modal.scales()[:4]
+    combos = [(r, s, m) for r in chromatic for s in scales for m in range(7)]
+
+    def sweep():
+        for r, s, m in combos:
+            modal.get_mode(r, s, m)
+            modal.mode_harmonization(r, s, m)
+            modal.print_mode_harmonization(r, s, m)
+
+    def cold(fn):
+        # the modes tables, interned modes and harmonizations are built again by every call
+        def call():
+            Modal.clear_caches()
+            return fn()
+        return call
+
+    return {
+        'chord.find_triad_chord': lambda: chord.find_triad_chord(ionian),
+        'chord.find_7th_chord': lambda: chord.find_7th_chord(ionian),
+        'chord.find_9th_chord': lambda: chord.find_9th_chord(ionian),
+        'chord.find_11th_chord': lambda: chord.find_11th_chord(ionian),
+        'chord.find_13th_chord': lambda: chord.find_13th_chord(ionian),
+        'modal.get_mode': lambda: modal.get_mode('D', 'melodic minor', 3),
+        'modal.mode_harmonization': lambda: modal.mode_harmonization('D', 'melodic minor', 3),
+        'modal.print_mode_harmonization': lambda: modal.print_mode_harmonization('D', 'melodic minor', 3),
+        'sweep.336': sweep,
+        'modal.get_mode.cold': cold(lambda: modal.get_mode('D', 'melodic minor', 3)),
+        'modal.mode_harmonization.cold': cold(lambda: modal.mode_harmonization('D', 'melodic minor', 3)),
+        'sweep.336.cold': cold(sweep),
+    }
+
+
+def run(names: list | None = None, repeat: int = 7, import_runs: int = 20) -> dict:
+    """
+    Run the benchmarks
+    :param names: benchmark names to run (all if None)
+    :param repeat: timing repetitions (the best is kept)
+    :param import_runs: fresh interpreters for the import benchmark
+    :return: name -> {'seconds': per call (best), 'median': per call (median), 'per_second': throughput}
+    """
+    results = {}
+    if names is None or 'import' in names:
+        seconds = bench_import.measure(runs=import_runs)['import']
+        results['import'] = {'seconds': seconds, 'median': seconds, 'per_second': 1.0 / seconds}
+    for name, fn in _cases().items():
+        if names is not None and name not in names:
+            continue
+        fn()  # warm up lazy tables
+        timer = timeit.Timer(fn)
+        number, _ = timer.autorange()
+        timings = sorted(t / number for t in timer.repeat(repeat=repeat, number=number))
+        results[name] = {'seconds': timings[0], 'median': timings[len(timings) // 2], 'per_second': 1.0 / timings[0]}
+    return results
+
+
+def best(*runs: dict) -> dict:
+    """
+    Merge the results of several runs, keeping the best timing of each benchmark
+    :param runs: benchmark results
+    :return: name -> result of the run where it was fastest
+    """
+    merged = {}
+    for results in runs:
+        for name, result in results.items():
+            if name not in merged or result['seconds'] < merged[name]['seconds']:
+                merged[name] = result
+    return merged
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Find regressions against a baseline: best timings slower than the baseline median by more than the tolerance
+    :param results: current benchmark results
+    :param baseline: baseline benchmark results
+    :param tolerance: accepted relative slowdown (0.5 = 50 %)
+    :return: list of (name, baseline median seconds, current best seconds)
+    """
+    regressions = []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        reference = before.get('median', before['seconds'])
+        if current['seconds'] > reference * (1.0 + tolerance):
+            regressions.append((name, reference, current['seconds']))
+    return regressions
+
+
+def _metadata() -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=bench_import.ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'commit': commit,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='compare against this JSON results file')
+    parser.add_argument('--tolerance', type=float, default=0.5)
+    parser.add_argument('--filter', action='append', help='only run this benchmark (repeatable)')
+    parser.add_argument('--quick', action='store_true', help='fewer repetitions')
+    args = parser.parse_args()
+
+    options = {'repeat': 3, 'import_runs': 5} if args.quick else {}
+    results = run(args.filter, **options)
+    for name, result in results.items():
+        print('%-34s %12.2f us %12.2f us median %14.0f /s' % (name, result['seconds'] * 1e6, result['median'] * 1e6,
+                                                             result['per_second']))
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        recorded = baseline.get('metadata', {})
+        print('baseline: commit %s, %s' % (recorded.get('commit'), recorded.get('platform')))
+        regressions = compare(results, baseline['results'], args.tolerance)
+        if regressions:
+            # confirm on a second run before reporting
+            names = [name for name, _, _ in regressions]
+            print('rerunning: ' + ', '.join(names))
+            results = best(results, run(names, **options))
+            regressions = compare(results, baseline['results'], args.tolerance)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'metadata': _metadata(), 'results': results}, f, indent=2)
+
+    if args.baseline:
+        for name, before, after in regressions:
+            print('REGRESSION %s: %.2f us -> %.2f us (%+.0f %%)' % (name, before * 1e6, after * 1e6,
+                                                                   (after / before - 1.0) * 100))
+        if regressions:
+            sys.exit(1)
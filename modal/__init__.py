@@ -1,3 +1,16 @@
 from . import symbol
+from . import spelling
+from . import pitchclass
+from . import mode
 from . import modal
 from . import chord
+from . import catalog
+from . import stream
+from . import index
+from . import fit
+from . import render
+from . import instrument
+from . import voicing
+from . import voiceleading
+from . import chroma
+from . import midi
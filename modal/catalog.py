@@ -0,0 +1,161 @@
+import json
+import numpy as np
+from collections import OrderedDict
+from .chord import Chord
+from .pitchclass import PitchClassSet
+from .spelling import pitch_classes, normalize, names
+
+MAGIC = b'MODALCAT'
+VERSION = 2
+NONE = 0xFFFFFFFF
+
+# file layout:
+#   magic (8 bytes) | version (uint32) | header length (uint32) | JSON header | arrays (8-byte aligned)
+# the header only describes the arrays; every string (note, mode and chord names) lives in a string
+# table (offsets + utf-8 blob) and the other arrays hold indices into it.
+_PREAMBLE = np.dtype([('magic', 'S8'), ('version', '<u4'), ('header', '<u4')])
+
+
+def compile_catalog(path: str, modal=None) -> None:
+    """
+    Compile the full harmonization catalog (every root spelling up to double accidentals, scale and mode,
+    all chord levels) to a binary file
+    :param path: output file path
+    :param modal: Modal instance (a fresh one if None)
+    """
+    if modal is None:
+        from .modal import Modal
+        modal = Modal()
+
+    bulk = modal.get_modes_bulk(roots=names)
+    scales = list(OrderedDict.fromkeys(bulk['scale'].tolist()))
+    root_order = {root: i for i, root in enumerate(OrderedDict.fromkeys(bulk['root'].tolist()))}
+    n_roots = len(root_order)
+    n_modes = max(len(modal.get_modes_name(scale)) for scale in scales)
+    shape = (n_roots, len(scales), n_modes)
+
+    strings = OrderedDict()
+
+    def intern(value) -> int:
+        if value is None or value == '':
+            return NONE
+        return strings.setdefault(value, len(strings))
+
+    roots = np.full(n_roots, NONE, dtype='<u4')
+    mode_names = np.full(shape, NONE, dtype='<u4')
+    notes = np.full(shape + (bulk['notes'].shape[1],), NONE, dtype='<u4')
+    notes_idx = np.full(shape + (bulk['notes'].shape[1],), -1, dtype='i1')
+    chords = np.full(shape + (len(Chord.levels),), NONE, dtype='<u4')
+    for row in bulk:
+        r, s, m = root_order[str(row['root'])], scales.index(str(row['scale'])), int(row['mode'])
+        roots[r] = intern(str(row['root']))
+        mode_names[r, s, m] = intern(str(row['mode name']))
+        notes[r, s, m] = [intern(n) for n in row['notes'].tolist()]
+        notes_idx[r, s, m] = row['notes_idx']
+        chords[r, s, m] = [intern(str(row[level])) for level in Chord.levels]
+
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype='<u4')
+    offsets[1:] = np.cumsum([len(e) for e in encoded])
+    blob = np.frombuffer(b''.join(encoded), dtype='u1')
+
+    arrays = OrderedDict([
+        ('string_offsets', offsets),
+        ('string_blob', blob),
+        ('roots', roots),
+        ('mode_names', mode_names),
+        ('notes', notes),
+        ('notes_idx', notes_idx),
+        ('chords', chords),
+    ])
+    header = {
+        'scales': scales,
+        'modes': {scale: list(modal.get_modes_name(scale)) for scale in scales},
+        'levels': list(Chord.levels),
+        'arrays': OrderedDict(),
+    }
+    # offsets are relative to the end of the header, so they do not depend on its length
+    offset = 0
+    for name, array in arrays.items():
+        header['arrays'][name] = [offset, array.dtype.str, list(array.shape)]
+        offset += (array.nbytes + 7) // 8 * 8
+    header_bytes = json.dumps(header).encode('utf-8')
+    header_bytes += b' ' * (-(len(header_bytes) + _PREAMBLE.itemsize) % 8)
+
+    with open(path, 'wb') as f:
+        f.write(np.array([(MAGIC, VERSION, len(header_bytes))], dtype=_PREAMBLE).tobytes())
+        f.write(header_bytes)
+        for array in arrays.values():
+            data = np.ascontiguousarray(array).tobytes()
+            f.write(data + b'\0' * (-len(data) % 8))
+
+
+class Catalog(object):
+    """
+    Read-only view of a compiled catalog file, memory-mapped so that processes share its pages
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._buffer = np.memmap(path, dtype='u1', mode='r')
+        preamble = self._buffer[:_PREAMBLE.itemsize].view(_PREAMBLE)[0]
+        if preamble['magic'] != MAGIC:
+            raise Exception('Not a modal catalog.')
+        if preamble['version'] != VERSION:
+            raise Exception('Not supported catalog version.')
+        start = _PREAMBLE.itemsize + int(preamble['header'])
+        header = json.loads(bytes(self._buffer[_PREAMBLE.itemsize:start]).decode('utf-8'))
+
+        self.scales = header['scales']
+        self.modes = header['modes']
+        self.levels = header['levels']
+        self._arrays = {}
+        for name, (offset, dtype, shape) in header['arrays'].items():
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape))
+            self._arrays[name] = np.frombuffer(self._buffer, dtype=dtype, count=count,
+                                               offset=start + offset).reshape(shape)
+        self._strings = {}
+        self._scale_index = {scale: i for i, scale in enumerate(self.scales)}
+        self._root_index = {self.string(int(s)): i for i, s in enumerate(self._arrays['roots'])}
+
+    def string(self, index: int) -> str | None:
+        """
+        Decode an entry of the string table
+        :param index: string index
+        :return: string (None for the missing marker)
+        """
+        if index == NONE:
+            return None
+        value = self._strings.get(index)
+        if value is None:
+            offsets = self._arrays['string_offsets']
+            value = bytes(self._arrays['string_blob'][offsets[index]:offsets[index + 1]]).decode('utf-8')
+            self._strings[index] = value
+        return value
+
+    def get_mode(self, root: str = 'C', scale: str = 'major', mode: int = 0) -> dict:
+        """
+        Same as Modal.get_mode, read from the catalog
+        """
+        r = self._root_index.get(root)
+        if r is None and root in pitch_classes:
+            r = self._root_index.get(normalize(root))
+        if r is None:
+            raise Exception('Not valid root note.')
+        s = self._scale_index.get(scale)
+        if s is None:
+            raise Exception('Not supported scale.')
+        if not (0 <= mode < len(self.modes[scale])):
+            raise Exception('Not valid mode.')
+
+        notes_idx = self._arrays['notes_idx'][r, s, mode]
+        notes_idx = notes_idx[notes_idx >= 0]
+        md = {
+            'mode name': self.string(int(self._arrays['mode_names'][r, s, mode])),
+            'notes': np.array([self.string(int(i)) for i in self._arrays['notes'][r, s, mode][:len(notes_idx)]]),
+        }
+        for level, index in zip(self.levels, self._arrays['chords'][r, s, mode].tolist()):
+            md[level] = self.string(index)
+        md['pitch_class_set'] = PitchClassSet.from_intervals(notes_idx)
+        return md
@@ -1,5 +1,13 @@
 import numpy as np
-from symbol import *
+from .symbol import *
+from .pitchclass import PitchClassSet, to_mask
+from .instrument import register_cache
+
+
+def _ranked(chords: dict) -> list:
+    # (symbol, mask) by decreasing priority, then in registration order
+    entries = sorted(chords.values(), key=lambda c: -c.get('priority', 0))
+    return [(c['symbol'], to_mask(c['intervals'])) for c in entries]
 
 
 class Chord(object):
@@ -66,96 +74,435 @@ class Chord(object):
         },
         'sus7_chord': {
             'intervals': [0, 5, 7, 10],
-            'symbol': 'sus7'
+            'symbol': 'sus7',
+            'aliases': ('7sus4',)
         }
     }
 
-    def find_triad_chord(self, intervals: np.array) -> str | None:
+    # optional chord types, added with register_chords(Chord.extended_vocabulary); their negative priority keeps
+    # the default chords first, so they only name sets the default vocabulary does not cover and otherwise
+    # appear as alternatives in find_candidates
+    extended_vocabulary = [
+        {'symbol': '5', 'intervals': [0, 7], 'level': 'triad_chord', 'priority': -2},
+        {'symbol': 'quartal', 'intervals': [0, 5, 10], 'level': 'triad_chord', 'priority': -1},
+        {'symbol': '6', 'intervals': [0, 4, 7, 9], 'priority': -1, 'aliases': ('maj6',)},
+        {'symbol': 'm6', 'intervals': [0, 3, 7, 9], 'priority': -1, 'aliases': ('min6',)},
+        {'symbol': 'add9', 'intervals': [0, 2, 4, 7], 'priority': -1, 'aliases': ('add2',)},
+        {'symbol': 'madd9', 'intervals': [0, 2, 3, 7], 'priority': -1},
+        {'symbol': '7' + sharp + '5', 'intervals': [0, 4, 8, 10], 'priority': -1, 'aliases': ('7+5', '7+')},
+        {'symbol': '7alt', 'intervals': [0, 1, 3, 4, 6, 8, 10], 'priority': -1},
+    ]
+
+    levels = ('triad_chord', '7th_chord', '9th_chord', '11th_chord', '13th_chord')
+
+    _triad_masks = _ranked(triads)
+    _7th_masks = _ranked(chords7th)
+
+    _table = None
+    # lookups answered by the table (hits) and table builds (misses)
+    _table_stats = {'hits': 0, 'misses': 0}
+    _symbol_masks = None
+    _candidates = {}
+    _aliases = {alias: c['symbol'] for c in chords7th.values() for alias in c.get('aliases', ())}
+    _listeners = []
+
+    # incremented on every vocabulary change, for caches depending on the chord symbols
+    version = 0
+
+    @classmethod
+    def register_chord(cls, symbol: str, intervals, level: str = '7th_chord', priority: int = 0,
+                       aliases: tuple = ()) -> None:
+        """
+        Add a chord type to the vocabulary (or replace the one with the same symbol). When several chord types
+        fit a pitch class set, the highest priority wins, then the first registered.
+        :param symbol: chord symbol without root, e.g. '6'
+        :param intervals: chord intervals from the root
+        :param level: 'triad_chord' or '7th_chord' (the 9th, 11th and 13th levels extend the 7th chords)
+        :param priority: priority over the other chord types of the level (default chords have 0)
+        :param aliases: other symbols accepted for this chord type (e.g. by symbol_mask)
+        """
+        cls.register_chords([{'symbol': symbol, 'intervals': intervals, 'level': level, 'priority': priority,
+                              'aliases': tuple(aliases)}])
+
+    @classmethod
+    def register_chords(cls, entries) -> None:
+        """
+        Add many chord types at once, updating the lookup tables once
+        :param entries: dicts with the register_chord arguments (e.g. Chord.extended_vocabulary)
+        """
+        changed = []
+        for entry in entries:
+            level = entry.get('level', '7th_chord')
+            if level not in ('triad_chord', '7th_chord'):
+                raise Exception('Not valid chord level.')
+            mask = to_mask(entry['intervals'])
+            if not mask & 1:
+                raise Exception('Not valid chord intervals.')
+            chords = cls.triads if level == 'triad_chord' else cls.chords7th
+            name = next((key for key, c in chords.items() if c['symbol'] == entry['symbol']),
+                        entry['symbol'] + '_chord')
+            if name in chords:
+                changed.append(to_mask(chords[name]['intervals']))
+                for alias in chords[name].get('aliases', ()):
+                    if cls._aliases.get(alias) == entry['symbol']:
+                        del cls._aliases[alias]
+            chords[name] = {
+                'intervals': PitchClassSet(mask).intervals(),
+                'symbol': entry['symbol'],
+                'priority': entry.get('priority', 0),
+                'aliases': tuple(entry.get('aliases', ())),
+            }
+            for alias in chords[name]['aliases']:
+                cls._aliases[alias] = entry['symbol']
+            changed.append(mask)
+        cls._changed(changed)
+
+    @classmethod
+    def unregister_chord(cls, symbol: str) -> None:
+        """
+        Remove a chord type from the vocabulary
+        :param symbol: chord symbol without root
+        """
+        for chords in (cls.triads, cls.chords7th):
+            for name, c in list(chords.items()):
+                if c['symbol'] == symbol:
+                    del chords[name]
+                    for alias in c.get('aliases', ()):
+                        cls._aliases.pop(alias, None)
+                    cls._changed([to_mask(c['intervals'])])
+                    return
+        raise Exception('Not valid chord symbol.')
+
+    @classmethod
+    def vocabulary(cls) -> list:
+        """
+        Get the chord types (e.g. to set up the same vocabulary in another process)
+        :return: register_chords entries, in registration order
+        """
+        return [{'symbol': c['symbol'], 'intervals': [int(i) for i in c['intervals']], 'level': level,
+                 'priority': c.get('priority', 0), 'aliases': list(c.get('aliases', ()))}
+                for level, chords in (('triad_chord', cls.triads), ('7th_chord', cls.chords7th))
+                for c in chords.values()]
+
+    @classmethod
+    def set_vocabulary(cls, entries) -> None:
+        """
+        Replace every chord type (nothing is done if the vocabulary is already the same)
+        :param entries: register_chords entries, e.g. from vocabulary()
+        """
+        entries = list(entries)
+        current = cls.vocabulary()
+        if entries != current:
+            for entry in current:
+                cls.unregister_chord(entry['symbol'])
+            cls.register_chords(entries)
+
+    @classmethod
+    def on_change(cls, callback) -> None:
+        """
+        Call a function after every vocabulary change (e.g. to clear a cache)
+        :param callback: function without arguments
+        """
+        cls._listeners.append(callback)
+
+    @classmethod
+    def _changed(cls, masks: list) -> None:
+        cls._triad_masks = _ranked(cls.triads)
+        cls._7th_masks = _ranked(cls.chords7th)
+        cls._symbol_masks = None
+        # only the supersets of a changed chord can be identified differently
+        all_masks = np.arange(4096)
+        affected = np.zeros(4096, dtype=bool)
+        for mask in masks:
+            affected |= all_masks & mask == mask
+        rows = all_masks[affected]
+        if cls._table is not None:
+            cls._fill(cls._table, rows)
+        for level in list(cls._candidates):
+            cls._fill_candidates(level, rows)
+        cls.version += 1
+        for callback in cls._listeners:
+            callback()
+
+    @classmethod
+    def lookup_table(cls) -> dict:
+        """
+        Chord symbols of every pitch class subset, indexed by 12-bit mask
+        (built on first use)
+        :return: dict of 4096-long arrays
+            - 'triad_chord', '7th_chord', '9th_chord', '11th_chord', '13th_chord': symbols (None if not found)
+            - 'triad_mask', '7th_mask', '9th_mask', '11th_mask', '13th_mask': chord tones of each level,
+              i.e. the matched triad or 7th chord plus the extensions of the level (0 if not found)
+        """
+        if cls._table is None:
+            cls._table_stats['misses'] += 1
+            cls._table = cls._build_table()
+        else:
+            cls._table_stats['hits'] += 1
+        return cls._table
+
+    @classmethod
+    def _build_table(cls) -> dict:
+        table = {
+            'triad_chord': np.full(4096, None, dtype=object),
+            '7th_chord': np.full(4096, None, dtype=object),
+            '9th_chord': np.full(4096, None, dtype=object),
+            '11th_chord': np.full(4096, None, dtype=object),
+            '13th_chord': np.full(4096, None, dtype=object),
+            'triad_mask': np.zeros(4096, dtype=np.int64),
+            '7th_mask': np.zeros(4096, dtype=np.int64),
+            '9th_mask': np.zeros(4096, dtype=np.int64),
+            '11th_mask': np.zeros(4096, dtype=np.int64),
+            '13th_mask': np.zeros(4096, dtype=np.int64),
+        }
+        cls._fill(table, np.arange(4096))
+        return table
+
+    @classmethod
+    def _fill(cls, table: dict, masks: np.ndarray) -> None:
+        # (re)compute the rows of some masks
+        for level in cls.levels:
+            table[level][masks] = None
+            table[level[:-len('_chord')] + '_mask'][masks] = 0
+        # assign in reverse order so that the first matching entry wins
+        for symbol, triad in reversed(cls._triad_masks):
+            found = masks[masks & triad == triad]
+            table['triad_chord'][found] = symbol
+            table['triad_mask'][found] = triad
+        for symbol, chord in reversed(cls._7th_masks):
+            found = masks[masks & chord == chord]
+            table['7th_chord'][found] = symbol
+            table['7th_mask'][found] = chord
+
+        # extensions only depend on the 7th chord and on the 9th, 11th and 13th degrees left over
+        found = masks[table['7th_mask'][masks] != 0]
+        diffs = found & ~table['7th_mask'][found] & 0x77E
+        symbols = table['7th_chord'][found]
+        extensions = {}
+        for key in set(zip(symbols.tolist(), diffs.tolist())):
+            symbol, diff = key
+            diff_set = frozenset(PitchClassSet(diff))
+            extensions[key] = (cls._9th_symbol(symbol, diff_set),
+                               cls._11th_symbol(symbol, diff_set),
+                               cls._13th_symbol(symbol, diff_set))
+        rows = [extensions[key] for key in zip(symbols.tolist(), diffs.tolist())]
+        for level, column in zip(('9th_chord', '11th_chord', '13th_chord'), zip(*rows)):
+            table[level][found] = column
+
+        # the 9th, 11th and 13th levels add the 9th, then 11th, then 13th degrees to the 7th chord tones
+        extension = masks & ~table['7th_mask'][masks] & 0x77E
+        for level, degrees in (('9th', 0x00E), ('11th', 0x07E), ('13th', 0x77E)):
+            table[level + '_mask'][masks] = np.where(table[level + '_chord'][masks] != None,  # noqa: E711
+                                                     table['7th_mask'][masks] | extension & degrees, 0)
+
+    def find_triad_chord(self, intervals: np.ndarray | PitchClassSet) -> str | None:
         """
         Find the triad chord
-        :param intervals: scale intervals
+        :param intervals: scale intervals or pitch class set
         :return: chord symbol
         """
-        symbol = None
-        for triad in self.triads.keys():
-            if np.isin(intervals, self.triads[triad]['intervals']).sum() == 3:
-                symbol = self.triads[triad]['symbol']
-                break
-        return symbol
+        return self.lookup_table()['triad_chord'][to_mask(intervals)]
 
-    def find_7th_chord(self, intervals: np.array) -> tuple:
+    def find_7th_chord(self, intervals: np.ndarray | PitchClassSet) -> tuple:
         """
         Find the 7th chord
-        :param intervals: scale intervals
-        :return: chord symbol and diff array
-        """
-        symbol = None
-        diff = None
-        for chord in self.chords7th.keys():
-            if np.isin(intervals, self.chords7th[chord]['intervals']).sum() == 4:
-                symbol = self.chords7th[chord]['symbol']
-                diff = intervals[np.logical_not(np.isin(intervals, self.chords7th[chord]['intervals']))]
-                break
+        :param intervals: scale intervals or pitch class set
+        :return: chord symbol and diff (same type as intervals)
+        """
+        table = self.lookup_table()
+        mask = to_mask(intervals)
+        symbol = table['7th_chord'][mask]
+        if symbol is None:
+            return None, None
+        diff = PitchClassSet(mask & ~int(table['7th_mask'][mask]))
+        if not isinstance(intervals, PitchClassSet):
+            diff = diff.intervals()
         return symbol, diff
 
-    def find_9th_chord(self, intervals: np.array) -> str | None:
+    def find_9th_chord(self, intervals: np.ndarray | PitchClassSet) -> str | None:
         """
         Find the 9th chord
-        :param intervals: scale intervals
+        :param intervals: scale intervals or pitch class set
+        :return: chord symbol
+        """
+        return self.lookup_table()['9th_chord'][to_mask(intervals)]
+
+    def find_11th_chord(self, intervals: np.ndarray | PitchClassSet) -> str | None:
+        """
+        Find the 11th chord
+        :param intervals: scale intervals or pitch class set
+        :return: chord symbol
+        """
+        return self.lookup_table()['11th_chord'][to_mask(intervals)]
+
+    def find_13th_chord(self, intervals: np.ndarray | PitchClassSet) -> str | None:
+        """
+        Find the 13th chord
+        :param intervals: scale intervals or pitch class set
         :return: chord symbol
         """
-        symbol, diff = self.find_7th_chord(intervals)
-        check = self.check9th(diff)
+        return self.lookup_table()['13th_chord'][to_mask(intervals)]
+
+    def find_candidates(self, intervals: np.ndarray | PitchClassSet, level: str = 'triad_chord') -> tuple:
+        """
+        Find every chord of a level fitting a pitch class set, best first (the first one is the find_* result)
+        :param intervals: scale intervals or pitch class set
+        :param level: 'triad_chord', '7th_chord', '9th_chord', '11th_chord' or '13th_chord'
+        :return: tuple of chord symbols
+        """
+        if level not in self.levels:
+            raise Exception('Not valid chord level.')
+        mask = to_mask(intervals)
+        if level == 'triad_chord':
+            return self._ranked_candidates('triad_chord')[mask]
+        sevenths = self._ranked_candidates('7th_chord')[mask]
+        if level == '7th_chord':
+            return tuple(symbol for symbol, _ in sevenths)
+        extend = {'9th_chord': self._9th_symbol, '11th_chord': self._11th_symbol, '13th_chord': self._13th_symbol}
+        found = []
+        for symbol, chord in sevenths:
+            extended = extend[level](symbol, frozenset(PitchClassSet(mask & ~chord & 0x77E)))
+            if extended is not None:
+                found.append(extended)
+        return tuple(found)
+
+    @classmethod
+    def _ranked_candidates(cls, level: str) -> np.ndarray:
+        if level not in cls._candidates:
+            cls._candidates[level] = np.empty(4096, dtype=object)
+            cls._fill_candidates(level, np.arange(4096))
+        return cls._candidates[level]
+
+    @classmethod
+    def _fill_candidates(cls, level: str, masks: np.ndarray) -> None:
+        entries = cls._triad_masks if level == 'triad_chord' else cls._7th_masks
+        chords = np.array([chord for _, chord in entries], dtype=np.int64)
+        fits = masks[:, None] & chords[None, :] == chords[None, :]
+        column = cls._candidates[level]
+        for mask, row in zip(masks.tolist(), fits):
+            found = [entries[i] for i in np.flatnonzero(row).tolist()]
+            # the 7th chords keep their mask to derive the extensions
+            column[mask] = tuple(symbol for symbol, _ in found) if level == 'triad_chord' else tuple(found)
+
+    def identify_many(self, masks: np.ndarray) -> dict:
+        """
+        Identify the chords of many pitch class sets at once
+        :param masks: array of 12-bit masks or N x 12 boolean matrix
+        :return: dict of symbol arrays keyed by chord level
+            ('triad_chord', '7th_chord', '9th_chord', '11th_chord', '13th_chord')
+        """
+        masks = np.asarray(masks)
+        if masks.ndim == 2:
+            if masks.shape[1] != 12:
+                raise Exception('Not valid pitch class matrix.')
+            masks = masks.astype(bool) @ (1 << np.arange(12))
+        masks = masks.astype(np.int64) & 0xFFF
+        table = self.lookup_table()
+        return {level: table[level][masks] for level in self.levels}
+
+    def chord_tones(self, intervals: np.ndarray | PitchClassSet, level: str = '7th_chord') -> int:
+        """
+        Find the chord tones of a chord level
+        :param intervals: scale intervals or pitch class set
+        :param level: 'triad_chord', '7th_chord', '9th_chord', '11th_chord' or '13th_chord'
+        :return: 12-bit mask of the chord tones (0 if no chord found)
+        """
+        if level not in self.levels:
+            raise Exception('Not valid chord level.')
+        return int(self.lookup_table()[level[:-len('_chord')] + '_mask'][to_mask(intervals)])
+
+    @classmethod
+    def resolve(cls, symbol: str) -> str:
+        """
+        Symbol of a chord type from one of its aliases
+        :param symbol: chord symbol or alias without root, e.g. '7sus4'
+        :return: chord symbol, e.g. 'sus7' (the argument if it is not an alias)
+        """
+        return cls._aliases.get(symbol, symbol)
+
+    @classmethod
+    def symbol_mask(cls, symbol: str) -> int | None:
+        """
+        Find the chord tones of a chord symbol (without root), i.e. the smallest pitch class set
+        identified with it, looking at the lower chord levels first
+        :param symbol: chord symbol or alias, e.g. 'm7'
+        :return: 12-bit mask of the intervals from the root, None if unknown
+        """
+        symbol = cls.resolve(symbol)
+        if cls._symbol_masks is None:
+            table = cls.lookup_table()
+            by_size = np.argsort([bin(m).count('1') for m in range(4096)], kind='stable').tolist()
+            symbol_masks = {}
+            for level in cls.levels:
+                column = table[level]
+                for mask in by_size:
+                    if column[mask] is not None and column[mask] not in symbol_masks:
+                        symbol_masks[column[mask]] = mask
+            cls._symbol_masks = symbol_masks
+        return cls._symbol_masks.get(symbol)
+
+    @staticmethod
+    def _extend(symbol: str, degree: str) -> str:
+        # the 7 of the symbol becomes the highest degree; chord types without a 7 (e.g. '6') get it appended
+        if '7' in symbol:
+            return symbol.replace('7', degree)
+        return symbol + '(' + degree + ')'
+
+    @staticmethod
+    def _9th_symbol(symbol: str, diff: frozenset) -> str | None:
+        check = Chord.check9th(diff)
+        if check is None:
+            return None
 
         if check == '9':
-            symbol = symbol.replace('7', '9')
+            symbol = Chord._extend(symbol, '9')
         else:
             symbol += '(' + check + ')'
         return symbol
 
-    def find_11th_chord(self, intervals: np.array) -> str | None:
-        """
-        Find the 11th chord
-        :param intervals: scale intervals
-        :return: chord symbol
-        """
-        symbol, diff = self.find_7th_chord(intervals)
-        check9th = self.check9th(diff)
-        check11th = self.check11th(diff)
+    @staticmethod
+    def _11th_symbol(symbol: str, diff: frozenset) -> str | None:
+        check9th = Chord.check9th(diff)
+        check11th = Chord.check11th(diff)
 
         if check9th == '9':
             if check11th == '11':
-                symbol = symbol.replace('7', '11')
-            else:
-                symbol = symbol.replace('7', '9')
+                symbol = Chord._extend(symbol, '11')
+            elif check11th is not None:
+                symbol = Chord._extend(symbol, '9')
                 symbol += '(' + check11th + ')'
-        else:
+            else:
+                return None
+        elif check9th is not None and check11th is not None:
             symbol += '(' + check9th + ',' + check11th + ')'
+        else:
+            return None
         return symbol
 
-    def find_13th_chord(self, intervals: np.array) -> str | None:
-        """
-        Find the 13th chord
-        :param intervals: scale intervals
-        :return: chord symbol
-        """
-        symbol, diff = self.find_7th_chord(intervals)
-        check9th = self.check9th(diff)
-        check11th = self.check11th(diff)
-        check13th = self.check13th(diff)
+    @staticmethod
+    def _13th_symbol(symbol: str, diff: frozenset) -> str | None:
+        check9th = Chord.check9th(diff)
+        check11th = Chord.check11th(diff)
+        check13th = Chord.check13th(diff)
+        if check13th is None:
+            return None
 
         if check9th == '9':
             if check11th == '11':
                 if check13th == '13':
-                    symbol = symbol.replace('7', '13')
+                    symbol = Chord._extend(symbol, '13')
                 else:
-                    symbol = symbol.replace('7', '11')
+                    symbol = Chord._extend(symbol, '11')
                     symbol += '(' + check13th + ')'
-            else:
-                symbol = symbol.replace('7', '9')
+            elif check11th is not None:
+                symbol = Chord._extend(symbol, '9')
                 symbol += '(' + check11th + ',' + check13th + ')'
-        else:
+            else:
+                return None
+        elif check9th is not None and check11th is not None:
             symbol += '(' + check9th + ',' + check11th + ',' + check13th + ')'
+        else:
+            return None
         return symbol
 
     @staticmethod
@@ -192,6 +539,9 @@ class Chord(object):
         return val
 
 
+register_cache('chord.lookup_table', lambda: dict(Chord._table_stats, size=0 if Chord._table is None else 4096))
+
+
 if __name__ == '__main__':
 
     chord = Chord()
@@ -0,0 +1,145 @@
+import numpy as np
+from .symbol import chromatic
+from .chord import Chord
+from .pitchclass import to_mask, rotate_mask
+
+
+def templates(sevenths: bool = True) -> tuple:
+    """
+    Chord templates of the library vocabulary (Chord.triads and Chord.chords7th) in all 12 transpositions
+    :param sevenths: include the 7th chords
+    :return: S x 12 float32 matrix of unit norm rows and list of (root pitch class, symbol), chord type major
+    """
+    chords = list(Chord.triads.values()) + (list(Chord.chords7th.values()) if sevenths else [])
+    rows, labels = [], []
+    for chord in chords:
+        mask = to_mask(chord['intervals'])
+        for root in range(12):
+            transposed = rotate_mask(mask, root)
+            rows.append([transposed >> pc & 1 for pc in range(12)])
+            labels.append((root, chord['symbol']))
+    matrix = np.array(rows, dtype=np.float32)
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True), labels
+
+
+class ChromaRecognizer(object):
+    """
+    Chord labels of chroma frames: cosine similarity with the chord templates in one matrix multiply per chunk,
+    smoothed by a Viterbi decoder whose states are the chords plus 'no chord'
+    """
+
+    def __init__(self, switch_cost: float = 0.3, no_chord: float = 0.6, sevenths: bool = True,
+                 chunk_size: int = 65536, names: list | None = None):
+        """
+        :param switch_cost: cost of changing chord between two frames (self transitions are free);
+            higher values give longer segments
+        :param no_chord: similarity below which a frame is better labelled as no chord
+        :param sevenths: include the 7th chords in the vocabulary
+        :param chunk_size: frames scored at once, bounding the memory of the score matrix
+        :param names: root names indexed by pitch class (default: chromatic names)
+        """
+        self.templates, self.labels = templates(sevenths)
+        # the last state is 'no chord'
+        self.labels.append((None, None))
+        self.switch_cost = switch_cost
+        self.no_chord = no_chord
+        self.chunk_size = chunk_size
+        self.names = chromatic if names is None else names
+
+    def costs(self, chroma: np.ndarray) -> np.ndarray:
+        """
+        Local cost of every state for a block of frames
+        :param chroma: N x 12 chroma array
+        :return: N x (S + 1) float32 array, 1 - cosine similarity ('no chord' last)
+        """
+        chroma = np.asarray(chroma, dtype=np.float32)
+        if chroma.ndim != 2 or chroma.shape[1] != 12:
+            raise Exception('Not valid chroma array.')
+        cost = np.empty((len(chroma), len(self.labels)), dtype=np.float32)
+        np.matmul(chroma, self.templates.T, out=cost[:, :-1])
+        norms = np.linalg.norm(chroma, axis=1)
+        cost[:, :-1] /= np.maximum(norms, 1e-9)[:, None]
+        np.subtract(1.0, cost[:, :-1], out=cost[:, :-1])
+        cost[:, -1] = 1.0 - self.no_chord
+        return cost
+
+    def match(self, chroma) -> np.ndarray:
+        """
+        Best state of every frame, without smoothing
+        :param chroma: N x 12 chroma array, or iterable of such chunks
+        :return: N state indices (int16, index into labels)
+        """
+        return np.concatenate([self.costs(block).argmin(axis=1).astype(np.int16) for block in self._blocks(chroma)])
+
+    def decode(self, chroma) -> np.ndarray:
+        """
+        Most likely state sequence (Viterbi); the chunks are scored one at a time and only one bit per state
+        and frame is kept for the traceback
+        :param chroma: N x 12 chroma array, or iterable of such chunks (e.g. read from a stream)
+        :return: N state indices (int16, index into labels)
+        """
+        switch = np.float32(self.switch_cost)
+        cost = None
+        stays, bests = [], []
+        for block in self._blocks(chroma):
+            local = self.costs(block)
+            n = len(local)
+            stay = np.ones(local.shape, dtype=bool)
+            best = np.zeros(n, dtype=np.int16)
+            start = 0
+            if cost is None:
+                cost = local[0].copy()
+                start = 1
+            for i in range(start, n):
+                # stay for free or switch from the best state of the previous frame
+                b = cost.argmin()
+                best[i] = b
+                limit = cost[b] + switch
+                np.less_equal(cost, limit, out=stay[i])
+                np.minimum(cost, limit, out=cost)
+                cost += local[i]
+            stays.append(np.packbits(stay, axis=1))
+            bests.append(best)
+        if cost is None:
+            return np.empty(0, dtype=np.int16)
+
+        stay = np.concatenate(stays)
+        best = np.concatenate(bests)
+        path = np.empty(len(best), dtype=np.int16)
+        state = int(cost.argmin())
+        for i in range(len(best) - 1, -1, -1):
+            path[i] = state
+            if not stay[i, state >> 3] >> (7 - (state & 7)) & 1:
+                state = int(best[i])
+        return path
+
+    def segments(self, path: np.ndarray, frame_rate: float | None = None) -> list:
+        """
+        Group a state sequence into chord segments
+        :param path: state indices (from match or decode)
+        :param frame_rate: frames per second to get times instead of frame indices
+        :return: list of (start, end, root name, symbol), end exclusive; 'no chord' segments are skipped
+        """
+        path = np.asarray(path)
+        if not len(path):
+            return []
+        bounds = np.concatenate([[0], np.flatnonzero(np.diff(path)) + 1, [len(path)]])
+        result = []
+        for start, end in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            root, symbol = self.labels[path[start]]
+            if root is None:
+                continue
+            if frame_rate is not None:
+                start, end = start / frame_rate, end / frame_rate
+            result.append((start, end, self.names[root], symbol))
+        return result
+
+    def _blocks(self, chroma):
+        if isinstance(chroma, np.ndarray):
+            for start in range(0, len(chroma), self.chunk_size):
+                yield chroma[start:start + self.chunk_size]
+        else:
+            for block in chroma:
+                block = np.asarray(block)
+                for start in range(0, len(block), self.chunk_size):
+                    yield block[start:start + self.chunk_size]
@@ -0,0 +1,246 @@
+"""
+Command line interface
+
+    python -m modal mode ROOT SCALE MODE
+    python -m modal harmonize ROOT SCALE MODE
+    python -m modal chord NOTE [NOTE ...]
+    python -m modal render ROOT SCALE MODE [--format markdown|html|csv|json]
+    python -m modal batch [FILE]
+    python -m modal serve [--host HOST] [--port PORT | --socket PATH] [--workers N]
+
+MODE is a mode index or name. Batch mode reads one JSON query per line from FILE (stdin if omitted or '-'),
+{"id": ..., "method": ..., "params": {...}} with the methods of Dispatcher, and writes one JSON answer per
+line, {"id": ..., "result": ...} or {"id": ..., "error": ...}, as soon as it is computed. Serve mode answers
+the same queries over HTTP or newline-delimited JSON on a socket (see modal.server).
+"""
+import argparse
+import json
+import sys
+from .chord import Chord
+from .index import notes_mask
+from .pitchclass import rotate_mask
+from .render import Renderer, formats
+from .spelling import pitch_class
+from .stream import identify
+from .symbol import chromatic
+
+
+class Dispatcher(object):
+    """
+    JSON-ready access to Modal and Chord by method name, shared by the command line and the server
+    """
+
+    def __init__(self, modal=None):
+        """
+        :param modal: Modal instance (a fresh one if None)
+        """
+        if modal is None:
+            from .modal import Modal
+            modal = Modal()
+        self.modal = modal
+        self.renderer = Renderer(modal)
+        self.methods = {
+            'get_mode': self.get_mode,
+            'mode_harmonization': self.mode_harmonization,
+            'render': self.render,
+            'identify': self.identify,
+            'modes_name': self.modes_name,
+        }
+
+    def call(self, method: str, params: dict | None = None):
+        """
+        Call a method by name
+        :param method: method name
+        :param params: keyword arguments
+        :return: JSON-ready result
+        """
+        fn = self.methods.get(method)
+        if fn is None:
+            raise Exception('Not supported method: ' + str(method))
+        return fn(**(params or {}))
+
+    def answer(self, request) -> dict:
+        """
+        Answer a request, reporting errors in the response
+        :param request: dict with 'method', optional 'params' and 'id'
+        :return: {'id': ..., 'result': ...} or {'id': ..., 'error': ...}
+        """
+        response = {'id': request.get('id')} if isinstance(request, dict) else {'id': None}
+        try:
+            if not isinstance(request, dict):
+                raise Exception('Request must be a JSON object.')
+            response['result'] = self.call(request.get('method'), request.get('params'))
+        except Exception as e:
+            response['error'] = str(e) or type(e).__name__
+        return response
+
+    def get_mode(self, root: str = 'C', scale: str = 'major', mode: int | str = 0) -> dict:
+        return jsonable(self.modal.get_mode(root=root, scale=scale, mode=self._mode_index(scale, mode)))
+
+    def mode_harmonization(self, root: str = 'C', scale: str = 'major', mode: int | str = 0) -> list:
+        mode = self._mode_index(scale, mode)
+        return [jsonable(md) for md in self.modal.mode_harmonization(root=root, scale=scale, mode=mode)]
+
+    def render(self, root: str = 'C', scale: str = 'major', mode: int | str = 0, fmt: str = 'markdown') -> str:
+        return self.renderer.render(root=root, scale=scale, mode=self._mode_index(scale, mode), fmt=fmt)
+
+    def identify(self, notes=None, masks=None, bass=None) -> dict | list:
+        if masks is not None:
+            return [self._identify(notes_mask(mask)) for mask in masks]
+        if bass is not None:
+            bass = notes_mask([bass]).bit_length() - 1
+        return self._identify(notes_mask(notes), bass)
+
+    def modes_name(self, scale: str = 'major') -> list | None:
+        names = self.modal.get_modes_name(scale)
+        return None if names is None else list(names)
+
+    def _identify(self, mask: int, bass: int | None = None) -> dict:
+        root, symbol = identify(mask, bass)
+        result = {'root': None, 'symbol': None}
+        if root is not None:
+            result = {'root': chromatic[root], 'symbol': symbol}
+            rotated = rotate_mask(mask, -root)
+            table = Chord.lookup_table()
+            for level in Chord.levels:
+                result[level] = table[level][rotated]
+        return result
+
+    def _mode_index(self, scale: str, mode: int | str) -> int:
+        if isinstance(mode, str) and not mode.isdigit():
+            names = self.modal.get_modes_name(scale)
+            if names is None or mode not in list(names):
+                raise Exception('Not valid mode.')
+            return list(names).index(mode)
+        return int(mode)
+
+
+def jsonable(md: dict) -> dict:
+    """
+    Convert a mode dict to JSON-ready values
+    :param md: dict returned by Modal.get_mode or Modal.mode_harmonization
+    :return: dict with the notes as a list of names and the pitch class set as a 12-bit mask
+    """
+    result = {}
+    for key, value in md.items():
+        if key == 'notes':
+            value = [str(n) for n in value]
+        elif key == 'pitch_class_set':
+            value = value.mask
+        result[key] = value
+    return result
+
+
+def batch(lines, out, dispatcher: Dispatcher | None = None) -> int:
+    """
+    Answer JSON queries line by line, one line in memory at a time
+    :param lines: iterable of JSON lines
+    :param out: object with a write(str) method
+    :param dispatcher: Dispatcher instance (a fresh one if None)
+    :return: number of answered queries
+    """
+    if dispatcher is None:
+        dispatcher = Dispatcher()
+    count = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError:
+            response = {'id': None, 'error': 'Not valid JSON.'}
+        else:
+            response = dispatcher.answer(request)
+        out.write(json.dumps(response, ensure_ascii=False) + '\n')
+        count += 1
+    return count
+
+
+def _note(text: str) -> int | str:
+    # note name or pitch class (0 for C), e.g. '♭E', 'Eb' or '3'
+    note = int(text) if text.isdigit() else text
+    try:
+        pitch_class(note)
+    except Exception:
+        raise argparse.ArgumentTypeError('not a note name or pitch class: ' + repr(text))
+    return note
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m modal', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    for name, help_text in (('mode', 'notes and chords of a mode'),
+                            ('harmonize', 'chords of every degree of a mode'),
+                            ('render', 'harmonization table of a mode')):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('root')
+        command.add_argument('scale')
+        command.add_argument('mode', nargs='?', default='0')
+        if name == 'render':
+            command.add_argument('--format', choices=formats, default='markdown')
+    command = commands.add_parser('chord', help='identify the chord formed by some notes')
+    command.add_argument('notes', nargs='+', type=_note, help='note names or pitch classes')
+    command.add_argument('--bass', type=_note, help='lowest note, name or pitch class')
+    command = commands.add_parser('batch', help='answer JSON queries line by line')
+    command.add_argument('file', nargs='?', default='-')
+    command.add_argument('--flush', action='store_true', help='flush the output after every answer')
+    command = commands.add_parser('serve', help='answer JSON queries over HTTP or NDJSON on a socket')
+    command.add_argument('--host', default='127.0.0.1')
+    command.add_argument('--port', type=int, default=8765)
+    command.add_argument('--socket', help='unix socket path (instead of host and port)')
+    command.add_argument('--workers', type=int, help='worker processes (computed in the server process if omitted)')
+    command.add_argument('--cache-size', type=int, default=4096, help='maximum number of cached responses')
+    return parser
+
+
+def main(argv: list | None = None) -> int:
+    """
+    Run the command line interface
+    :param argv: arguments (sys.argv[1:] if None)
+    :return: exit status
+    """
+    args = _parser().parse_args(argv)
+    if args.command == 'serve':
+        from .server import run
+        run(host=args.host, port=args.port, path=args.socket, workers=args.workers, cache_size=args.cache_size)
+        return 0
+    dispatcher = Dispatcher()
+    out = sys.stdout
+
+    if args.command == 'batch':
+        if args.flush:
+            out = _Flushing(out)
+        if args.file == '-':
+            batch(sys.stdin, out, dispatcher)
+        else:
+            with open(args.file, encoding='utf-8') as f:
+                batch(f, out, dispatcher)
+        return 0
+
+    try:
+        if args.command == 'render':
+            out.write(dispatcher.render(args.root, args.scale, args.mode, fmt=args.format))
+            return 0
+        if args.command == 'chord':
+            result = dispatcher.identify(notes=args.notes, bass=args.bass)
+        elif args.command == 'mode':
+            result = dispatcher.get_mode(args.root, args.scale, args.mode)
+        else:
+            result = dispatcher.mode_harmonization(args.root, args.scale, args.mode)
+    except Exception as e:
+        sys.stderr.write('error: ' + str(e) + '\n')
+        return 1
+    out.write(json.dumps(result, ensure_ascii=False) + '\n')
+    return 0
+
+
+class _Flushing(object):
+    __slots__ = ('stream',)
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text: str) -> None:
+        self.stream.write(text)
+        self.stream.flush()
@@ -0,0 +1,99 @@
+import numpy as np
+from .chord import Chord
+from .pitchclass import PitchClassSet, to_mask, rotate_mask
+from .index import split_symbol, notes_mask
+
+_popcount = ((np.arange(4096)[:, None] >> np.arange(12)) & 1).sum(axis=1)
+
+
+class ProgressionFitter(object):
+    """
+    Fit a chord progression against every (root, scale, mode) at once
+    """
+
+    def __init__(self, modal=None):
+        """
+        :param modal: Modal instance providing the candidate modes (a fresh one if None)
+        """
+        if modal is None:
+            from .modal import Modal
+            modal = Modal()
+        bulk = modal.get_modes_bulk()
+        self.candidates = bulk[['root', 'scale', 'mode', 'mode name']]
+        notes = bulk['notes_idx']
+        self.masks = np.bitwise_or.reduce(np.where(notes >= 0, 1 << np.maximum(notes, 0), 0), axis=1)
+
+    def fit(self, progression, change_cost: float = 1.0, miss_cost: float | None = None) -> dict:
+        """
+        Score every candidate mode against each chord and find the segmentation with the fewest mode changes
+        :param progression: chord symbols ('Cm7'), note lists, masks or PitchClassSets
+        :param change_cost: cost of switching mode between two chords
+        :param miss_cost: cost of each chord note outside the chosen mode
+            (default: high enough that any number of changes is cheaper than a missing note)
+        :return: dict
+            - 'coverage': chords x candidates array, fraction of each chord's notes in each mode
+            - 'ranking': candidate indices sorted by mean coverage (best first)
+            - 'path': candidate index chosen for each chord
+            - 'segments': list of (start, end, root, scale, mode), end exclusive
+            - 'changes': number of mode changes
+        """
+        chords = np.array([chord_mask(c) for c in progression], dtype=np.int64)
+        if len(chords) == 0:
+            raise Exception('Empty progression.')
+        if miss_cost is None:
+            miss_cost = change_cost * len(chords) + 1.0
+
+        sizes = _popcount[chords]
+        missing = sizes[:, None] - _popcount[chords[:, None] & self.masks[None, :]]
+        coverage = 1.0 - missing / np.maximum(sizes, 1)[:, None]
+        local = missing * miss_cost
+
+        # Viterbi over candidates: stay for free or switch from the best previous candidate
+        n = len(local)
+        stay = np.empty(local.shape, dtype=bool)
+        best = np.zeros(n, dtype=np.int64)
+        cost = local[0].copy()
+        for i in range(1, n):
+            best[i] = cost.argmin()
+            switch = cost[best[i]] + change_cost
+            np.less_equal(cost, switch, out=stay[i])
+            np.minimum(cost, switch, out=cost)
+            cost += local[i]
+
+        path = np.empty(n, dtype=np.int64)
+        path[-1] = cost.argmin()
+        for i in range(n - 1, 0, -1):
+            path[i - 1] = path[i] if stay[i, path[i]] else best[i]
+
+        segments = []
+        start = 0
+        for i in range(1, n + 1):
+            if i == n or path[i] != path[start]:
+                c = self.candidates[path[start]]
+                segments.append((start, i, str(c['root']), str(c['scale']), int(c['mode'])))
+                start = i
+
+        return {
+            'coverage': coverage,
+            'ranking': np.argsort(-coverage.mean(axis=0), kind='stable'),
+            'path': path,
+            'segments': segments,
+            'changes': len(segments) - 1,
+        }
+
+
+def chord_mask(chord) -> int:
+    """
+    Absolute pitch class mask of a chord
+    :param chord: chord symbol, note list, mask or PitchClassSet
+    :return: 12-bit mask
+    """
+    if isinstance(chord, str):
+        root, suffix = split_symbol(chord)
+        mask = Chord.symbol_mask(suffix)
+        if mask is None:
+            raise Exception('Not valid chord symbol.')
+        return rotate_mask(mask, root)
+    if isinstance(chord, (PitchClassSet, int, np.integer)):
+        return to_mask(chord)
+    return notes_mask(chord)
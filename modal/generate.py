@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+from .symbol import chromatic, slug
+from .chord import Chord
+from . import render
+
+_extensions = {'markdown': 'md', 'html': 'html', 'csv': 'csv', 'json': 'jsonl'}
+_sources = ('symbol.py', 'spelling.py', 'pitchclass.py', 'chord.py', 'mode.py', 'modal.py', 'render.py')
+
+# per worker process state, built once by _init_worker
+_worker = {}
+
+
+def generate_catalog(out_dir: str, formats: tuple = render.formats, scales: list | None = None,
+                     roots: list | None = None, workers: int | None = None, chunk_size: int = 8,
+                     force: bool = False) -> dict:
+    """
+    Render the harmonization of every root x scale x mode in every format, spread over a process pool.
+    Each shard holds all the modes of one (format, scale, root) and the manifest records a fingerprint of its
+    inputs (library sources, chord vocabulary, scale definition), so an interrupted or repeated run only renders
+    the shards that are missing or out of date. Entries whose fingerprint no longer matches are dropped.
+    :param out_dir: output directory (shards in <format>/<scale>/<root>.<ext>, plus manifest.json)
+    :param formats: output formats
+    :param scales: scale names, including registered ones (all supported scales if None)
+    :param roots: root notes (all 12 if None)
+    :param workers: number of processes (os.cpu_count() if None)
+    :param chunk_size: shards per task
+    :param force: render every shard even if up to date
+    :return: manifest dict
+    """
+    from .modal import Modal
+    modal = Modal()
+    if scales is None:
+        scales = modal.scales()
+    if roots is None:
+        roots = chromatic
+    definitions = {}
+    for scale in modal.scales():
+        table = modal.modes(scale)
+        definitions[scale] = (next(iter(table.values()))['intervals'].tolist(), list(table.keys()))
+    for scale in scales:
+        if scale not in definitions:
+            raise Exception('Not supported scale.')
+
+    manifest_path = os.path.join(out_dir, 'manifest.json')
+    previous = {}
+    if os.path.exists(manifest_path) and not force:
+        with open(manifest_path, encoding='utf-8') as f:
+            previous = json.load(f)['shards']
+
+    library = _library_fingerprint()
+    vocabulary = Chord.vocabulary()
+    fingerprints = {}
+
+    def fingerprint(fmt: str, scale: str) -> str | None:
+        if scale not in definitions:
+            return None
+        if (fmt, scale) not in fingerprints:
+            intervals, mode_names = definitions[scale]
+            fingerprints[fmt, scale] = hashlib.sha256(json.dumps([library, vocabulary, fmt, scale, intervals,
+                                                                  mode_names]).encode()).hexdigest()
+        return fingerprints[fmt, scale]
+
+    # entries of the previous runs still up to date, including shards this run does not ask for
+    manifest = {'shards': {shard: entry for shard, entry in previous.items()
+                           if entry['fingerprint'] == fingerprint(entry['format'], entry['scale'])
+                           and os.path.exists(os.path.join(out_dir, shard))}}
+    pending = []
+    for fmt in formats:
+        for scale in scales:
+            n_modes = len(definitions[scale][1])
+            for root in roots:
+                shard = fmt + '/' + slug(scale) + '/' + slug(root) + '.' + _extensions[fmt]
+                if shard not in manifest['shards']:
+                    pending.append((shard, fmt, scale, root, n_modes, fingerprint(fmt, scale)))
+
+    try:
+        if pending:
+            from concurrent.futures import ProcessPoolExecutor
+            chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+            used = [(scale, intervals, mode_names) for scale, (intervals, mode_names) in definitions.items()
+                    if scale in scales]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(out_dir, used, vocabulary)) as pool:
+                for done in pool.map(_render_shards, chunks):
+                    manifest['shards'].update(done)
+    finally:
+        # written once, also when interrupted, so that the next run resumes from the shards already rendered
+        if pending or manifest['shards'] != previous or not os.path.exists(manifest_path):
+            _write_manifest(manifest_path, manifest)
+    return manifest
+
+
+def _init_worker(out_dir: str, definitions: list, vocabulary: list) -> None:
+    from .modal import Modal
+    from .render import Renderer
+    # processes started with spawn (or forked before a registration) have the default vocabulary
+    Chord.set_vocabulary(vocabulary)
+    for scale, intervals, mode_names in definitions:
+        if scale not in Modal.scales():
+            Modal.register_scale(scale, intervals, mode_names)
+    _worker['out_dir'] = out_dir
+    _worker['renderer'] = Renderer(Modal())
+
+
+def _render_shards(shards: list) -> list:
+    renderer = _worker['renderer']
+    done = []
+    for shard, fmt, scale, root, n_modes, fingerprint in shards:
+        path = os.path.join(_worker['out_dir'], shard)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.tmp', 'w', encoding='utf-8', newline='') as f:
+            renderer.write_many(f, ((root, scale, mode) for mode in range(n_modes)), fmt=fmt)
+        os.replace(path + '.tmp', path)
+        done.append((shard, {'format': fmt, 'scale': scale, 'root': root, 'modes': n_modes,
+                             'bytes': os.path.getsize(path), 'fingerprint': fingerprint}))
+    return done
+
+
+def _write_manifest(path: str, manifest: dict) -> None:
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def _library_fingerprint() -> str:
+    digest = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in _sources:
+        with open(os.path.join(directory, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
@@ -0,0 +1,133 @@
+import numpy as np
+from collections import defaultdict
+from .symbol import chromatic
+from .chord import Chord
+from .pitchclass import PitchClassSet, to_mask
+from .spelling import pitch_classes, pitch_class, normalize, letter_index, letter_steps, note_name
+
+_rotations = None
+_canonical = None
+
+
+def _build_tables():
+    global _rotations, _canonical
+    if _rotations is None:
+        masks = np.arange(4096)[:, None]
+        # rotations[m, t] = m transposed by t semitones
+        _rotations = ((masks << np.arange(12)) | (masks >> (12 - np.arange(12)))) & 0xFFF
+        # smallest transposition of each mask, shared by all its transpositions
+        _canonical = _rotations.min(axis=1)
+
+
+class ModeIndex(object):
+    """
+    Inverted index from chords and pitch class sets to the (root, scale, mode) containing them.
+    Entries are stored once per interval pattern and transposed at query time.
+    """
+
+    def __init__(self, modal=None):
+        """
+        :param modal: Modal instance providing the scales (a fresh one if None)
+        """
+        if modal is None:
+            from .modal import Modal
+            modal = Modal()
+        _build_tables()
+        self.modal = modal
+        self._build()
+
+    def _build(self) -> None:
+        # rebuilt by every query after a scale registration or a chord vocabulary change, like the render
+        # templates
+        self._version = (Chord.version, self.modal.version)
+        self._chords = defaultdict(list)
+        self._subsets = defaultdict(list)
+        self._exact = defaultdict(list)
+
+        for scale in self.modal.scales():
+            table = list(self.modal.modes(scale).values())
+            n = len(table)
+            for mode, md in enumerate(table):
+                intervals = md['intervals'].tolist()
+                steps = letter_steps(intervals)
+                # chords of the mode harmonization: degree d is the tonic chord of mode (mode + d) % n, spelled on
+                # the letter steps[d] above the mode root
+                for degree, offset in enumerate(intervals):
+                    chord = table[(mode + degree) % n]
+                    for level in Chord.levels:
+                        if chord[level] is not None:
+                            self._chords[chord[level]].append((scale, mode, degree, level, offset, steps[degree]))
+
+                mode_mask = md['pitch_class_set'].mask
+                for shift in self.__shifts(mode_mask):
+                    self._exact[int(_canonical[mode_mask])].append((scale, mode, shift))
+                sub = mode_mask
+                while sub:
+                    for shift in self.__shifts(sub):
+                        self._subsets[int(_canonical[sub])].append((scale, mode, shift))
+                    sub = (sub - 1) & mode_mask
+
+    def _refresh(self) -> None:
+        if self._version != (Chord.version, self.modal.version):
+            self._build()
+
+    @staticmethod
+    def __shifts(mask: int) -> list:
+        # every transposition taking the canonical form to mask
+        return np.flatnonzero(_rotations[_canonical[mask]] == mask).tolist()
+
+    def modes_with_chord(self, chord: str) -> list:
+        """
+        Find the modes whose harmonization contains a chord
+        :param chord: chord symbol or alias, e.g. 'Cm7(' + flat + '9)' or 'G7sus4'
+        :return: list of (root, scale, mode, degree, level), the root spelled so that the degree is the chord root
+        """
+        self._refresh()
+        root, suffix = split_symbol(chord)
+        letter = letter_index(normalize(chord[:len(chord) - len(suffix)]))
+        return [(note_name((letter - step) % 7, root - offset), scale, mode, degree, level)
+                for scale, mode, degree, level, offset, step in self._chords.get(Chord.resolve(suffix), ())]
+
+    def modes_with_notes(self, notes, exact: bool = False) -> list:
+        """
+        Find the modes containing a set of notes
+        :param notes: note names, pitch classes, mask or PitchClassSet
+        :param exact: only return modes made of exactly these notes
+        :return: list of (root, scale, mode)
+        """
+        self._refresh()
+        mask = notes_mask(notes)
+        if not mask:
+            return []
+        entries = (self._exact if exact else self._subsets).get(int(_canonical[mask]), ())
+        shifts = self.__shifts(mask)
+        if len(shifts) == 1:
+            t = shifts[0]
+            return [(chromatic[(t - k) % 12], scale, mode) for scale, mode, k in entries]
+        # symmetric sets match several transpositions of the same entry
+        return list(dict.fromkeys((chromatic[(t - k) % 12], scale, mode) for scale, mode, k in entries
+                                  for t in shifts))
+
+
+def split_symbol(chord: str) -> tuple:
+    """
+    Split a chord symbol into root pitch class and suffix
+    :param chord: chord symbol, with the root in any accepted spelling (e.g. '♭Em7', 'Ebm7', 'D#dim')
+    :return: root pitch class and suffix
+    """
+    for length in (3, 2, 1):
+        root = pitch_classes.get(chord[:length])
+        if root is not None:
+            return root, chord[length:]
+    raise Exception('Not valid root note.')
+
+
+def notes_mask(notes) -> int:
+    """
+    Pitch class mask of a set of notes
+    :param notes: note names, pitch classes, mask or PitchClassSet
+    :return: 12-bit mask
+    """
+    if isinstance(notes, (PitchClassSet, int, np.integer)):
+        return to_mask(notes)
+    return to_mask(pitch_class(n) if isinstance(n, str) else n for n in notes)
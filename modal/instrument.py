@@ -0,0 +1,228 @@
+import importlib
+import threading
+import time
+from functools import wraps
+
+# (module, class, method) instrumented by default; resolved lazily to avoid import cycles
+DEFAULT_TARGETS = (
+    ('modal.chord', 'Chord', 'find_triad_chord'),
+    ('modal.chord', 'Chord', 'find_7th_chord'),
+    ('modal.chord', 'Chord', 'find_9th_chord'),
+    ('modal.chord', 'Chord', 'find_11th_chord'),
+    ('modal.chord', 'Chord', 'find_13th_chord'),
+    ('modal.chord', 'Chord', 'identify_many'),
+    ('modal.modal', 'Modal', 'get_mode'),
+    ('modal.modal', 'Modal', 'get_modes_bulk'),
+    ('modal.modal', 'Modal', 'mode_harmonization'),
+    ('modal.modal', 'Modal', 'print_mode_harmonization'),
+)
+
+# distinct argument tuples remembered per function to count repeated calls
+MAX_TRACKED_ARGS = 10000
+
+_caches = {}
+# enabled instances, replaced (never mutated) under _lock so that the wrappers read it without locking
+_active = ()
+_patched = {}
+_lock = threading.RLock()
+
+
+def register_cache(name: str, cache_info) -> None:
+    """
+    Register a cache whose statistics are included in every snapshot
+    :param name: cache name
+    :param cache_info: callable returning a dict with at least 'hits' and 'misses'
+    """
+    _caches[name] = cache_info
+
+
+class _Stats(object):
+    __slots__ = ('calls', 'errors', 'total', 'min', 'max', 'histogram', 'seen', 'repeats')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self.histogram = {}
+        self.seen = set()
+        self.repeats = 0
+
+    def add(self, elapsed: int, key, failed: bool) -> None:
+        self.calls += 1
+        self.errors += failed
+        self.total += elapsed
+        if self.min is None or elapsed < self.min:
+            self.min = elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        # power of two buckets in nanoseconds
+        bucket = elapsed.bit_length()
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+        if key is not None:
+            if key in self.seen:
+                self.repeats += 1
+            elif len(self.seen) < MAX_TRACKED_ARGS:
+                self.seen.add(key)
+
+    def as_dict(self) -> dict:
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'total_s': self.total / 1e9,
+            'mean_us': self.total / self.calls / 1e3 if self.calls else 0.0,
+            'min_us': (self.min or 0) / 1e3,
+            'max_us': self.max / 1e3,
+            # upper bound of each bucket in microseconds -> count
+            'histogram_us': {(1 << b) / 1e3: n for b, n in sorted(self.histogram.items())},
+            # calls whose arguments were already seen, i.e. hits a memoizing cache would get
+            'repeated_args': self.repeats,
+            'repeat_ratio': self.repeats / self.calls if self.calls else 0.0,
+        }
+
+
+class Instrumentation(object):
+    """
+    Call counters, latency histograms and cache statistics for Modal and Chord.
+
+    The instrumented methods are only wrapped while at least one Instrumentation is enabled, so there is no
+    overhead at all otherwise. Use it as a context manager to scope it to a request:
+
+        with Instrumentation() as inst:
+            modal.mode_harmonization('D', 'major', 1)
+        inst.snapshot()
+
+    Wrapping is process wide: calls from other threads are recorded too while enabled, and enabling, disabling
+    and recording are thread safe.
+    """
+
+    def __init__(self, targets=DEFAULT_TARGETS, exporters=()):
+        """
+        :param targets: (module, class, method) tuples to instrument
+        :param exporters: callables receiving the snapshot when exporting (on exit of the context manager)
+        """
+        self.targets = tuple(targets)
+        self.exporters = list(exporters)
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def add_exporter(self, exporter) -> None:
+        """
+        Add a metrics exporter
+        :param exporter: callable receiving the snapshot dict
+        """
+        self.exporters.append(exporter)
+
+    def enable(self) -> 'Instrumentation':
+        global _active
+        with _lock:
+            if self not in _active:
+                _active = _active + (self,)
+                for target in self.targets:
+                    _patch(target)
+        return self
+
+    def disable(self) -> None:
+        global _active
+        with _lock:
+            if self in _active:
+                _active = tuple(inst for inst in _active if inst is not self)
+                still_used = {target for inst in _active for target in inst.targets}
+                for target in self.targets:
+                    if target not in still_used:
+                        _unpatch(target)
+
+    def __enter__(self) -> 'Instrumentation':
+        return self.enable()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.disable()
+        self.export()
+
+    def record(self, name: str, elapsed: int, key, failed: bool) -> None:
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = _Stats()
+            stats.add(elapsed, key, failed)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = {}
+
+    def snapshot(self) -> dict:
+        """
+        Get the collected statistics
+        :return: dict
+            - 'functions': name -> calls, errors, total/mean/min/max latency, histogram, repeated_args
+            - 'caches': name -> registered cache statistics plus 'hit_ratio'
+        """
+        caches = {}
+        for name, cache_info in list(_caches.items()):
+            info = dict(cache_info())
+            lookups = info.get('hits', 0) + info.get('misses', 0)
+            info['hit_ratio'] = info.get('hits', 0) / lookups if lookups else 0.0
+            caches[name] = info
+        with self._lock:
+            functions = {name: stats.as_dict() for name, stats in sorted(self._stats.items())}
+        return {
+            'functions': functions,
+            'caches': caches,
+        }
+
+    def export(self) -> None:
+        """
+        Send the snapshot to every exporter
+        """
+        if self.exporters:
+            snapshot = self.snapshot()
+            for exporter in self.exporters:
+                exporter(snapshot)
+
+
+def _resolve(target: tuple):
+    module, cls, method = target
+    return getattr(importlib.import_module(module), cls), method
+
+
+def _patch(target: tuple) -> None:
+    if target in _patched:
+        return
+    owner, method = _resolve(target)
+    original = owner.__dict__[method]
+    fn = original.__func__ if isinstance(original, (classmethod, staticmethod)) else original
+    name = target[1] + '.' + method
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter_ns()
+        failed = True
+        try:
+            result = fn(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            try:
+                key = (args[1:], tuple(sorted(kwargs.items())))
+                hash(key)
+            except TypeError:
+                key = None
+            for inst in _active:
+                if target in inst.targets:
+                    inst.record(name, elapsed, key, failed)
+
+    if isinstance(original, classmethod):
+        wrapper = classmethod(wrapper)
+    elif isinstance(original, staticmethod):
+        wrapper = staticmethod(wrapper)
+    setattr(owner, method, wrapper)
+    _patched[target] = original
+
+
+def _unpatch(target: tuple) -> None:
+    original = _patched.pop(target, None)
+    if original is not None:
+        owner, method = _resolve(target)
+        setattr(owner, method, original)
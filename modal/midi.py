@@ -0,0 +1,280 @@
+import os
+import numpy as np
+from .chord import Chord
+from .index import split_symbol
+from .spelling import pitch_class
+from .symbol import chromatic, slug
+
+# Standard MIDI File writer without dependencies. A note is (start, duration, pitch) or
+# (start, duration, pitch, velocity), times in ticks; a track is an iterable of notes or a dict with 'notes' and
+# optionally 'name', 'channel' and 'program'.
+
+_note_on = 0x90
+_program_change = 0xC0
+
+
+class MidiWriter(object):
+    """
+    Encode Standard MIDI Files into one preallocated buffer, reused (and grown when needed) from file to file
+    """
+
+    def __init__(self, division: int = 480, bpm: float = 120.0, velocity: int = 80, capacity: int = 1 << 16):
+        """
+        :param division: ticks per quarter note
+        :param bpm: tempo in quarter notes per minute
+        :param velocity: velocity of the notes without one
+        :param capacity: initial size of the buffer in bytes
+        """
+        if not (0 < division < 0x8000):
+            raise Exception('Not valid division.')
+        self.division = division
+        self.tempo = int(round(60000000 / bpm))
+        self.velocity = velocity
+        self._buffer = bytearray(capacity)
+
+    def encode(self, tracks) -> bytes:
+        """
+        Encode a MIDI file (format 0 for one track, 1 otherwise; the tempo goes in the first track)
+        :param tracks: list of tracks
+        :return: file content
+        """
+        return bytes(self._encode(tracks))
+
+    def write(self, path, tracks) -> int:
+        """
+        Write a MIDI file straight from the buffer
+        :param path: file path or binary file object
+        :param tracks: list of tracks
+        :return: number of bytes written
+        """
+        data = self._encode(tracks)
+        if hasattr(path, 'write'):
+            path.write(data)
+        else:
+            with open(path, 'wb') as f:
+                f.write(data)
+        return len(data)
+
+    def write_many(self, files, out_dir: str = '.') -> dict:
+        """
+        Write many MIDI files, reusing the buffer for all of them
+        :param files: iterable (e.g. generator) of (relative path, list of tracks)
+        :param out_dir: output directory
+        :return: dict with 'files' and 'bytes' written
+        """
+        directories = set()
+        count = size = 0
+        for name, tracks in files:
+            path = os.path.join(out_dir, name)
+            directory = os.path.dirname(path)
+            if directory not in directories:
+                os.makedirs(directory or '.', exist_ok=True)
+                directories.add(directory)
+            size += self.write(path, tracks)
+            count += 1
+        return {'files': count, 'bytes': size}
+
+    def _encode(self, tracks) -> memoryview:
+        tracks = list(tracks)
+        if not tracks:
+            raise Exception('Empty MIDI file.')
+        pos = self._put(0, b'MThd\x00\x00\x00\x06' + bytes((0, 0 if len(tracks) == 1 else 1))
+                        + len(tracks).to_bytes(2, 'big') + self.division.to_bytes(2, 'big'))
+        for i, track in enumerate(tracks):
+            pos = self._track(pos, track, i == 0)
+        return memoryview(self._buffer)[:pos]
+
+    def _track(self, pos: int, track, first: bool) -> int:
+        if isinstance(track, dict):
+            notes, name = track['notes'], track.get('name')
+            channel, program = track.get('channel', 0), track.get('program')
+        else:
+            notes, name, channel, program = track, None, 0, None
+        if not (0 <= channel < 16):
+            raise Exception('Not valid channel.')
+
+        events = _note_events(notes, self.velocity)
+        start = pos
+        pos = self._put(pos, b'MTrk\x00\x00\x00\x00')
+        if name is not None:
+            text = name.encode('utf-8')
+            pos = self._put(pos, b'\x00\xff\x03' + self._length(len(text)) + text)
+        if first:
+            pos = self._put(pos, b'\x00\xff\x51\x03' + self.tempo.to_bytes(3, 'big'))
+        if program is not None:
+            pos = self._put(pos, bytes((0, _program_change | channel, program)))
+        pos = self._events(pos, events, channel)
+        pos = self._put(pos, b'\x00\xff\x2f\x00')
+        self._buffer[start + 4:start + 8] = (pos - start - 8).to_bytes(4, 'big')
+        return pos
+
+    def _events(self, pos: int, events: list, channel: int) -> int:
+        # every note event is a note on (velocity 0 for the note offs), so the status byte is written once
+        # (running status); the delta times are encoded once per distinct value
+        if not events:
+            return pos
+        times = [event[0] for event in events]
+        deltas = [b - a for a, b in zip([0] + times, times)]
+        lengths = {delta: self._length(delta) for delta in set(deltas)}
+        self._reserve(pos, 1 + 2 * len(events) + sum(len(lengths[delta]) for delta in deltas))
+        buffer = self._buffer
+        for i, (delta, event) in enumerate(zip(deltas, events)):
+            length = lengths[delta]
+            buffer[pos:pos + len(length)] = length
+            pos += len(length)
+            if not i:
+                buffer[pos] = _note_on | channel
+                pos += 1
+            buffer[pos] = event[2]
+            buffer[pos + 1] = event[3]
+            pos += 2
+        return pos
+
+    @staticmethod
+    def _length(value: int) -> bytes:
+        # variable length quantity: 7 bits per byte, most significant first
+        if not (0 <= value < 0x10000000):
+            raise Exception('Not valid MIDI time.')
+        out = [value & 0x7F]
+        value >>= 7
+        while value:
+            out.append(value & 0x7F | 0x80)
+            value >>= 7
+        return bytes(reversed(out))
+
+    def _reserve(self, pos: int, size: int) -> None:
+        if pos + size > len(self._buffer):
+            self._buffer.extend(bytes(max(pos + size, 2 * len(self._buffer)) - len(self._buffer)))
+
+    def _put(self, pos: int, data: bytes) -> int:
+        self._reserve(pos, len(data))
+        self._buffer[pos:pos + len(data)] = data
+        return pos + len(data)
+
+
+def _note_events(notes, velocity: int) -> list:
+    # sorted (tick, on, pitch, velocity) events, the note offs (on 0, velocity 0) before the note ons of the
+    # same tick
+    if isinstance(notes, np.ndarray):
+        notes = notes.tolist()
+    events = []
+    for note in notes:
+        start, duration, pitch = note[0], note[1], note[2]
+        vel = note[3] if len(note) > 3 else velocity
+        if start < 0 or duration < 0 or not (0 <= pitch < 128) or not (0 < vel < 128):
+            raise Exception('Not valid note.')
+        if duration:
+            events.append((start, 1, pitch, vel))
+            events.append((start + duration, 0, pitch, 0))
+    events.sort()
+    if events and events[-1][0] >= 0x10000000:
+        raise Exception('Not valid MIDI time.')
+    return events
+
+
+def scale_notes(md, octave: int = 4, duration: int = 480) -> list:
+    """
+    Notes of a mode played upwards, ending on the root an octave above
+    :param md: Mode (from Modal.get_mode)
+    :param octave: octave of the root (4 for middle C)
+    :param duration: duration of each note in ticks
+    :return: list of notes
+    """
+    base = 12 * (octave + 1) + pitch_class(md.root)
+    pitches = [base + (pitch_class(note) - base) % 12 for note in md.notes.tolist()] + [base + 12]
+    return [(i * duration, duration, pitch) for i, pitch in enumerate(pitches)]
+
+
+def chord_pitches(md, level: str = '7th_chord', octave: int = 3) -> list:
+    """
+    Root position of the chord of a level: the triad or 7th chord in close position and the extensions
+    (9th, 11th, 13th) in the octave above
+    :param md: Mode of the degree (from Modal.mode_harmonization)
+    :param level: 'triad_chord', '7th_chord', '9th_chord', '11th_chord' or '13th_chord'
+    :param octave: octave of the root
+    :return: MIDI note numbers, ascending (empty if no chord is found at this level)
+    """
+    chord = md.chord(level)
+    if chord is None:
+        return []
+    root = pitch_class(md.root)
+    core = chord
+    if Chord.levels.index(level) > 1:
+        core = md.chord('7th_chord') or md.chord('triad_chord') or chord
+    core = core.tones.mask
+    base = 12 * (octave + 1) + root
+    return sorted(base + (pc - root) % 12 + (0 if core >> pc & 1 else 12) for pc in chord.tones.intervals().tolist())
+
+
+def harmonization_notes(modes, level: str = '7th_chord', octave: int = 3, duration: int = 960) -> list:
+    """
+    Chords of a mode harmonization played one after the other, each degree above the previous one
+    :param modes: Modes of the degrees (from Modal.mode_harmonization)
+    :param level: chord level
+    :param octave: octave of the first degree
+    :param duration: duration of each chord in ticks; a degree without chord at this level is a rest
+    :return: list of notes
+    """
+    tonic = pitch_class(modes[0].root)
+    notes = []
+    for i, md in enumerate(modes):
+        # degrees below the tonic pitch class go up an octave
+        offset = 12 if pitch_class(md.root) < tonic else 0
+        notes.extend((i * duration, duration, pitch + offset) for pitch in chord_pitches(md, level, octave))
+    return notes
+
+
+def progression_notes(chords, octave: int = 3, duration: int = 960) -> list:
+    """
+    Chords played one after the other
+    :param chords: chord symbols ('Dm7', in root position) or lists of MIDI note numbers (e.g. the voicings
+        chosen by VoiceLeader.solve); None for a rest
+    :param octave: octave of the roots of the chord symbols
+    :param duration: duration of each chord in ticks
+    :return: list of notes
+    """
+    notes = []
+    for i, chord in enumerate(chords):
+        if chord is None:
+            continue
+        if isinstance(chord, str):
+            root, suffix = split_symbol(chord)
+            mask = Chord.symbol_mask(suffix)
+            if mask is None:
+                raise Exception('Not valid chord symbol.')
+            base = 12 * (octave + 1) + pitch_class(root)
+            chord = [base + interval for interval in range(12) if mask >> interval & 1]
+        notes.extend((i * duration, duration, int(pitch)) for pitch in chord)
+    return notes
+
+
+def mode_files(roots: list | None = None, scales: list | None = None, levels: tuple = Chord.levels,
+               division: int = 480, modal=None):
+    """
+    MIDI files of every root x scale x mode: a track with the mode played upwards and a track with the
+    harmonization at each chord level
+    :param roots: root notes (all 12 if None)
+    :param scales: scale names (all supported scales if None)
+    :param levels: chord levels, one track each
+    :param division: ticks per quarter note (as given to MidiWriter)
+    :param modal: Modal instance (a fresh one if None)
+    :return: generator of (relative path '<scale>/<root>/<mode>.mid', list of tracks), for MidiWriter.write_many
+    """
+    if modal is None:
+        from .modal import Modal
+        modal = Modal()
+    if roots is None:
+        roots = chromatic
+    if scales is None:
+        scales = modal.scales()
+    for scale in scales:
+        mode_names = list(modal.get_modes_name(scale))
+        for root in roots:
+            for mode in range(len(mode_names)):
+                modes = modal.mode_harmonization(root=root, scale=scale, mode=mode)
+                tracks = [{'name': modes[0].name, 'notes': scale_notes(modes[0], duration=division)}]
+                for channel, level in enumerate(levels, 1):
+                    tracks.append({'name': level, 'channel': channel,
+                                   'notes': harmonization_notes(modes, level, duration=2 * division)})
+                yield (slug(scale) + '/' + slug(root) + '/' + str(mode) + '-' + slug(mode_names[mode])
+                       + '.mid', tracks)
@@ -1,12 +1,132 @@
+import threading
 import numpy as np
 from collections import OrderedDict
-from symbol import *
-from chord import Chord
+from .symbol import *
+from .chord import Chord
+from .pitchclass import PitchClassSet, rotate_mask
+from .mode import Mode, ChordInfo
+from .spelling import pitch_classes, normalize, spell
+from .render import Renderer
+from .instrument import register_cache
+
+
+class _ModeTable(object):
+    """
+    Class attribute resolving to the lazily built modes table of a scale
+    """
+
+    def __init__(self, scale: str):
+        self.scale = scale
+
+    def __get__(self, instance, owner):
+        return owner.modes(self.scale)
+
+
+class HarmonizationCache(object):
+    """
+    Two level LRU cache of mode harmonizations: the degrees of each (scale, mode) in interval space (mode index,
+    mode name, pitch class set from the degree and chord suffixes of every degree), shared by every root, and in
+    front of it the harmonizations of the most recent (root, scale, mode). Safe to use from several threads
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        :param maxsize: maximum number of entries of each level
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.degree_hits = 0
+        self.degree_misses = 0
+        self._results = OrderedDict()
+        self._degrees = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> tuple | None:
+        """
+        Get the harmonization of a (root, scale, mode)
+        :param key: (root, scale, mode)
+        :return: tuple of Mode (None if not cached)
+        """
+        with self._lock:
+            modes = self._results.get(key)
+            if modes is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._results.move_to_end(key)
+            return modes
+
+    def put(self, key: tuple, modes: tuple) -> None:
+        """
+        Store the harmonization of a (root, scale, mode)
+        :param key: (root, scale, mode)
+        :param modes: tuple of Mode
+        """
+        with self._lock:
+            self._results[key] = modes
+            if len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+    def degrees(self, scale: str, mode: int, build) -> tuple:
+        """
+        Get the degrees of a mode in interval space (independent of the root)
+        :param scale: scale name
+        :param mode: mode index
+        :param build: function of (scale, mode) returning the degrees, called on a miss (outside the lock)
+        :return: tuple of (mode index, mode name, PitchClassSet from the degree, chord suffixes), one per degree
+        """
+        key = (scale, mode)
+        with self._lock:
+            degrees = self._degrees.get(key)
+            if degrees is not None:
+                self.degree_hits += 1
+                self._degrees.move_to_end(key)
+                return degrees
+            self.degree_misses += 1
+        degrees = build(scale, mode)
+        with self._lock:
+            self._degrees[key] = degrees
+            if len(self._degrees) > self.maxsize:
+                self._degrees.popitem(last=False)
+        return degrees
+
+    def invalidate(self, scale: str | None = None) -> None:
+        """
+        Drop the entries of a scale
+        :param scale: scale name (all the entries if None)
+        """
+        with self._lock:
+            if scale is None:
+                self._results.clear()
+                self._degrees.clear()
+            else:
+                for key in [key for key in self._results if key[1] == scale]:
+                    del self._results[key]
+                for key in [key for key in self._degrees if key[0] == scale]:
+                    del self._degrees[key]
+
+    def cache_clear(self) -> None:
+        """
+        Drop every entry and reset the counters
+        """
+        self.invalidate()
+        with self._lock:
+            self.hits = self.misses = self.degree_hits = self.degree_misses = 0
+
+    def cache_info(self) -> dict:
+        """
+        Get the cache statistics
+        :return: dict with 'hits', 'misses' and 'size' of the (root, scale, mode) level, 'degree_hits',
+            'degree_misses' and 'degree_size' of the (scale, mode) level, and 'maxsize'
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._results),
+                    'degree_hits': self.degree_hits, 'degree_misses': self.degree_misses,
+                    'degree_size': len(self._degrees), 'maxsize': self.maxsize}
 
 
 class Modal(object):
-    __chromatic = np.array(
-        ['C', flat + 'D', 'D', flat + 'E', 'E', 'F', flat + 'G', 'G', flat + 'A', 'A', flat + 'B', 'B'])
     __scales = ['major', 'melodic minor', 'harmonic major', 'harmonic minor']
 
     __major_scale_intervals = np.array([0, 2, 4, 5, 7, 9, 11])
@@ -16,380 +136,294 @@ class Modal(object):
     # __melodic_minor_sharp5_intervals = np.array([0, 2, 3, 5, 8, 9, 11])
     # __ionic_sharp2_intervals = np.array([0, 3, 4, 5, 7, 9, 11])
 
-    __shift_fun = np.vectorize(lambda x: x if x >= 0 else 12 + x)
+    __scale_intervals = OrderedDict([
+        ('major', __major_scale_intervals),
+        ('melodic minor', __melodic_minor_intervals),
+        ('harmonic major', __harmonic_major_intervals),
+        ('harmonic minor', __harmonic_minor_intervals),
+    ])
+    __mode_names = {
+        'major': ['ionian', 'dorian', 'phrygian', 'lydian', 'mixolydian', 'aeonian', 'locrian'],
+        'melodic minor': ['ionian ' + flat + '3', 'dorian ' + flat + '2', 'lydian ' + sharp + '5',
+                          'lydian ' + flat + '7', 'mixolydian ' + flat + '6', 'locrian ' + natural + '2',
+                          'super locrian'],
+        'harmonic major': ['ionian ' + flat + '6', 'dorian ' + flat + '5', 'phrygian ' + flat + '4',
+                           'lydian ' + flat + '3', 'mixolydian ' + flat + '2', 'lydian ' + sharp + '2 ' + sharp + '5',
+                           'locrian ' + flat + flat + '7'],
+        'harmonic minor': ['ionian ' + flat + '3' + ' ' + flat + '6', 'locrian 6', 'ionian ' + sharp + '5',
+                           'dorian ' + flat + '11', 'phrygian dominant', 'lydian ' + sharp + '2',
+                           'super locrian ' + flat + flat + '7'],
+    }
+    __mode_tables = {}
+    __spellings = {}
+    __interchange = {}
+    __families = {}
 
     __chord = Chord()
 
-    ###############
-    # Major Scale #
-    ###############
-    major_modes = OrderedDict()
-    major_modes['ionian'] = {
-        'intervals': __major_scale_intervals,
-        'triad_chord': __chord.find_triad_chord(__major_scale_intervals),
-        '7th_chord': __chord.find_7th_chord(__major_scale_intervals)[0],
-        '9th_chord': __chord.find_9th_chord(__major_scale_intervals),
-        '11th_chord': __chord.find_11th_chord(__major_scale_intervals),
-        '13th_chord': __chord.find_13th_chord(__major_scale_intervals),
-    }
-    major_modes['dorian'] = {
-        'intervals': __shift_fun(np.roll(__major_scale_intervals, -1) - __major_scale_intervals[1]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -1) - __major_scale_intervals[1])),
-        '7th_chord': __chord.find_7th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -1) - __major_scale_intervals[1]))[0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -1) - __major_scale_intervals[1])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -1) - __major_scale_intervals[1])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -1) - __major_scale_intervals[1])),
-    }
-    major_modes['phrygian'] = {
-        'intervals': __shift_fun(np.roll(__major_scale_intervals, -2) - __major_scale_intervals[2]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -2) - __major_scale_intervals[2])),
-        '7th_chord': __chord.find_7th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -2) - __major_scale_intervals[2]))[0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -2) - __major_scale_intervals[2])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -2) - __major_scale_intervals[2])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -2) - __major_scale_intervals[2])),
-    }
-    major_modes['lydian'] = {
-        'intervals': __shift_fun(np.roll(__major_scale_intervals, -3) - __major_scale_intervals[3]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -3) - __major_scale_intervals[3])),
-        '7th_chord': __chord.find_7th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -3) - __major_scale_intervals[3]))[0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -3) - __major_scale_intervals[3])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -3) - __major_scale_intervals[3])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -3) - __major_scale_intervals[3])),
-    }
-    major_modes['mixolydian'] = {
-        'intervals': __shift_fun(np.roll(__major_scale_intervals, -4) - __major_scale_intervals[4]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -4) - __major_scale_intervals[4])),
-        '7th_chord': __chord.find_7th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -4) - __major_scale_intervals[4]))[0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -4) - __major_scale_intervals[4])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -4) - __major_scale_intervals[4])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -4) - __major_scale_intervals[4])),
-    }
-    major_modes['aeonian'] = {
-        'intervals': __shift_fun(np.roll(__major_scale_intervals, -5) - __major_scale_intervals[5]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -5) - __major_scale_intervals[5])),
-        '7th_chord': __chord.find_7th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -5) - __major_scale_intervals[5]))[0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -5) - __major_scale_intervals[5])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -5) - __major_scale_intervals[5])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -5) - __major_scale_intervals[5])),
-    }
-    major_modes['locrian'] = {
-        'intervals': __shift_fun(np.roll(__major_scale_intervals, -6) - __major_scale_intervals[6]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -6) - __major_scale_intervals[6])),
-        '7th_chord': __chord.find_7th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -6) - __major_scale_intervals[6]))[0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -6) - __major_scale_intervals[6])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -6) - __major_scale_intervals[6])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__major_scale_intervals, -6) - __major_scale_intervals[6])),
-    }
+    _catalog = None
+    _renderer = None
+    # incremented on every scale registration, for caches depending on the scales (e.g. render templates)
+    version = 0
+    # interned Mode objects, keyed by (root, scale, mode)
+    _interned = {}
+    _interned_stats = {'hits': 0, 'misses': 0}
+    harmonization_cache = HarmonizationCache()
+
+    major_modes = _ModeTable('major')
+    melodic_minor_modes = _ModeTable('melodic minor')
+    harmonic_major_modes = _ModeTable('harmonic major')
+    harmonic_minor_modes = _ModeTable('harmonic minor')
+
+    @classmethod
+    def scales(cls) -> list:
+        """
+        Get the supported scales names
+        :return: scales names
+        """
+        return list(cls.__scales)
 
-    #################
-    # Melodic Minor #
-    #################
-    melodic_minor_modes = OrderedDict()
-    melodic_minor_modes['ionian ' + flat + '3'] = {
-        'intervals': __melodic_minor_intervals,
-        'triad_chord': __chord.find_triad_chord(__melodic_minor_intervals),
-        '7th_chord': __chord.find_7th_chord(__melodic_minor_intervals)[0],
-        '9th_chord': __chord.find_9th_chord(__melodic_minor_intervals),
-        '11th_chord': __chord.find_11th_chord(__melodic_minor_intervals),
-        '13th_chord': __chord.find_13th_chord(__melodic_minor_intervals),
-    }
-    melodic_minor_modes['dorian ' + flat + '2'] = {
-        'intervals': __shift_fun(np.roll(__melodic_minor_intervals, -1) - __melodic_minor_intervals[1]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -1) - __melodic_minor_intervals[1])),
-        '7th_chord':
-            __chord.find_7th_chord(__shift_fun(np.roll(__melodic_minor_intervals, -1) - __melodic_minor_intervals[1]))[
-                0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -1) - __melodic_minor_intervals[1])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -1) - __melodic_minor_intervals[1])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -1) - __melodic_minor_intervals[1])),
-    }
-    melodic_minor_modes['lydian ' + sharp + '5'] = {
-        'intervals': __shift_fun(np.roll(__melodic_minor_intervals, -2) - __melodic_minor_intervals[2]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -2) - __melodic_minor_intervals[2])),
-        '7th_chord':
-            __chord.find_7th_chord(__shift_fun(np.roll(__melodic_minor_intervals, -2) - __melodic_minor_intervals[2]))[
-                0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -2) - __melodic_minor_intervals[2])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -2) - __melodic_minor_intervals[2])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -2) - __melodic_minor_intervals[2])),
-    }
-    melodic_minor_modes['lydian ' + flat + '7'] = {
-        'intervals': __shift_fun(np.roll(__melodic_minor_intervals, -3) - __melodic_minor_intervals[3]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -3) - __melodic_minor_intervals[3])),
-        '7th_chord':
-            __chord.find_7th_chord(__shift_fun(np.roll(__melodic_minor_intervals, -3) - __melodic_minor_intervals[3]))[
-                0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -3) - __melodic_minor_intervals[3])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -3) - __melodic_minor_intervals[3])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -3) - __melodic_minor_intervals[3])),
-    }
-    melodic_minor_modes['mixolydian ' + flat + '6'] = {
-        'intervals': __shift_fun(np.roll(__melodic_minor_intervals, -4) - __melodic_minor_intervals[4]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -4) - __melodic_minor_intervals[4])),
-        '7th_chord':
-            __chord.find_7th_chord(__shift_fun(np.roll(__melodic_minor_intervals, -4) - __melodic_minor_intervals[4]))[
-                0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -4) - __melodic_minor_intervals[4])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -4) - __melodic_minor_intervals[4])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -4) - __melodic_minor_intervals[4])),
-    }
-    melodic_minor_modes['locrian ' + natural + '2'] = {
-        'intervals': __shift_fun(np.roll(__melodic_minor_intervals, -5) - __melodic_minor_intervals[5]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -5) - __melodic_minor_intervals[5])),
-        '7th_chord':
-            __chord.find_7th_chord(__shift_fun(np.roll(__melodic_minor_intervals, -5) - __melodic_minor_intervals[5]))[
-                0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -5) - __melodic_minor_intervals[5])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -5) - __melodic_minor_intervals[5])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -5) - __melodic_minor_intervals[5])),
-    }
-    melodic_minor_modes['super locrian'] = {
-        'intervals': __shift_fun(np.roll(__melodic_minor_intervals, -6) - __melodic_minor_intervals[6]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -6) - __melodic_minor_intervals[6])),
-        '7th_chord':
-            __chord.find_7th_chord(__shift_fun(np.roll(__melodic_minor_intervals, -6) - __melodic_minor_intervals[6]))[
-                0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -6) - __melodic_minor_intervals[6])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -6) - __melodic_minor_intervals[6])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__melodic_minor_intervals, -6) - __melodic_minor_intervals[6])),
-    }
+    @classmethod
+    def modes(cls, scale: str) -> OrderedDict:
+        """
+        Get the modes table of a scale (generated on first access and cached)
+        :param scale: scale name
+        :return: mode name -> mode dict
+        """
+        table = cls.__mode_tables.get(scale)
+        if table is None:
+            if scale not in cls.__scale_intervals:
+                raise Exception('Not supported scale.')
+            table = cls.__build_modes(scale)
+            cls.__mode_tables[scale] = table
+        return table
 
-    ##################
-    # Harmonic Major #
-    ##################
-    harmonic_major_modes = OrderedDict()
-    harmonic_major_modes['ionian ' + flat + '6'] = {
-        'intervals': __harmonic_major_intervals,
-        'triad_chord': __chord.find_triad_chord(__harmonic_major_intervals),
-        '7th_chord': __chord.find_7th_chord(__harmonic_major_intervals)[0],
-        '9th_chord': __chord.find_9th_chord(__harmonic_major_intervals),
-        '11th_chord': __chord.find_11th_chord(__harmonic_major_intervals),
-        '13th_chord': __chord.find_13th_chord(__harmonic_major_intervals),
-    }
-    harmonic_major_modes['dorian ' + flat + '5'] = {
-        'intervals': __shift_fun(np.roll(__harmonic_major_intervals, -1) - __harmonic_major_intervals[1]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -1) - __harmonic_major_intervals[1])),
-        '7th_chord': __chord.find_7th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -1) - __harmonic_major_intervals[1]))[0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -1) - __harmonic_major_intervals[1])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -1) - __harmonic_major_intervals[1])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -1) - __harmonic_major_intervals[1])),
-    }
-    harmonic_major_modes['phrygian ' + flat + '4'] = {
-        'intervals': __shift_fun(np.roll(__harmonic_major_intervals, -2) - __harmonic_major_intervals[2]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -2) - __harmonic_major_intervals[2])),
-        '7th_chord': __chord.find_7th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -2) - __harmonic_major_intervals[2]))[0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -2) - __harmonic_major_intervals[2])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -2) - __harmonic_major_intervals[2])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -2) - __harmonic_major_intervals[2])),
-    }
-    harmonic_major_modes['lydian ' + flat + '3'] = {
-        'intervals': __shift_fun(np.roll(__harmonic_major_intervals, -3) - __harmonic_major_intervals[3]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -3) - __harmonic_major_intervals[3])),
-        '7th_chord': __chord.find_7th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -3) - __harmonic_major_intervals[3]))[0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -3) - __harmonic_major_intervals[3])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -3) - __harmonic_major_intervals[3])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -3) - __harmonic_major_intervals[3])),
-    }
-    harmonic_major_modes['mixolydian ' + flat + '2'] = {
-        'intervals': __shift_fun(np.roll(__harmonic_major_intervals, -4) - __harmonic_major_intervals[4]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -4) - __harmonic_major_intervals[4])),
-        '7th_chord': __chord.find_7th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -4) - __harmonic_major_intervals[4]))[0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -4) - __harmonic_major_intervals[4])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -4) - __harmonic_major_intervals[4])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -4) - __harmonic_major_intervals[4])),
-    }
-    harmonic_major_modes['lydian ' + sharp + '2 ' + sharp + '5'] = {
-        'intervals': __shift_fun(np.roll(__harmonic_major_intervals, -5) - __harmonic_major_intervals[5]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -5) - __harmonic_major_intervals[5])),
-        '7th_chord': __chord.find_7th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -5) - __harmonic_major_intervals[5]))[0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -5) - __harmonic_major_intervals[5])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -5) - __harmonic_major_intervals[5])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -5) - __harmonic_major_intervals[5])),
-    }
-    harmonic_major_modes['locrian ' + flat + flat + '7'] = {
-        'intervals': __shift_fun(np.roll(__harmonic_major_intervals, -6) - __harmonic_major_intervals[6]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -6) - __harmonic_major_intervals[6])),
-        '7th_chord': __chord.find_7th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -6) - __harmonic_major_intervals[6]))[0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -6) - __harmonic_major_intervals[6])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -6) - __harmonic_major_intervals[6])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__harmonic_major_intervals, -6) - __harmonic_major_intervals[6])),
-    }
+    @classmethod
+    def register_scale(cls, name: str, intervals, mode_names: list | None = None) -> None:
+        """
+        Register a scale family; its modes and chords are derived by rotation on first access
+        :param name: scale name
+        :param intervals: scale intervals (must contain 0)
+        :param mode_names: names of the modes, in rotation order (default: '<name> mode <n>')
+        """
+        pcs = PitchClassSet.from_intervals(intervals)
+        if 0 not in pcs:
+            raise Exception('Not valid scale intervals.')
+        if mode_names is None:
+            mode_names = [name + ' mode ' + str(i + 1) for i in range(len(pcs))]
+        if len(mode_names) != len(pcs) or len(set(mode_names)) != len(mode_names):
+            raise Exception('Not valid mode names.')
+
+        cls.__scale_intervals[name] = pcs.intervals()
+        cls.__mode_names[name] = list(mode_names)
+        cls.__mode_tables.pop(name, None)
+        for key in [key for key in cls.__spellings if key[0] == name]:
+            del cls.__spellings[key]
+        for key in [key for key in cls._interned if key[1] == name]:
+            del cls._interned[key]
+        cls.harmonization_cache.invalidate(name)
+        cls.__interchange.clear()
+        cls.version += 1
+        if name not in cls.__scales:
+            cls.__scales.append(name)
+
+    @classmethod
+    def clear_caches(cls) -> None:
+        """
+        Drop the modes tables, scale families and interned modes (called after a chord vocabulary change)
+        """
+        cls.__mode_tables.clear()
+        cls.__families.clear()
+        cls.__interchange.clear()
+        Modal._interned.clear()
+        Modal.harmonization_cache.invalidate()
+
+    @classmethod
+    def enumerate_scales(cls, size: int | None = None) -> list:
+        """
+        Enumerate every pitch class set containing the root, grouped in mode families (sets equal up to rotation),
+        with the harmonization of every mode computed in bulk
+        :param size: number of notes (all sizes if None)
+        :return: list of families, each a dict
+            - 'name': registered scale name or None
+            - 'intervals': intervals of the family representative (the mode with the smallest mask)
+            - 'masks': masks of the modes, in rotation order from the representative
+            - 'triad_chord', '7th_chord', '9th_chord', '11th_chord', '13th_chord': chord symbols of the modes
+        """
+        families = cls.__families.get(size)
+        if families is None:
+            families = cls.__enumerate_scales(size)
+            cls.__families[size] = families
+        registered = {PitchClassSet.from_intervals(intervals).mask: name
+                      for name, intervals in reversed(cls.__scale_intervals.items())}
+        for family in families:
+            family['name'] = next((registered[m] for m in family['masks'].tolist() if m in registered), None)
+        return families
+
+    @classmethod
+    def __enumerate_scales(cls, size: int | None) -> list:
+        masks = np.arange(1, 4096, 2)
+        bits = (masks[:, None] >> np.arange(12)) & 1
+        if size is not None:
+            keep = bits.sum(axis=1) == size
+            masks, bits = masks[keep], bits[keep]
+        # mode rotations bring each note of the set down to the root
+        rotations = ((masks[:, None] >> np.arange(12)) | (masks[:, None] << (12 - np.arange(12)))) & 0xFFF
+        family = np.where(bits == 1, rotations, 4096).min(axis=1)
+
+        representatives = np.unique(family)
+        modes = [rotations[np.searchsorted(masks, r)][bits[np.searchsorted(masks, r)] == 1]
+                 for r in representatives.tolist()]
+        chords = cls.__chord.identify_many(np.concatenate(modes))
+
+        families, start = [], 0
+        for representative, family_modes in zip(representatives.tolist(), modes):
+            end = start + len(family_modes)
+            item = {
+                'intervals': PitchClassSet(representative).intervals(),
+                'masks': family_modes,
+            }
+            for level in Chord.levels:
+                item[level] = chords[level][start:end]
+            families.append(item)
+            start = end
+        return families
+
+    @classmethod
+    def from_catalog(cls, path: str) -> 'Modal':
+        """
+        Create a Modal answering get_mode (and the methods based on it) from a compiled catalog file,
+        memory-mapped so that it is shared between processes (see catalog.compile_catalog)
+        :param path: catalog file path
+        :return: Modal instance
+        """
+        from .catalog import Catalog
+        modal = cls()
+        modal._catalog = Catalog(path)
+        modal._interned = {}
+        modal.harmonization_cache = HarmonizationCache()
+        return modal
+
+    @classmethod
+    def __build_modes(cls, scale: str) -> OrderedDict:
+        parent = PitchClassSet.from_intervals(cls.__scale_intervals[scale])
+        table = OrderedDict()
+        for degree, name in enumerate(cls.__mode_names[scale]):
+            pcs = parent.rotate(degree)
+            table[name] = {
+                'intervals': pcs.intervals(),
+                'triad_chord': cls.__chord.find_triad_chord(pcs),
+                '7th_chord': cls.__chord.find_7th_chord(pcs)[0],
+                '9th_chord': cls.__chord.find_9th_chord(pcs),
+                '11th_chord': cls.__chord.find_11th_chord(pcs),
+                '13th_chord': cls.__chord.find_13th_chord(pcs),
+                'pitch_class_set': pcs,
+            }
+        return table
 
-    ##################
-    # Harmonic Minor #
-    ##################
-    harmonic_minor_modes = OrderedDict()
-    harmonic_minor_modes['ionian ' + flat + '3' + ' ' + flat + '6'] = {
-        'intervals': __harmonic_minor_intervals,
-        'triad_chord': __chord.find_triad_chord(__harmonic_minor_intervals),
-        '7th_chord': __chord.find_7th_chord(__harmonic_minor_intervals)[0],
-        '9th_chord': __chord.find_9th_chord(__harmonic_minor_intervals),
-        '11th_chord': __chord.find_11th_chord(__harmonic_minor_intervals),
-        '13th_chord': __chord.find_13th_chord(__harmonic_minor_intervals),
-    }
-    harmonic_minor_modes['locrian 6'] = {
-        'intervals': __shift_fun(np.roll(__harmonic_minor_intervals, -1) - __harmonic_minor_intervals[1]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -1) - __harmonic_minor_intervals[1])),
-        '7th_chord': __chord.find_7th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -1) - __harmonic_minor_intervals[1]))[0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -1) - __harmonic_minor_intervals[1])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -1) - __harmonic_minor_intervals[1])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -1) - __harmonic_minor_intervals[1])),
-    }
-    harmonic_minor_modes['ionian ' + sharp + '5'] = {
-        'intervals': __shift_fun(np.roll(__harmonic_minor_intervals, -2) - __harmonic_minor_intervals[2]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -2) - __harmonic_minor_intervals[2])),
-        '7th_chord': __chord.find_7th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -2) - __harmonic_minor_intervals[2]))[0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -2) - __harmonic_minor_intervals[2])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -2) - __harmonic_minor_intervals[2])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -2) - __harmonic_minor_intervals[2])),
-    }
-    harmonic_minor_modes['dorian ' + flat + '11'] = {
-        'intervals': __shift_fun(np.roll(__harmonic_minor_intervals, -3) - __harmonic_minor_intervals[3]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -3) - __harmonic_minor_intervals[3])),
-        '7th_chord': __chord.find_7th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -3) - __harmonic_minor_intervals[3]))[0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -3) - __harmonic_minor_intervals[3])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -3) - __harmonic_minor_intervals[3])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -3) - __harmonic_minor_intervals[3])),
-    }
-    harmonic_minor_modes['phrygian dominant'] = {
-        'intervals': __shift_fun(np.roll(__harmonic_minor_intervals, -4) - __harmonic_minor_intervals[4]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -4) - __harmonic_minor_intervals[4])),
-        '7th_chord': __chord.find_7th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -4) - __harmonic_minor_intervals[4]))[0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -4) - __harmonic_minor_intervals[4])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -4) - __harmonic_minor_intervals[4])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -4) - __harmonic_minor_intervals[4])),
-    }
-    harmonic_minor_modes['lydian ' + sharp + '2'] = {
-        'intervals': __shift_fun(np.roll(__harmonic_minor_intervals, -5) - __harmonic_minor_intervals[5]),
-        'triad_chord': __chord.find_triad_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -5) - __harmonic_minor_intervals[5])),
-        '7th_chord': __chord.find_7th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -5) - __harmonic_minor_intervals[5]))[0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -5) - __harmonic_minor_intervals[5])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -5) - __harmonic_minor_intervals[5])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -5) - __harmonic_minor_intervals[5])),
-    }
-    harmonic_minor_modes['super locrian ' + flat + flat + '7'] = {
-        'intervals': __shift_fun(
-            np.roll(__harmonic_minor_intervals, -6) - __harmonic_minor_intervals[6]),
-        'triad_chord': __chord.find_triad_chord(__shift_fun(
-            np.roll(__harmonic_minor_intervals, -6) - __harmonic_minor_intervals[6])),
-        '7th_chord': __chord.find_7th_chord(__shift_fun(
-            np.roll(__harmonic_minor_intervals, -6) - __harmonic_minor_intervals[6]))[0],
-        '9th_chord': __chord.find_9th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -6) - __harmonic_minor_intervals[6])),
-        '11th_chord': __chord.find_11th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -6) - __harmonic_minor_intervals[6])),
-        '13th_chord': __chord.find_13th_chord(
-            __shift_fun(np.roll(__harmonic_minor_intervals, -6) - __harmonic_minor_intervals[6])),
-    }
+    @classmethod
+    def __spelled_modes(cls, scale: str, root: str) -> list:
+        # (mode name, spelled notes) of every mode of a scale from a root, built once per (scale, root)
+        spelled = cls.__spellings.get((scale, root))
+        if spelled is None:
+            spelled = []
+            for name, md in cls.modes(scale).items():
+                notes = np.array(spell(root, md['intervals']))
+                notes.flags.writeable = False
+                spelled.append((name, notes))
+            cls.__spellings[(scale, root)] = spelled
+        return spelled
+
+    @classmethod
+    def __interchange_table(cls, scales: tuple) -> dict:
+        # chords of every degree of every mode, relative to the mode root: the same for all roots
+        table = cls.__interchange.get(scales)
+        if table is None:
+            modes = [(scale, mode, name) for scale in scales for mode, name in enumerate(cls.modes(scale))]
+            width = max(len(md['intervals']) for scale in scales for md in cls.modes(scale).values())
+            shape = (len(modes), width, len(Chord.levels))
+            intervals = np.full(shape[:2], -1, dtype=np.int64)
+            suffixes = np.full(shape, None, dtype=object)
+            tones = np.zeros(shape, dtype=np.int64)
+            for p, (scale, mode, _) in enumerate(modes):
+                family = list(cls.modes(scale).values())
+                n = len(family)
+                intervals[p, :n] = family[mode]['intervals']
+                for d in range(n):
+                    degree_mode = family[(mode + d) % n]
+                    for i, level in enumerate(Chord.levels):
+                        suffixes[p, d, i] = degree_mode[level]
+                        tones[p, d, i] = rotate_mask(cls.__chord.chord_tones(degree_mode['pitch_class_set'], level),
+                                                     int(intervals[p, d]))
+            table = cls.__interchange[scales] = {
+                'modes': modes,
+                'intervals': intervals,
+                'suffixes': suffixes,
+                'found': suffixes != None,  # noqa: E711
+                'tones': tones,
+            }
+        return table
+
+    def interchange_matrix(self, root: str = 'C', home=('major', 0), scales='all') -> dict:
+        """
+        Get the chords of every degree of every parallel mode (all the modes of the scales from the same root),
+        compared with a home mode
+        :param root: root note
+        :param home: home mode, (scale, mode index) or mode name (e.g. 'aeonian')
+        :param scales: scale names, or 'all'
+        :return: dict, arrays indexed by [mode, degree] or [mode, degree, level] (levels in Chord.levels order,
+            degrees padded for shorter scales)
+            - 'root': root note
+            - 'modes': list of (scale, mode index, mode name)
+            - 'home': index of the home mode in 'modes'
+            - 'intervals': degree intervals from the root (-1 for padding)
+            - 'degrees': degree notes ('' for padding)
+            - 'chords': chord names (None if not found)
+            - 'tones': chord tones as 12-bit pitch class masks
+            - 'diff': tones that differ from the chord on the same degree of the home mode (tones xor home tones)
+            - 'changed': True where the chord differs from the one on the same degree of the home mode
+        """
+        if root not in pitch_classes:
+            raise Exception('Not valid root note.')
+        if isinstance(scales, str):
+            scales = self.__scales if scales == 'all' else [scales]
+        for scale in scales:
+            if scale not in self.__scales:
+                raise Exception('Not supported scale.')
+        table = self.__interchange_table(tuple(scales))
+        modes = table['modes']
+        if isinstance(home, str):
+            home = next(((scale, mode) for scale, mode, name in modes if name == home), None)
+        home = next((p for p, (scale, mode, _) in enumerate(modes) if (scale, mode) == tuple(home or ())), None)
+        if home is None:
+            raise Exception('Not valid mode.')
+
+        root = normalize(root)
+        idx = pitch_classes[root]
+        intervals = table['intervals']
+        degrees = np.full(intervals.shape, '', dtype=object)
+        for p, (scale, mode, _) in enumerate(modes):
+            notes = self.__spelled_modes(scale, root)[mode][1]
+            degrees[p, :len(notes)] = notes.tolist()
+
+        found = table['found']
+        chords = np.full(found.shape, None, dtype=object)
+        chords[found] = np.broadcast_to(degrees[:, :, None], found.shape)[found] + table['suffixes'][found]
+        tones = ((table['tones'] << idx) | (table['tones'] >> (12 - idx))) & 0xFFF
+        valid = intervals >= 0
+        changed = ((table['suffixes'] != table['suffixes'][home][None])
+                   | (intervals != intervals[home][None])[:, :, None]) & valid[:, :, None]
+        return {
+            'root': root,
+            'modes': list(modes),
+            'home': home,
+            'intervals': intervals.copy(),
+            'degrees': degrees,
+            'chords': chords,
+            'tones': tones,
+            'diff': (tones ^ tones[home][None]) * valid[:, :, None],
+            'changed': changed,
+        }
 
     def get_modes_name(self, scale: str) -> list | None:
         """
@@ -399,119 +433,209 @@ class Modal(object):
             - 'melodic minor'
             - 'harmonic major'
             - 'harmonic minor'
+            - any scale added with register_scale
         :return:
         """
-        modes = None
-        if scale == 'major':
-            modes = self.major_modes.keys()
-        if scale == 'melodic minor':
-            modes = self.melodic_minor_modes.keys()
-        if scale == 'harmonic major':
-            modes = self.harmonic_major_modes.keys()
-        if scale == 'harmonic minor':
-            modes = self.harmonic_minor_modes.keys()
-        return modes
+        if self._catalog is not None:
+            return self._catalog.modes.get(scale)
+        if scale not in self.__scales:
+            return None
+        return self.modes(scale).keys()
 
-    def get_mode(self, root: str = 'C', scale: str = 'major', mode: int = 0):
+    def get_mode(self, root: str = 'C', scale: str = 'major', mode: int = 0) -> Mode:
+        """
+        Get a mode; the Mode is built once per (root, scale, mode) and shared by every call
+        :param root: root note
+        :param scale: scale name
+        :param mode: mode index
+        :return: immutable Mode (mode['notes'], mode['triad_chord'], ... or mode.as_dict() for the dict form)
+        """
+        md = self._interned.get((root, scale, mode))
+        if md is None:
+            # counted as a hit or a miss by the lookup of the normalized spelling
+            md = self.__make_mode(root, scale, mode)
+            self._interned[(root, scale, mode)] = md
+        else:
+            self._interned_stats['hits'] += 1
+        return md
 
-        if root not in self.__chromatic:
+    def __make_mode(self, root: str, scale: str, mode: int) -> Mode:
+        if self._catalog is not None:
+            md = self._catalog.get_mode(root=root, scale=scale, mode=mode)
+            root = normalize(root)
+            mode_name = md['mode name'][len(root) + 1:]
+            notes = md['notes']
+            notes.flags.writeable = False
+            pcs = md['pitch_class_set']
+            symbols = [None if md[level] is None else md[level][len(root):] for level in Chord.levels]
+            return self.__intern(root, scale, mode, mode_name, notes, pcs, symbols)
+        if root not in pitch_classes:
             raise Exception('Not valid root note.')
         if scale not in self.__scales:
             raise Exception('Not supported scale.')
-        if not (0 <= mode < 7):
+        if not (0 <= mode < len(self.get_modes_name(scale))):
             raise Exception('Not valid mode.')
-
-        idx = np.where(self.__chromatic == root)[0]
-        chrom = np.roll(self.__chromatic, -idx)
-
-        sc = None
-        if scale == 'major':
-            sc = self.major_modes
-        if scale == 'melodic minor':
-            sc = self.melodic_minor_modes
-        if scale == 'harmonic major':
-            sc = self.harmonic_major_modes
-        if scale == 'harmonic minor':
-            sc = self.harmonic_minor_modes
-
-        mode_name = list(sc.keys())[mode]
-        md = {
-            'mode name': root + ' ' + mode_name,
-            'notes': chrom[sc[mode_name]['intervals']],
-            'triad_chord': root + sc[mode_name]['triad_chord'],
-            '7th_chord': root + sc[mode_name]['7th_chord'],
-            '9th_chord': root + sc[mode_name]['9th_chord'],
-            '11th_chord': root + sc[mode_name]['11th_chord'],
-            '13th_chord': root + sc[mode_name]['13th_chord'],
-        }
+        sc = list(self.modes(scale).values())[mode]
+        degree = (mode, self.__mode_names[scale][mode], sc['pitch_class_set'],
+                  tuple(sc[level] for level in Chord.levels))
+        return self.__realize(normalize(root), scale, degree)
+
+    def __realize(self, root: str, scale: str, degree: tuple) -> Mode:
+        # Mode of a normalized root from a degree in interval space (see HarmonizationCache.degrees)
+        mode, mode_name, pcs, symbols = degree
+        md = self._interned.get((root, scale, mode))
+        if md is not None:
+            self._interned_stats['hits'] += 1
+            return md
+        notes = self.__spelled_modes(scale, root)[mode][1]
+        return self.__intern(root, scale, mode, mode_name, notes, pcs.transpose(pitch_classes[root]), symbols)
+
+    def __intern(self, root: str, scale: str, mode: int, mode_name: str, notes, pcs, symbols) -> Mode:
+        # every spelling of the root shares the Mode of its normalized spelling
+        md = self._interned.get((root, scale, mode))
+        if md is not None:
+            self._interned_stats['hits'] += 1
+            return md
+        self._interned_stats['misses'] += 1
+        # the chord tones are looked up on first use, so that catalog lookups never build the chord table
+        chords = tuple(None if symbol is None else ChordInfo(root, symbol, level, scale=pcs.mask)
+                       for level, symbol in zip(Chord.levels, symbols))
+        md = Mode(root, scale, mode, mode_name, notes, pcs,
+                  tuple(None if chord is None else chord.name for chord in chords), chords)
+        self._interned[(root, scale, mode)] = md
         return md
 
-    def mode_harmonization(self, root: str = 'C', scale: str = 'major', mode: int = 0):
-
-        modes = []
-        md = self.get_mode(root=root, scale=scale, mode=mode)
-        modes.append(md)
+    @classmethod
+    def __degrees(cls, scale: str, mode: int) -> tuple:
+        # every degree of a mode in interval space: the same for all roots
+        table = list(cls.modes(scale).values())
+        names = cls.__mode_names[scale]
+        n = len(table)
+        return tuple(((mode + i) % n, names[(mode + i) % n], table[(mode + i) % n]['pitch_class_set'],
+                      tuple(table[(mode + i) % n][level] for level in Chord.levels)) for i in range(n))
 
-        for i in range(1, 7):
-            modes.append(self.get_mode(root=md['notes'][i], scale=scale, mode=(mode+i)%7))
+    def get_modes_bulk(self, roots='all', scales='all', modes='all', columnar: bool = False):
+        """
+        Get many modes at once (every combination of roots, scales and modes)
+        :param roots: root note names or pitch classes, or 'all' (the 12 chromatic names)
+        :param scales: scale names, or 'all'
+        :param modes: mode indices, or 'all'
+        :param columnar: return a dict of 1-d columns (e.g. for pandas.DataFrame) instead of a structured array
+        :return: structured array with one row per (root, scale, mode), in that nesting order
+            - 'root', 'root_idx', 'scale', 'mode', 'mode name'
+            - 'notes_idx', 'notes': mode notes (padded with -1 / '' for shorter scales)
+            - 'triad_chord', '7th_chord', '9th_chord', '11th_chord', '13th_chord'
+        """
+        if isinstance(roots, str) and roots == 'all':
+            roots = chromatic
+        elif isinstance(roots, (str, int, np.integer)):
+            roots = [roots]
+        root_names = [self.__root_name(r) for r in roots]
+        if not root_names:
+            raise Exception('Not valid roots.')
+        root_idx = np.array([pitch_classes[r] for r in root_names], dtype=np.int64)
+        if isinstance(scales, str):
+            scales = self.__scales if scales == 'all' else [scales]
+        if not len(scales):
+            raise Exception('Not valid scales.')
+        for scale in scales:
+            if scale not in self.__scales:
+                raise Exception('Not supported scale.')
+
+        # (scale, mode) combinations in interval space
+        combos = []
+        for scale in scales:
+            table = list(self.modes(scale).items())
+            mode_idx = range(len(table)) if isinstance(modes, str) and modes == 'all' else np.atleast_1d(modes).tolist()
+            for mode in mode_idx:
+                if not (0 <= mode < len(table)):
+                    raise Exception('Not valid mode.')
+                combos.append((scale, mode) + table[mode])
+        if not combos:
+            raise Exception('Not valid modes.')
+        width = max(len(c[3]['intervals']) for c in combos)
+        intervals = np.full((len(combos), width), -1, dtype=np.int64)
+        for i, c in enumerate(combos):
+            intervals[i, :len(c[3]['intervals'])] = c[3]['intervals']
+
+        notes_idx = np.where(intervals >= 0, (root_idx[:, None, None] + intervals[None]) % 12, -1)
+        notes = np.array([[list(self.__spelled_modes(c[0], r)[c[1]][1]) + [''] * (width - len(c[3]['intervals']))
+                           for c in combos] for r in root_names], dtype=str)
+        root_names = np.array(root_names)
+
+        columns = OrderedDict()
+        columns['root'] = np.repeat(root_names, len(combos))
+        columns['root_idx'] = np.repeat(root_idx, len(combos))
+        columns['scale'] = np.tile(np.array([c[0] for c in combos]), len(root_idx))
+        columns['mode'] = np.tile(np.array([c[1] for c in combos]), len(root_idx))
+        columns['mode name'] = np.char.add(np.char.add(root_names[:, None], ' '),
+                                           np.array([c[2] for c in combos])[None]).ravel()
+        columns['notes_idx'] = notes_idx.reshape(-1, width)
+        columns['notes'] = notes.reshape(-1, width)
+        for level in Chord.levels:
+            suffix = np.array([c[3][level] for c in combos], dtype=object)
+            found = suffix != None  # noqa: E711
+            chords = np.char.add(root_names[:, None], np.where(found, suffix, '').astype(str)[None])
+            columns[level] = np.where(found[None], chords, '').ravel()
+
+        if columnar:
+            flat = OrderedDict()
+            for key, column in columns.items():
+                if column.ndim == 2:
+                    for i in range(width):
+                        flat[key + '_' + str(i)] = column[:, i]
+                else:
+                    flat[key] = column
+            return flat
+
+        dtype = [(key, column.dtype, column.shape[1:]) for key, column in columns.items()]
+        result = np.empty(len(columns['root']), dtype=dtype)
+        for key, column in columns.items():
+            result[key] = column
+        return result
+
+    def __root_name(self, root) -> str:
+        if isinstance(root, (int, np.integer)):
+            return chromatic[int(root) % 12]
+        if root not in pitch_classes:
+            raise Exception('Not valid root note.')
+        return normalize(root)
 
+    def mode_harmonization(self, root: str = 'C', scale: str = 'major', mode: int = 0) -> tuple:
+        """
+        Get the modes of every degree of a mode, from the harmonization cache: recent (root, scale, mode) are
+        answered directly, others from the degrees of (scale, mode), shared by every root, and the interned
+        modes of the degree notes
+        :param root: root note
+        :param scale: scale name
+        :param mode: mode index
+        :return: tuple of Mode, one per degree
+        """
+        cache = self.harmonization_cache
+        modes = cache.get((root, scale, mode))
+        if modes is None:
+            md = self.get_mode(root=root, scale=scale, mode=mode)
+            notes = md.notes.tolist()
+            if self._catalog is not None:
+                # the catalog has the spelled modes already: no interval space table to build
+                modes = (md,) + tuple(self.get_mode(note, scale, (mode + i) % len(notes))
+                                      for i, note in enumerate(notes[1:], 1))
+            else:
+                degrees = cache.degrees(scale, mode, self.__degrees)
+                realize = self.__realize
+                modes = (md,) + tuple(realize(note, scale, degree) for note, degree in zip(notes[1:], degrees[1:]))
+            cache.put((root, scale, mode), modes)
         return modes
 
     def print_mode_harmonization(self, root: str = 'C', scale: str = 'major', mode: int = 0):
-        harm = self.mode_harmonization(root=root, scale=scale, mode=mode)
-
-        table = '<center><b>' + harm[0]['mode name'].title() + '</b></center>\n\n'
-        table += '| Chord |'
-        table += 'i'+dim if harm[0]['triad_chord'].endswith('dim') else 'i' if harm[0]['triad_chord'].endswith('m') else 'I'
-        table += '|'
-        table += 'ii' + dim if harm[1]['triad_chord'].endswith('dim') else 'ii' if harm[1]['triad_chord'].endswith(
-            'm') else 'II'
-        table += '|'
-        table += 'iii' + dim if harm[2]['triad_chord'].endswith('dim') else 'iii' if harm[2]['triad_chord'].endswith(
-            'm') else 'III'
-        table += '|'
-        table += 'iv' + dim if harm[3]['triad_chord'].endswith('dim') else 'iv' if harm[3]['triad_chord'].endswith(
-            'm') else 'IV'
-        table += '|'
-        table += 'v' + dim if harm[4]['triad_chord'].endswith('dim') else 'v' if harm[4]['triad_chord'].endswith(
-            'm') else 'V'
-        table += '|'
-        table += 'vi' + dim if harm[5]['triad_chord'].endswith('dim') else 'vi' if harm[5]['triad_chord'].endswith(
-            'm') else 'VI'
-        table += '|'
-        table += 'vii' + dim if harm[6]['triad_chord'].endswith('dim') else 'vii' if harm[6]['triad_chord'].endswith(
-            'm') else 'VII'
-        table += '|'
-        table += '\n'
-
-        table += '|--|--|--|--|--|--|--|--|\n'
-
-        table += '| triad     |'
-        for h in harm:
-            table += h['triad_chord'] + '|'
-        table += '\n'
-
-        table += '| 7th     |'
-        for h in harm:
-            table += h['7th_chord'] + '|'
-        table += '\n'
-
-        table += '| 9th     |'
-        for h in harm:
-            table += h['9th_chord'] + '|'
-        table += '\n'
-
-        table += '| 11th     |'
-        for h in harm:
-            table += h['11th_chord'] + '|'
-        table += '\n'
-
-        table += '| 13th     |'
-        for h in harm:
-            table += h['13th_chord'] + '|'
-        table += '\n'
+        if self._renderer is None:
+            self._renderer = Renderer(self)
+        return self._renderer.render(root=root, scale=scale, mode=mode)
 
-        return table
+
+Chord.on_change(Modal.clear_caches)
+register_cache('modal.harmonization', lambda: Modal.harmonization_cache.cache_info())
+register_cache('modal.interned', lambda: dict(Modal._interned_stats, size=len(Modal._interned)))
 
 
 if __name__ == '__main__':
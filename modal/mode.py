@@ -0,0 +1,149 @@
+from .chord import Chord
+from .pitchclass import PitchClassSet, rotate_mask
+from .spelling import pitch_classes
+
+# keys of the dict form of a mode, in order
+keys = ('mode name', 'notes') + Chord.levels + ('pitch_class_set',)
+_level_index = {level: i for i, level in enumerate(Chord.levels)}
+
+
+class ChordInfo(object):
+    """
+    Immutable chord of a mode harmonization
+    """
+    __slots__ = ('name', 'root', 'symbol', 'level', '_tones', '_scale')
+
+    def __init__(self, root: str, symbol: str, level: str, tones=None, scale: int | None = None):
+        """
+        :param root: root note
+        :param symbol: chord symbol without root, e.g. 'm7'
+        :param level: 'triad_chord', '7th_chord', '9th_chord', '11th_chord' or '13th_chord'
+        :param tones: PitchClassSet of the chord tones (None to find them on first use from scale)
+        :param scale: 12-bit mask of the notes of the mode the chord is built on
+        """
+        object.__setattr__(self, 'name', root + symbol)
+        object.__setattr__(self, 'root', root)
+        object.__setattr__(self, 'symbol', symbol)
+        object.__setattr__(self, 'level', level)
+        object.__setattr__(self, '_tones', tones)
+        object.__setattr__(self, '_scale', scale)
+
+    @property
+    def tones(self) -> PitchClassSet:
+        """
+        Chord tones, looked up in the chord table on first use only
+        :return: PitchClassSet of the chord tones
+        """
+        tones = self._tones
+        if tones is None:
+            idx = pitch_classes[self.root]
+            tones = PitchClassSet(rotate_mask(Chord().chord_tones(PitchClassSet(rotate_mask(self._scale, -idx)),
+                                                                  self.level), idx))
+            object.__setattr__(self, '_tones', tones)
+        return tones
+
+    def __setattr__(self, key, value):
+        raise AttributeError('ChordInfo is immutable.')
+
+    def __reduce__(self):
+        # pickle and copy through the constructor, which does not go through __setattr__
+        return ChordInfo, (self.root, self.symbol, self.level, self._tones, self._scale)
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __repr__(self) -> str:
+        return 'ChordInfo(' + repr(self.name) + ', ' + repr(self.level) + ')'
+
+
+class Mode(object):
+    """
+    Immutable mode of a scale from a root, built once and shared by every call asking for it.
+    The former dict form is available with mode['notes'], mode['triad_chord'], ... or as_dict().
+    """
+    __slots__ = ('name', 'root', 'scale', 'mode', 'mode_name', 'notes', 'pitch_class_set', 'symbols', 'chords')
+
+    def __init__(self, root: str, scale: str, mode: int, mode_name: str, notes, pitch_class_set, symbols: tuple,
+                 chords: tuple):
+        """
+        :param root: root note
+        :param scale: scale name
+        :param mode: mode index
+        :param mode_name: mode name without root, e.g. 'dorian'
+        :param notes: read-only array of note names
+        :param pitch_class_set: PitchClassSet of the notes
+        :param symbols: chord names of each level (None if not found)
+        :param chords: ChordInfo of each level (None if not found)
+        """
+        object.__setattr__(self, 'name', root + ' ' + mode_name)
+        object.__setattr__(self, 'root', root)
+        object.__setattr__(self, 'scale', scale)
+        object.__setattr__(self, 'mode', mode)
+        object.__setattr__(self, 'mode_name', mode_name)
+        notes.flags.writeable = False
+        object.__setattr__(self, 'notes', notes)
+        object.__setattr__(self, 'pitch_class_set', pitch_class_set)
+        object.__setattr__(self, 'symbols', symbols)
+        object.__setattr__(self, 'chords', chords)
+
+    def __setattr__(self, key, value):
+        raise AttributeError('Mode is immutable.')
+
+    def __reduce__(self):
+        return Mode, (self.root, self.scale, self.mode, self.mode_name, self.notes, self.pitch_class_set,
+                      self.symbols, self.chords)
+
+    def chord(self, level: str = 'triad_chord') -> ChordInfo | None:
+        """
+        Get the chord of a level
+        :param level: 'triad_chord', '7th_chord', '9th_chord', '11th_chord' or '13th_chord'
+        :return: ChordInfo (None if not found)
+        """
+        return self.chords[_level_index[level]]
+
+    def __getitem__(self, key: str):
+        i = _level_index.get(key)
+        if i is not None:
+            return self.symbols[i]
+        if key == 'mode name':
+            return self.name
+        if key == 'notes':
+            return self.notes
+        if key == 'pitch_class_set':
+            return self.pitch_class_set
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key) -> bool:
+        return key in keys
+
+    def __iter__(self):
+        return iter(keys)
+
+    def __len__(self) -> int:
+        return len(keys)
+
+    def keys(self) -> tuple:
+        return keys
+
+    def items(self) -> list:
+        return [(key, self[key]) for key in keys]
+
+    def as_dict(self) -> dict:
+        """
+        Get the former dict form (a new dict with its own copy of the notes)
+        :return: dict with 'mode name', 'notes', 'triad_chord', '7th_chord', '9th_chord', '11th_chord',
+            '13th_chord' and 'pitch_class_set'
+        """
+        md = {'mode name': self.name, 'notes': self.notes.copy()}
+        md.update(zip(Chord.levels, self.symbols))
+        md['pitch_class_set'] = self.pitch_class_set
+        return md
+
+    def __repr__(self) -> str:
+        return 'Mode(' + repr(self.name) + ', ' + repr(self.scale) + ')'
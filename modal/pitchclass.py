@@ -0,0 +1,138 @@
+import numpy as np
+
+_BITS = np.arange(12)
+_FULL = 0xFFF
+
+
+class PitchClassSet(object):
+    """
+    Immutable set of pitch classes stored as a 12-bit integer mask
+    (bit i set <=> pitch class i in the set)
+    """
+    __slots__ = ('_mask',)
+
+    def __init__(self, mask: int = 0):
+        object.__setattr__(self, '_mask', int(mask) & _FULL)
+
+    def __setattr__(self, key, value):
+        raise AttributeError('PitchClassSet is immutable.')
+
+    def __delattr__(self, key):
+        raise AttributeError('PitchClassSet is immutable.')
+
+    def __reduce__(self):
+        # pickle and copy through the constructor, which does not go through __setattr__
+        return PitchClassSet, (self._mask,)
+
+    @classmethod
+    def from_intervals(cls, intervals) -> 'PitchClassSet':
+        """
+        Build a pitch class set from intervals
+        :param intervals: intervals (any integers, reduced modulo 12)
+        :return: pitch class set
+        """
+        return cls(to_mask(intervals))
+
+    @property
+    def mask(self) -> int:
+        return self._mask
+
+    def intervals(self) -> np.array:
+        """
+        Intervals of the set
+        :return: sorted intervals array
+        """
+        return np.flatnonzero((self._mask >> _BITS) & 1)
+
+    def transpose(self, n: int) -> 'PitchClassSet':
+        """
+        Transpose the set
+        :param n: semitones
+        :return: transposed set
+        """
+        return PitchClassSet(rotate_mask(self._mask, n))
+
+    def rotate(self, degree: int) -> 'PitchClassSet':
+        """
+        Rotate the set so that its degree-th element becomes 0 (mode rotation)
+        :param degree: degree index
+        :return: rotated set
+        """
+        intervals = self.intervals()
+        if len(intervals) == 0:
+            return self
+        return self.transpose(-int(intervals[degree % len(intervals)]))
+
+    def union(self, other) -> 'PitchClassSet':
+        return PitchClassSet(self._mask | to_mask(other))
+
+    def intersection(self, other) -> 'PitchClassSet':
+        return PitchClassSet(self._mask & to_mask(other))
+
+    def difference(self, other) -> 'PitchClassSet':
+        return PitchClassSet(self._mask & ~to_mask(other))
+
+    def issubset(self, other) -> bool:
+        return self._mask & ~to_mask(other) == 0
+
+    def issuperset(self, other) -> bool:
+        mask = to_mask(other)
+        return self._mask & mask == mask
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+    __le__ = issubset
+    __ge__ = issuperset
+
+    def __contains__(self, pc) -> bool:
+        return bool(self._mask >> (int(pc) % 12) & 1)
+
+    def __len__(self) -> int:
+        return bin(self._mask).count('1')
+
+    def __iter__(self):
+        return iter(self.intervals().tolist())
+
+    def __int__(self) -> int:
+        return self._mask
+
+    __index__ = __int__
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PitchClassSet):
+            return self._mask == other._mask
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._mask)
+
+    def __repr__(self) -> str:
+        return 'PitchClassSet(' + str(self.intervals().tolist()) + ')'
+
+
+def to_mask(value) -> int:
+    """
+    Convert a pitch class set, a mask or an intervals array to a 12-bit mask
+    :param value: PitchClassSet, int mask or intervals
+    :return: mask
+    """
+    if isinstance(value, PitchClassSet):
+        return value.mask
+    if isinstance(value, (int, np.integer)):
+        return int(value) & _FULL
+    mask = 0
+    for i in value:
+        mask |= 1 << (int(i) % 12)
+    return mask
+
+
+def rotate_mask(mask: int, n: int) -> int:
+    """
+    Transpose a 12-bit mask
+    :param mask: mask
+    :param n: semitones
+    :return: transposed mask
+    """
+    n %= 12
+    return ((mask << n) | (mask >> (12 - n))) & _FULL
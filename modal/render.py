@@ -0,0 +1,170 @@
+import json
+from .symbol import dim
+from .chord import Chord
+
+formats = ('markdown', 'html', 'csv', 'json')
+
+_numerals = ['I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X', 'XI', 'XII']
+_labels = [level[:-len('_chord')] for level in Chord.levels]
+
+
+def roman_numeral(degree: int, triad_chord: str | None) -> str:
+    """
+    Roman numeral of a degree
+    :param degree: degree index (0 for the tonic)
+    :param triad_chord: triad chord symbol of the degree
+    :return: upper case for major, lower case for minor, lower case + dim sign for diminished
+    """
+    numeral = _numerals[degree]
+    if triad_chord is not None:
+        if triad_chord.endswith('dim'):
+            return numeral.lower() + dim
+        if triad_chord.endswith('m'):
+            return numeral.lower()
+    return numeral
+
+
+def _escape(template: str) -> str:
+    return template.replace('{', '{{').replace('}', '}}')
+
+
+def _html(value: str) -> str:
+    return value.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+
+
+def _csv(value: str) -> str:
+    if any(c in value for c in ',"\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+# each layout turns the Roman numerals of a harmonization into a format string taking the title followed by
+# the chords, level by level; the value encoder is applied to every argument before formatting, None standing
+# for a missing chord
+
+def _markdown_layout(numerals: list) -> str:
+    cells = '{}|' * len(numerals)
+    template = '<center><b>{}</b></center>\n\n'
+    template += '| Chord |' + _escape('|'.join(numerals)) + '|\n'
+    template += '|--|' + '--|' * len(numerals) + '\n'
+    for label in _labels:
+        template += '| ' + label + '     |' + cells + '\n'
+    return template
+
+
+def _html_layout(numerals: list) -> str:
+    cells = '<td>{}</td>' * len(numerals)
+    template = '<table>\n<caption>{}</caption>\n'
+    template += '<tr><th>Chord</th>' + ''.join('<th>' + _escape(_html(n)) + '</th>' for n in numerals) + '</tr>\n'
+    for label in _labels:
+        template += '<tr><th>' + label + '</th>' + cells + '</tr>\n'
+    template += '</table>\n'
+    return template
+
+
+def _csv_layout(numerals: list) -> str:
+    n = len(numerals)
+    template = 'Mode,Chord,' + _escape(','.join(_csv(numeral) for numeral in numerals)) + '\r\n'
+    for i, label in enumerate(_labels):
+        # the title is repeated on every row, hence the explicit field numbers
+        template += '{0},' + label + ''.join(',{%d}' % (1 + i * n + d) for d in range(n)) + '\r\n'
+    return template
+
+
+def _json_layout(numerals: list) -> str:
+    template = '{{"mode name": {}, "degrees": ' + _escape(json.dumps(numerals, ensure_ascii=False))
+    for label in _labels:
+        template += ', "' + label + '": [' + ', '.join(['{}'] * len(numerals)) + ']'
+    return template + '}}\n'
+
+
+_layouts = {
+    'markdown': (_markdown_layout, lambda value: value or ''),
+    'html': (_html_layout, lambda value: _html(value or '')),
+    'csv': (_csv_layout, lambda value: _csv(value or '')),
+    'json': (_json_layout, lambda value: json.dumps(value, ensure_ascii=False)),
+}
+
+_separators = {
+    'markdown': '\n',
+    'html': '\n',
+    'csv': '',
+    'json': '',
+}
+
+
+class Renderer(object):
+    """
+    Render mode harmonizations as markdown, HTML, CSV or JSON from precompiled per-(scale, mode) templates
+    """
+
+    def __init__(self, modal=None):
+        """
+        :param modal: Modal instance providing the harmonizations (a fresh one if None)
+        """
+        if modal is None:
+            from .modal import Modal
+            modal = Modal()
+        self.modal = modal
+        self._templates = {}
+        self._version = (Chord.version, modal.version)
+
+    def cache_clear(self) -> None:
+        """
+        Drop the compiled templates (done automatically when the chords or the scales change)
+        """
+        self._templates.clear()
+
+    def render(self, root: str = 'C', scale: str = 'major', mode: int = 0, fmt: str = 'markdown') -> str:
+        """
+        Render the harmonization of a mode
+        :param root: root note
+        :param scale: scale name
+        :param mode: mode index
+        :param fmt: 'markdown', 'html', 'csv' or 'json'
+        :return: rendered table
+        """
+        if fmt not in _layouts:
+            raise Exception('Not supported format.')
+        harm = self.modal.mode_harmonization(root=root, scale=scale, mode=mode)
+        version = (Chord.version, self.modal.version)
+        if self._version != version:
+            # the Roman numerals follow the triad symbols and the degrees of the scales
+            self._templates.clear()
+            self._version = version
+
+        # the Roman numerals only depend on (scale, mode), so the template is compiled once for all roots
+        key = (scale, mode, fmt)
+        template = self._templates.get(key)
+        if template is None:
+            numerals = [roman_numeral(degree, h.symbols[0]) for degree, h in enumerate(harm)]
+            template = self._templates[key] = _layouts[fmt][0](numerals)
+
+        encode = _layouts[fmt][1]
+        args = [encode(harm[0].name.title() if fmt == 'markdown' else harm[0].name)]
+        for i in range(len(Chord.levels)):
+            args.extend(encode(h.symbols[i]) for h in harm)
+        return template.format(*args)
+
+    def write_many(self, stream, queries, fmt: str = 'markdown', separator: str | None = None) -> int:
+        """
+        Render many harmonizations straight to a file-like object
+        :param stream: object with a write(str) method
+        :param queries: iterable of (root, scale, mode) tuples or dicts with those keys
+        :param fmt: 'markdown', 'html', 'csv' or 'json' (one JSON object per line)
+        :param separator: text written between tables (format dependent default)
+        :return: number of tables written
+        """
+        if separator is None:
+            separator = _separators.get(fmt, '')
+        count = 0
+        for query in queries:
+            if isinstance(query, dict):
+                table = self.render(fmt=fmt, **query)
+            else:
+                table = self.render(*query, fmt=fmt)
+            if count and separator:
+                stream.write(separator)
+            stream.write(table)
+            count += 1
+        return count
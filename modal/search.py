@@ -0,0 +1,247 @@
+import os
+import numpy as np
+from .chord import Chord
+
+# named cadences: degrees (from 0) the progression must end with
+cadences = {
+    'authentic': (4, 0),
+    'plagal': (3, 0),
+    'half': (4,),
+    'deceptive': (4, 5),
+    'ii-V-I': (1, 4, 0),
+}
+
+
+class ProgressionSearch(object):
+    """
+    Search the progressions of a given length over the harmonization of a mode. Each step is a (degree, level)
+    pair; the steps are generated depth first and a prefix is dropped as soon as no completion can satisfy
+    the constraints, using tables of the allowed degree transitions and of the degrees from which the end of
+    the progression is still reachable. Only the current path is kept, so long progressions run in constant
+    memory.
+    """
+
+    def __init__(self, root: str = 'C', scale: str = 'major', mode: int = 0, length: int = 4,
+                 levels: tuple = ('triad_chord', '7th_chord'), start=None, end=None, transitions=None,
+                 repeat: bool = False, distinct: bool = False, min_levels: dict | None = None, predicate=None,
+                 modal=None):
+        """
+        :param root: root note
+        :param scale: scale name
+        :param mode: mode index
+        :param length: number of chords
+        :param levels: levels each chord may use, e.g. ('triad_chord', '7th_chord')
+        :param start: degrees (from 0) the progression may start on, e.g. (0,) for I (any if None)
+        :param end: cadences the progression must end with: degree tuples, e.g. (4, 0) for V-I, or names of
+            the cadences dict, e.g. 'authentic' (any ending if None)
+        :param transitions: allowed (degree, next degree) pairs, or a degrees x degrees boolean matrix
+            (every transition if None)
+        :param repeat: allow the same degree twice in a row
+        :param distinct: use every degree at most once
+        :param min_levels: level -> minimum number of chords of that level, e.g. {'7th_chord': 1}
+        :param predicate: function of a prefix (tuple of (degree, level)) returning False to drop it; it must be
+            picklable (e.g. a module level function) to count with several processes
+        :param modal: Modal instance (a fresh one if None)
+        """
+        if modal is None:
+            from .modal import Modal
+            modal = Modal()
+        if length < 1:
+            raise Exception('Not valid length.')
+        for level in levels:
+            if level not in Chord.levels:
+                raise Exception('Not valid level.')
+        harmonization = modal.mode_harmonization(root=root, scale=scale, mode=mode)
+        n = len(harmonization)
+        self.length = length
+        self.levels = tuple(levels)
+        self.distinct = distinct
+        self.predicate = predicate
+        # chord names and available levels (indices into self.levels) of each degree
+        self.names = [tuple(None if md.chord(level) is None else md.chord(level).name for level in self.levels)
+                      for md in harmonization]
+        self._options = [tuple(i for i, name in enumerate(names) if name is not None) for names in self.names]
+
+        everything = (1 << n) - 1
+        if transitions is None:
+            succ = [everything] * n
+        else:
+            succ = [0] * n
+            transitions = np.asarray(transitions)
+            if transitions.dtype == bool:
+                if transitions.shape != (n, n):
+                    raise Exception('Not valid transition matrix.')
+                transitions = np.argwhere(transitions)
+            for a, b in transitions.reshape(-1, 2).tolist():
+                if not (0 <= a < n and 0 <= b < n):
+                    raise Exception('Not valid degree.')
+                succ[a] |= 1 << b
+        if not repeat:
+            succ = [s & ~(1 << d) for d, s in enumerate(succ)]
+        self._succ = succ
+
+        # every cadence must fit in the progression; () matches any ending
+        if end is None:
+            patterns = [()]
+        else:
+            if isinstance(end, str) or all(isinstance(d, int) for d in end):
+                end = [end]
+            patterns = [cadences[c] if isinstance(c, str) else tuple(c) for c in end]
+            if any(not (0 <= d < n) for p in patterns for d in p):
+                raise Exception('Not valid degree.')
+            patterns = [p for p in patterns if len(p) <= length]
+        self.cadences = patterns
+
+        # allowed degrees per position
+        allowed = []
+        for i in range(length):
+            mask = 0
+            for p in patterns:
+                offset = i - (length - len(p))
+                mask |= everything if offset < 0 else 1 << p[offset]
+            allowed.append(mask)
+        if start is not None:
+            start = (start,) if isinstance(start, int) else start
+            allowed[0] &= sum(1 << d for d in set(start) if 0 <= d < n)
+        usable = sum(1 << d for d in range(n) if self._options[d])
+        # cadences still matching a degree at a position (bit per pattern)
+        self._cadence_at = [[sum(1 << j for j, p in enumerate(patterns)
+                                 if i < length - len(p) or p[i - (length - len(p))] == d) for d in range(n)]
+                            for i in range(length)]
+
+        # degrees at each position from which the last position can still be reached
+        reach = [0] * length
+        reach[-1] = allowed[-1] & usable
+        for i in range(length - 2, -1, -1):
+            reach[i] = sum(1 << d for d in range(n)
+                           if (allowed[i] & usable) >> d & 1 and succ[d] & reach[i + 1])
+        self._reach = reach
+        self._all = everything
+
+        required = min_levels or {}
+        for level in required:
+            if level not in self.levels:
+                raise Exception('Not valid level.')
+        self._required = tuple(self.levels.index(level) for level in required)
+        self._deficits = tuple(required.values())
+
+    def _children(self, i: int, last: int, used: int, deficits: tuple, alive: int, steps: tuple = ()) -> list:
+        # every valid next step with its state: (degree, level, used, deficits, alive)
+        mask = self._reach[i] & (self._succ[last] if last >= 0 else self._all) & ~used
+        remaining = self.length - i - 1
+        children = []
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            d = bit.bit_length() - 1
+            a = alive & self._cadence_at[i][d]
+            if not a:
+                continue
+            u = used | bit if self.distinct else 0
+            for level in self._options[d]:
+                df = deficits
+                if df:
+                    df = tuple(c - 1 if c and r == level else c for r, c in zip(self._required, df))
+                    if sum(df) > remaining:
+                        continue
+                if self.predicate is not None and not self.predicate(steps + ((d, self.levels[level]),)):
+                    continue
+                children.append((d, level, u, df, a))
+        return children
+
+    def _root_state(self) -> tuple:
+        return 0, (), -1, 0, self._deficits, (1 << len(self.cadences)) - 1
+
+    def _walk(self, state: tuple):
+        # depth first from a prefix state, with the pending children of every position of the path
+        start, prefix, last, used, deficits, alive = state
+        if start == self.length:
+            yield prefix
+            return
+        steps = list(prefix)
+        stack = [self._children(start, last, used, deficits, alive, prefix)[::-1]]
+        while stack:
+            children = stack[-1]
+            i = start + len(stack) - 1
+            del steps[i:]
+            if not children:
+                stack.pop()
+                continue
+            d, level, u, df, a = children.pop()
+            steps.append((d, self.levels[level]))
+            if i + 1 == self.length:
+                yield tuple(steps)
+            else:
+                stack.append(self._children(i + 1, d, u, df, a, tuple(steps))[::-1])
+
+    def steps(self):
+        """
+        Generate the matching progressions, lazily
+        :return: generator of tuples of (degree, level), degree from 0
+        """
+        return self._walk(self._root_state())
+
+    def progressions(self):
+        """
+        Generate the matching progressions as chord names, lazily
+        :return: generator of tuples of chord names, e.g. ('Dm7', 'G7', 'Cmaj7')
+        """
+        names = self.names
+        levels = {level: i for i, level in enumerate(self.levels)}
+        for steps in self._walk(self._root_state()):
+            yield tuple(names[d][levels[level]] for d, level in steps)
+
+    def __iter__(self):
+        return self.progressions()
+
+    def count(self, workers: int | None = None) -> int:
+        """
+        Count every matching progression. Without a predicate the counts of equal states are shared (exact
+        and fast even for long progressions); with a predicate every progression is enumerated
+        :param workers: number of processes, splitting the search on its first steps (in process if None
+            and there is no predicate, os.cpu_count() if None and there is a predicate)
+        :return: number of progressions
+        """
+        if workers is None:
+            if self.predicate is None:
+                return self._count_from(self._root_state())
+            workers = os.cpu_count() or 1
+        if workers <= 1:
+            return self._count_from(self._root_state())
+        from concurrent.futures import ProcessPoolExecutor
+        prefixes = self._prefixes(workers * 4)
+        chunks = [prefixes[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return sum(pool.map(_count_prefixes, [self] * len(chunks), chunks))
+
+    def _count_from(self, state: tuple) -> int:
+        if self.predicate is not None:
+            return sum(1 for _ in self._walk(state))
+        start, prefix, last, used, deficits, alive = state
+        return self._count(start, last, used, deficits, alive, {})
+
+    def _count(self, i: int, last: int, used: int, deficits: tuple, alive: int, memo: dict) -> int:
+        if i == self.length:
+            return 1
+        key = (i, last, used, deficits, alive)
+        total = memo.get(key)
+        if total is None:
+            total = sum(self._count(i + 1, d, u, df, a, memo) for d, _, u, df, a in
+                        self._children(i, last, used, deficits, alive))
+            memo[key] = total
+        return total
+
+    def _prefixes(self, size: int) -> list:
+        # prefix states, expanded breadth first until there are at least size of them or the end is reached
+        states = [self._root_state()]
+        while len(states) < size and states and states[0][0] < self.length:
+            expanded = []
+            for i, prefix, last, used, deficits, alive in states:
+                for d, level, u, df, a in self._children(i, last, used, deficits, alive, prefix):
+                    expanded.append((i + 1, prefix + ((d, self.levels[level]),), d, u, df, a))
+            states = expanded
+        return states
+
+
+def _count_prefixes(search: ProgressionSearch, states: list) -> int:
+    return sum(search._count_from(state) for state in states)
@@ -0,0 +1,322 @@
+import asyncio
+import json
+from collections import OrderedDict
+from .chord import Chord
+from .cli import Dispatcher
+
+# protocol: one JSON request {"id": ..., "method": ..., "params": {...}} per line (NDJSON over TCP or a unix
+# socket) or per HTTP POST body (the method may also be given as the path, e.g. POST /get_mode); answers are
+# {"id": ..., "result": ...} or {"id": ..., "error": ...}. Both protocols are served on the same socket.
+
+_http_status = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 503: 'Service Unavailable'}
+
+# per worker process Dispatcher, built once by _init_worker
+_worker = {}
+
+
+class Overloaded(Exception):
+    pass
+
+
+class Service(object):
+    """
+    JSON front end to the Dispatcher methods with a bounded LRU response cache, coalescing of identical
+    in-flight requests and a bound on the number of queued computations
+    """
+
+    def __init__(self, modal=None, cache_size: int = 4096, max_pending: int = 1024, workers: int | None = None,
+                 max_body: int = 1 << 20, max_line: int = 1 << 16):
+        """
+        :param modal: Modal instance (a fresh one if None; only used without workers)
+        :param cache_size: maximum number of cached responses
+        :param max_pending: maximum number of computations queued or running, and of requests in a batch;
+            further requests are rejected
+        :param workers: processes running the computations, each with its own Modal and the scales and chords
+            registered here (computed on the event loop if None: the library is pure Python, so threads would
+            not run it in parallel)
+        :param max_body: largest accepted HTTP request body in bytes
+        :param max_line: largest accepted request line (NDJSON) or HTTP header line in bytes
+        """
+        if workers is not None and modal is not None:
+            raise Exception('Not valid modal: the workers build their own.')
+        self.dispatcher = Dispatcher(modal)
+        self.cache_size = cache_size
+        self.max_pending = max_pending
+        self.max_body = max_body
+        self.max_line = max_line
+        self.executor = None
+        if workers is not None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # spawned rather than forked: a forked worker would keep the open connections' sockets, so closing
+            # one here would not end it for the client
+            self.executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'),
+                                                initializer=_init_worker,
+                                                initargs=(Chord.vocabulary(), _scale_definitions()))
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self.stats = {'requests': 0, 'hits': 0, 'misses': 0, 'coalesced': 0, 'rejected': 0}
+
+    def close(self) -> None:
+        """
+        Stop the worker processes
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+
+    async def call(self, method: str, params: dict | None = None):
+        """
+        Answer a request, from the cache, by joining an identical request in flight or by computing it
+        :param method: method name (or 'batch' with params {'requests': [...]}, each request answered as a
+            single one)
+        :param params: method parameters
+        :return: JSON-ready result
+        """
+        params = params or {}
+        if method == 'batch':
+            requests = params.get('requests', [])
+            if not isinstance(requests, list):
+                raise Exception('Not valid batch.')
+            if len(requests) > self.max_pending:
+                self.stats['rejected'] += 1
+                raise Overloaded('Too many requests in the batch.')
+            return await asyncio.gather(*(self._answer(r, nested=True) for r in requests))
+        self.stats['requests'] += 1
+        fn = self.dispatcher.methods.get(method)
+        if fn is None:
+            raise Exception('Not supported method: ' + str(method))
+
+        key = json.dumps([method, params], sort_keys=True)
+        if key in self._cache:
+            self.stats['hits'] += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(future)
+        if len(self._inflight) >= self.max_pending:
+            self.stats['rejected'] += 1
+            raise Overloaded('Too many pending requests.')
+
+        self.stats['misses'] += 1
+        if self.executor is None:
+            result = fn(**params)
+        else:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, _worker_call, method, params)
+            self._inflight[key] = future
+            try:
+                result = await asyncio.shield(future)
+            finally:
+                del self._inflight[key]
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    async def _answer(self, request: dict, nested: bool = False) -> dict:
+        response = {'id': request.get('id')} if isinstance(request, dict) else {'id': None}
+        try:
+            if not isinstance(request, dict):
+                raise ValueError('Request must be a JSON object.')
+            if nested and request.get('method') == 'batch':
+                raise Exception('Not valid batch: batches cannot be nested.')
+            response['result'] = await self.call(request.get('method'), request.get('params'))
+        except Overloaded as e:
+            response['error'] = str(e)
+            response['overloaded'] = True
+        except Exception as e:
+            response['error'] = str(e) or type(e).__name__
+        return response
+
+    async def handle_line(self, line: bytes) -> dict:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {'id': None, 'error': 'Not valid JSON.'}
+        return await self._answer(request)
+
+    # transports
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            first = await _readline(reader)
+            if first is None:
+                await self._ndjson_reply(writer, {'id': None, 'error': 'Request line too long.'})
+            elif first.split(b' ', 1)[0] in (b'GET', b'POST'):
+                await self._serve_http(first, reader, writer)
+            else:
+                await self._serve_ndjson(first, reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _serve_ndjson(self, line: bytes, reader, writer, window: int = 64) -> None:
+        # at most `window` requests of a connection are processed at once; the socket is not read further
+        # until one completes, which pushes back on the client
+        slots = asyncio.Semaphore(window)
+        tasks = set()
+
+        async def run(request_line: bytes):
+            try:
+                await self._ndjson_reply(writer, await self.handle_line(request_line))
+            finally:
+                slots.release()
+
+        while line:
+            if line.strip():
+                await slots.acquire()
+                task = asyncio.create_task(run(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            line = await _readline(reader)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if line is None:
+            # the rest of the stream cannot be split into requests any more
+            await self._ndjson_reply(writer, {'id': None, 'error': 'Request line too long.'})
+
+    async def _serve_http(self, request_line: bytes, reader, writer) -> None:
+        while request_line:
+            parts = request_line.decode('latin-1').split()
+            if len(parts) < 2:
+                return
+            verb, path = parts[0], parts[1]
+            headers = {}
+            while True:
+                line = await _readline(reader)
+                if line is None:
+                    await self._http_reply(writer, 400, {'id': None, 'error': 'Header line too long.'}, False)
+                    return
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            try:
+                length = int(headers.get('content-length', 0))
+            except ValueError:
+                length = -1
+            if not (0 <= length <= self.max_body):
+                await self._http_reply(writer, 400, {'id': None, 'error': 'Not valid Content-Length.'}, False)
+                return
+            body = await reader.readexactly(length)
+
+            status, response = 200, None
+            if verb == 'GET' and path == '/health':
+                response = {'status': 'ok', 'stats': self.stats}
+            elif verb == 'POST':
+                try:
+                    request = json.loads(body or b'{}')
+                except ValueError:
+                    status, response = 400, {'id': None, 'error': 'Not valid JSON.'}
+                else:
+                    if isinstance(request, dict) and path.strip('/') and 'method' not in request:
+                        request = {'method': path.strip('/'), 'params': request}
+                    response = await self._answer(request)
+                    if response.get('overloaded'):
+                        status = 503
+                    elif 'error' in response:
+                        status = 400
+            else:
+                status, response = 404, {'error': 'Not found.'}
+
+            keep_alive = headers.get('connection', '').lower() != 'close'
+            await self._http_reply(writer, status, response, keep_alive)
+            if not keep_alive:
+                return
+            request_line = await _readline(reader)
+            if request_line is None:
+                await self._http_reply(writer, 400, {'id': None, 'error': 'Request line too long.'}, False)
+                return
+
+    @staticmethod
+    async def _ndjson_reply(writer, response: dict) -> None:
+        writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+        await writer.drain()
+
+    @staticmethod
+    async def _http_reply(writer, status: int, response: dict, keep_alive: bool) -> None:
+        payload = json.dumps(response, ensure_ascii=False).encode('utf-8')
+        writer.write(('HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n'
+                      'Connection: %s\r\n\r\n' % (status, _http_status[status], len(payload),
+                                                  'keep-alive' if keep_alive else 'close')).encode('latin-1'))
+        writer.write(payload)
+        await writer.drain()
+
+
+async def _readline(reader: asyncio.StreamReader) -> bytes | None:
+    # a line, or None if it is longer than the stream limit
+    try:
+        return await reader.readline()
+    except (ValueError, asyncio.LimitOverrunError):
+        return None
+
+
+def _scale_definitions() -> list:
+    from .modal import Modal
+    return [(scale, next(iter(Modal.modes(scale).values()))['intervals'].tolist(), list(Modal.modes(scale)))
+            for scale in Modal.scales()]
+
+
+def _init_worker(vocabulary: list, scales: list) -> None:
+    from .modal import Modal
+    # spawned processes have the default scales and chords
+    Chord.set_vocabulary(vocabulary)
+    for scale, intervals, mode_names in scales:
+        if scale not in Modal.scales() or (
+                next(iter(Modal.modes(scale).values()))['intervals'].tolist() != intervals
+                or list(Modal.modes(scale)) != mode_names):
+            Modal.register_scale(scale, intervals, mode_names)
+    _worker['dispatcher'] = Dispatcher()
+
+
+def _worker_call(method: str, params: dict):
+    return _worker['dispatcher'].call(method, params)
+
+
+async def serve(host: str = '127.0.0.1', port: int = 8765, path: str | None = None, service: Service | None = None):
+    """
+    Start the server
+    :param host: TCP host
+    :param port: TCP port (0 for any free port)
+    :param path: unix socket path (used instead of host and port)
+    :param service: Service instance (a default one if None)
+    :return: asyncio server
+    """
+    if service is None:
+        service = Service()
+    if path is not None:
+        return await asyncio.start_unix_server(service.handle_connection, path=path, limit=service.max_line)
+    return await asyncio.start_server(service.handle_connection, host=host, port=port, limit=service.max_line)
+
+
+def run(host: str = '127.0.0.1', port: int = 8765, path: str | None = None, **kwargs) -> None:
+    """
+    Run the server until interrupted (python -m modal serve)
+    :param host: TCP host
+    :param port: TCP port
+    :param path: unix socket path (used instead of host and port)
+    :param kwargs: Service arguments
+    """
+    service = Service(**kwargs)
+
+    async def main():
+        server = await serve(host=host, port=port, path=path, service=service)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,132 @@
+import itertools
+import numpy as np
+from .symbol import sharp, flat, natural, chromatic
+
+letters = 'CDEFGAB'
+naturals = [0, 2, 4, 5, 7, 9, 11]
+
+# accidental -> semitone offset; the repo writes accidentals before the letter ('♭E'), but suffixed spellings
+# ('E♭', '♭♭B', 'F𝄪') are accepted as input too, and ASCII ones after the letter only ('Eb', 'D#', 'F##')
+_accidentals = {
+    '': 0,
+    natural: 0,
+    sharp: 1,
+    flat: -1,
+    sharp + sharp: 2,
+    flat + flat: -2,
+    '\U0001D12A': 2,
+    '\U0001D12B': -2,
+}
+_ascii_accidentals = {
+    '#': 1,
+    'b': -1,
+    '##': 2,
+    'bb': -2,
+}
+_prefix = {1: sharp, -1: flat, 2: sharp + sharp, -2: flat + flat, 0: ''}
+
+# letters that can spell each interval, as steps from the letter of the root, the usual one first
+# (e.g. 6 semitones is the ♯4 or the ♭5)
+_steps = [(0,), (1, 0), (1,), (2, 1), (2,), (3,), (3, 4), (4,), (5, 4), (5,), (6, 5), (6,)]
+
+
+def _spellings() -> tuple:
+    pitch_classes = {}
+    canonical = {}
+    for letter, pc in zip(letters, naturals):
+        spellings = [(accidental + letter, offset) for accidental, offset in _accidentals.items()]
+        spellings += [(letter + accidental, offset) for accidental, offset in _accidentals.items()]
+        spellings += [(letter + accidental, offset) for accidental, offset in _ascii_accidentals.items()]
+        for spelling, offset in spellings:
+            pitch_classes[spelling] = (pc + offset) % 12
+            canonical[spelling] = _prefix[offset] + letter
+    return pitch_classes, canonical
+
+
+# every accepted spelling -> pitch class, and -> spelling in the repo's convention
+pitch_classes, _canonical = _spellings()
+
+# note names in the repo's convention, up to double accidentals
+names = [_prefix[offset] + letter for letter in letters for offset in (-2, -1, 0, 1, 2)]
+
+
+def pitch_class(note) -> int:
+    """
+    Pitch class of a note
+    :param note: note name in any accepted spelling, or pitch class
+    :return: pitch class (0 for C)
+    """
+    if isinstance(note, (int, np.integer)):
+        return int(note) % 12
+    pc = pitch_classes.get(note)
+    if pc is None:
+        raise Exception('Not valid note.')
+    return pc
+
+
+def normalize(note: str) -> str:
+    """
+    Spelling of a note name in the repo's convention (accidental before the letter, e.g. 'C#' -> '♯C')
+    :param note: note name in any accepted spelling
+    :return: note name
+    """
+    name = _canonical.get(note)
+    if name is None:
+        raise Exception('Not valid note.')
+    return name
+
+
+def letter_index(note: str) -> int:
+    """
+    Index of the letter of a note name in 'CDEFGAB'
+    :param note: note name in the repo's convention
+    :return: letter index
+    """
+    return letters.index(note[-1])
+
+
+def letter_steps(intervals) -> list:
+    """
+    Letters of the degrees of a scale, as steps from the letter of the root: consecutive letters for heptatonic
+    scales; for the others the usual letter of each interval (as in the major key of the root), changed to the
+    other one only where this avoids two consecutive degrees on the same letter (e.g. ♭3 ♮3 becomes ♯2 ♮3)
+    :param intervals: scale intervals from the root
+    :return: letter steps, one per degree
+    """
+    intervals = [int(i) % 12 for i in intervals]
+    if len(intervals) == 7:
+        return list(range(7))
+    best, best_cost = None, None
+    for steps in itertools.product(*(_steps[i] for i in intervals)):
+        repeats = sum(a == b for a, b in zip(steps, steps[1:]))
+        cost = 2 * repeats + sum(step != _steps[i][0] for step, i in zip(steps, intervals))
+        if best_cost is None or cost < best_cost:
+            best, best_cost = steps, cost
+    return list(best)
+
+
+def spell(root: str, intervals) -> list:
+    """
+    Spell the notes of a scale from its root, on the letters given by letter_steps (e.g. ♯F and ♯C in D major,
+    ♯F ♯G ♯C in E major pentatonic), falling back to the chromatic name when more than a double accidental
+    would be needed
+    :param root: root name in the repo's convention
+    :param intervals: scale intervals from the root
+    :return: note names
+    """
+    root_pc = pitch_classes[root]
+    intervals = [int(i) for i in intervals]
+    first = letter_index(root)
+    return [note_name((first + step) % 7, root_pc + interval)
+            for step, interval in zip(letter_steps(intervals), intervals)]
+
+
+def note_name(letter: int, pc: int) -> str:
+    """
+    Name of a pitch class on a letter, or its chromatic name when more than a double accidental would be needed
+    :param letter: letter index in 'CDEFGAB'
+    :param pc: pitch class
+    :return: note name in the repo's convention
+    """
+    offset = (pc - naturals[letter] + 6) % 12 - 6
+    return _prefix[offset] + letters[letter] if -2 <= offset <= 2 else chromatic[pc % 12]
@@ -0,0 +1,114 @@
+from .symbol import chromatic
+from .chord import Chord
+from .pitchclass import rotate_mask
+from .instrument import register_cache
+
+# mask -> ranked (root, symbol) candidates
+_candidates = {}
+_stats = {'hits': 0, 'misses': 0}
+Chord.on_change(_candidates.clear)
+register_cache('stream.candidates', lambda: dict(_stats, size=len(_candidates)))
+
+
+def identify(mask: int, bass: int | None = None) -> tuple:
+    """
+    Identify the root and the chord symbol of a pitch class set by trying each of its rotations;
+    the rotation reaching the highest chord level wins, ties going to the bass note, then to the lowest pitch class
+    :param mask: 12-bit pitch class mask
+    :param bass: pitch class of the lowest note (optional)
+    :return: root pitch class and chord symbol, (None, None) if not recognized
+    """
+    candidates = _candidates.get(mask)
+    if candidates is None:
+        _stats['misses'] += 1
+        candidates = _candidates[mask] = _rank_roots(mask)
+    else:
+        _stats['hits'] += 1
+    if not candidates:
+        return None, None
+    if bass is not None:
+        for root, symbol in candidates:
+            if root == bass:
+                return root, symbol
+    return candidates[0]
+
+
+def _rank_roots(mask: int) -> tuple:
+    table = Chord.lookup_table()
+    best, candidates = -1, []
+    for root in range(12):
+        if not mask >> root & 1:
+            continue
+        rotated = rotate_mask(mask, -root)
+        for rank in range(len(Chord.levels) - 1, max(best, 0) - 1, -1):
+            symbol = table[Chord.levels[rank]][rotated]
+            if symbol is not None:
+                if rank > best:
+                    best, candidates = rank, []
+                candidates.append((root, symbol))
+                break
+    return tuple(candidates)
+
+
+def label_events(events, names: list | None = None):
+    """
+    Label a stream of note events with chords, keeping only the sounding notes in memory
+    :param events: iterable of (time, pitch, on) in time order; pitch is a MIDI note number, on is True for
+        note-on and False for note-off
+    :param names: root names indexed by pitch class (default: chromatic names)
+    :return: generator of (start, end, root, symbol) segments; times with no recognized chord are skipped
+    """
+    if names is None:
+        names = chromatic
+    sounding = [0] * 128
+    counts = [0] * 12
+    mask = 0
+
+    time = None
+    start, label = None, None
+    for event_time, pitch, on in events:
+        if time is not None and event_time != time:
+            current = _label(mask, sounding, names)
+            if current != label:
+                if label is not None:
+                    yield (start, time) + label
+                start, label = time, current
+        time = event_time
+
+        pitch = int(pitch)
+        pc = pitch % 12
+        if on:
+            sounding[pitch] += 1
+            counts[pc] += 1
+            mask |= 1 << pc
+        elif sounding[pitch] > 0:
+            sounding[pitch] -= 1
+            counts[pc] -= 1
+            if counts[pc] == 0:
+                mask &= ~(1 << pc)
+
+    # notes still sounding after the last event are closed at its time
+    if label is not None:
+        yield (start, time) + label
+
+
+def _label(mask: int, sounding: list, names: list) -> tuple | None:
+    if not mask:
+        return None
+    candidates = _candidates.get(mask)
+    if candidates is None:
+        _stats['misses'] += 1
+        candidates = _candidates[mask] = _rank_roots(mask)
+    else:
+        _stats['hits'] += 1
+    if not candidates:
+        return None
+    root, symbol = candidates[0]
+    if len(candidates) > 1:
+        # only look for the bass note when it decides between several roots
+        bass = next(p for p in range(128) if sounding[p]) % 12
+        for candidate in candidates:
+            if candidate[0] == bass:
+                root, symbol = candidate
+                break
+    return names[root], symbol
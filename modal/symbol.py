@@ -3,3 +3,14 @@ flat = '\u266D'
 natural = '\u266E'
 
 dim = '\u26AC'
+
+chromatic = ['C', flat + 'D', 'D', flat + 'E', 'E', 'F', flat + 'G', 'G', flat + 'A', 'A', flat + 'B', 'B']
+
+
+def slug(name: str) -> str:
+    """
+    File name friendly form of a note, scale or mode name ('♭E' -> 'bE', 'harmonic minor' -> 'harmonic-minor')
+    :param name: name with accidental symbols
+    :return: name with ASCII letters for the accidentals and dashes for the spaces
+    """
+    return name.replace(flat, 'b').replace(sharp, 's').replace(natural, 'n').replace(' ', '-')
@@ -0,0 +1,192 @@
+import numpy as np
+from .chord import Chord
+from .index import split_symbol
+from .spelling import pitch_class
+from . import voicing
+
+# cost terms: pairwise terms take the candidate voicings of two consecutive chords (P x M and C x N arrays of
+# MIDI notes, ascending) and return a P x C cost matrix (or anything broadcasting to it); unary terms take the
+# candidates of one chord and return C costs
+
+
+def _nearest(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    # P x C x M x N absolute distances between every note of every pair of voicings
+    return np.abs(a[:, None, :, None] - b[None, :, None, :])
+
+
+def movement(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Total voice movement: every note moves to the nearest note of the next voicing and every note of the next
+    voicing comes from the nearest note of the previous one (half of each), so voicings of different sizes
+    can be compared
+    """
+    distances = _nearest(a, b)
+    return (distances.min(axis=3).sum(axis=2) + distances.min(axis=2).sum(axis=2)) / 2.0
+
+
+def common_tones(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Minus the number of notes of the next voicing already sounding (a reward for keeping common tones)
+    """
+    return -(a[:, None, :, None] == b[None, :, None, :]).any(axis=2).sum(axis=2)
+
+
+def parallels(intervals: tuple = (7,)):
+    """
+    Make a term counting parallel motion: two voices forming one of the intervals (modulo octaves) that both
+    move in the same direction to their nearest notes in the next voicing and still form that interval
+    :param intervals: intervals in semitones modulo 12 (7 for fifths, 0 for octaves)
+    :return: pairwise cost term
+    """
+    intervals = np.array(intervals)
+
+    def term(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        # P x C x M: note of the next voicing each voice moves to
+        target = b[np.arange(len(b))[None, :, None], _nearest(a, b).argmin(axis=3)]
+        motion = np.sign(target - a[:, None, :])
+        # [..., i, j]: interval from voice i up to voice j
+        before = np.isin((a[:, None, :] - a[:, :, None]) % 12, intervals)
+        after = np.isin((target[..., None, :] - target[..., :, None]) % 12, intervals)
+        same = (motion[..., :, None] == motion[..., None, :]) & (motion[..., :, None] != 0)
+        distinct = a[:, :, None] != a[:, None, :]
+        # each pair of voices counted once
+        upper = np.triu(np.ones((a.shape[1], a.shape[1]), dtype=bool), 1)
+        return (before[:, None] & after & same & (distinct & upper)[:, None]).sum(axis=(2, 3))
+
+    return term
+
+
+parallel_fifths = parallels((7,))
+parallel_octaves = parallels((0,))
+
+
+def register(center: float = 60.0):
+    """
+    Make a unary term measuring the distance of the mean pitch of a voicing from a center
+    :param center: MIDI note
+    :return: unary cost term
+    """
+    def term(b: np.ndarray) -> np.ndarray:
+        return np.abs(b.mean(axis=1) - center)
+
+    return term
+
+
+class VoiceLeader(object):
+    """
+    Choose one voicing per chord minimizing the total voice leading cost over a whole progression
+    """
+
+    def __init__(self, kinds: tuple = ('close', 'drop2', 'drop3'), low: int = 48, high: int = 79,
+                 max_span: int | None = 24, terms: list | None = None, unary: list | None = None):
+        """
+        :param kinds: voicing kinds of the candidates (see voicing.kinds)
+        :param low: lowest allowed MIDI note
+        :param high: highest allowed MIDI note
+        :param max_span: largest interval between the lowest and the highest note of a voicing
+        :param terms: list of (pairwise term, weight); default movement, common tones and parallel fifths
+        :param unary: list of (unary term, weight); default distance from the middle of the range
+        """
+        self.kinds = tuple(kinds)
+        self.low = low
+        self.high = high
+        self.max_span = max_span
+        if terms is None:
+            terms = [(movement, 1.0), (common_tones, 0.5), (parallel_fifths, 4.0)]
+        if unary is None:
+            unary = [(register((low + high) / 2.0), 0.1)]
+        self.terms = list(terms)
+        self.unary = list(unary)
+
+    def candidates(self, chord) -> np.ndarray:
+        """
+        Candidate voicings of a chord
+        :param chord: chord symbol ('Dm7'), (root, chord tones mask) or array of voicings (one per row)
+        :return: C x N array of MIDI notes; smaller voicings (e.g. rootless) are padded by doubling their
+            highest note
+        """
+        if isinstance(chord, np.ndarray):
+            return np.sort(np.atleast_2d(chord), axis=1)
+        if isinstance(chord, str):
+            root, suffix = split_symbol(chord)
+            mask = Chord.symbol_mask(suffix)
+            if mask is None:
+                raise Exception('Not valid chord symbol.')
+        else:
+            root, mask = pitch_class(chord[0]), int(chord[1])
+        found = [voicing.voicings(root, mask, kind, self.low, self.high, self.max_span) for kind in self.kinds]
+        found = [v for v in found if len(v)]
+        if not found:
+            raise Exception('No voicing in range.')
+        width = max(v.shape[1] for v in found)
+        padded = [np.hstack([v, np.repeat(v[:, -1:], width - v.shape[1], axis=1)]) for v in found]
+        return np.unique(np.vstack(padded), axis=0)
+
+    def cost_matrix(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        Weighted sum of the pairwise and unary terms between two sets of candidates
+        :param a: P x M candidate voicings of a chord
+        :param b: C x N candidate voicings of the next chord
+        :return: P x C cost matrix
+        """
+        cost = np.zeros((len(a), len(b)))
+        for term, weight in self.terms:
+            cost += weight * term(a, b)
+        return cost + self._unary(b)[None, :]
+
+    def solve(self, progression) -> dict:
+        """
+        Find the least cost sequence of voicings (Viterbi over the candidates of each chord)
+        :param progression: chord symbols, (root, chord tones mask) tuples or arrays of candidate voicings;
+            the cost matrices of repeated chord pairs are computed once
+        :return: dict
+            - 'voicings': chosen voicing of each chord (array of MIDI notes)
+            - 'path': index of the chosen candidate of each chord
+            - 'cost': total cost
+            - 'candidates': candidate voicings of each chord
+        """
+        progression = list(progression)
+        if not progression:
+            raise Exception('Empty progression.')
+        keys = [chord if isinstance(chord, str) else None if isinstance(chord, np.ndarray) else tuple(chord)
+                for chord in progression]
+        by_key = {}
+        candidates = []
+        for key, chord in zip(keys, progression):
+            if key is None:
+                candidates.append(self.candidates(chord))
+            else:
+                if key not in by_key:
+                    by_key[key] = self.candidates(chord)
+                candidates.append(by_key[key])
+
+        matrices = {}
+        cost = self._unary(candidates[0])
+        back = []
+        for i in range(1, len(candidates)):
+            pair = (keys[i - 1], keys[i])
+            matrix = matrices.get(pair) if None not in pair else None
+            if matrix is None:
+                matrix = self.cost_matrix(candidates[i - 1], candidates[i])
+                if None not in pair:
+                    matrices[pair] = matrix
+            total = cost[:, None] + matrix
+            back.append(total.argmin(axis=0))
+            cost = total[back[-1], np.arange(total.shape[1])]
+
+        path = np.empty(len(candidates), dtype=np.int64)
+        path[-1] = cost.argmin()
+        for i in range(len(candidates) - 1, 0, -1):
+            path[i - 1] = back[i - 1][path[i]]
+        return {
+            'voicings': [c[p] for c, p in zip(candidates, path.tolist())],
+            'path': path,
+            'cost': float(cost.min()),
+            'candidates': candidates,
+        }
+
+    def _unary(self, b: np.ndarray) -> np.ndarray:
+        cost = np.zeros(len(b))
+        for term, weight in self.unary:
+            cost += weight * term(b)
+        return cost
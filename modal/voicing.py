@@ -0,0 +1,131 @@
+import numpy as np
+from .chord import Chord
+from .pitchclass import PitchClassSet, rotate_mask
+from .spelling import pitch_class
+from .instrument import register_cache
+
+kinds = ('close', 'drop2', 'drop3', 'spread', 'rootless')
+
+# (chord tones mask, kind) -> voicings of a chord on C as an R x N array of semitones above the root note,
+# already filtered by span; transposing to a root and an octave is a single broadcast addition
+_patterns = {}
+_stats = {'hits': 0, 'misses': 0}
+
+register_cache('voicing.patterns', lambda: dict(_stats, size=len(_patterns)))
+
+
+def _close(pcs: list) -> list:
+    # every inversion, the other chord tones packed in the octave above the bass
+    return [[pcs[k]] + sorted(pc + 12 if pc < pcs[k] else pc for pc in pcs[:k] + pcs[k + 1:])
+            for k in range(len(pcs))]
+
+
+def _drop(rows: list, n: int) -> list:
+    # the n-th highest note of each close voicing one octave down
+    return [sorted(row[:-n] + [row[-n] - 12] + row[len(row) - n + 1:]) for row in rows]
+
+
+def _voicing_rows(mask: int, kind: str) -> list:
+    pcs = PitchClassSet(mask).intervals().tolist()
+    if kind == 'close':
+        return _close(pcs)
+    if kind in ('drop2', 'drop3'):
+        return _drop(_close(pcs), int(kind[-1])) if len(pcs) >= 4 else []
+    if kind == 'spread':
+        # root in the bass, the upper structure in close position from the next octave
+        return [[0] + [pc + 12 for pc in row] for row in _close(pcs[1:])] if len(pcs) >= 3 else []
+    if kind == 'rootless':
+        return _close(pcs[1:]) if len(pcs) >= 4 else []
+    raise Exception('Not supported voicing.')
+
+
+def pattern(mask: int, kind: str, max_span: int | None = None) -> np.ndarray:
+    """
+    Voicings of a chord on C (cached per chord tones and kind)
+    :param mask: 12-bit mask of the chord tones, from the root
+    :param kind: 'close' (inversions), 'drop2', 'drop3', 'spread' or 'rootless'
+    :param max_span: largest interval between the lowest and the highest note (no limit if None)
+    :return: R x N int array of semitones above the root note, one voicing per row, lowest note first
+    """
+    key = (int(mask), kind)
+    rows = _patterns.get(key)
+    if rows is None:
+        _stats['misses'] += 1
+        rows = _voicing_rows(key[0], kind)
+        rows = np.array(rows, dtype=np.int64).reshape(len(rows), len(rows[0]) if rows else 0)
+        rows.flags.writeable = False
+        _patterns[key] = rows
+    else:
+        _stats['hits'] += 1
+    if max_span is not None and len(rows):
+        rows = rows[rows[:, -1] - rows[:, 0] <= max_span]
+    return rows
+
+
+def voicings(root, mask: int, kind: str = 'close', low: int = 36, high: int = 84,
+             max_span: int | None = 24) -> np.ndarray:
+    """
+    Voicings of a chord within a pitch range
+    :param root: root note name or pitch class
+    :param mask: 12-bit mask of the chord tones, from the root (see Chord.chord_tones)
+    :param kind: 'close' (inversions), 'drop2', 'drop3', 'spread' or 'rootless'
+    :param low: lowest allowed MIDI note
+    :param high: highest allowed MIDI note
+    :param max_span: largest interval between the lowest and the highest note (no limit if None)
+    :return: M x N array of MIDI note numbers, one voicing per row (ascending), ordered by lowest note
+    """
+    rows = pattern(mask, kind, max_span)
+    if not len(rows):
+        return np.empty(rows.shape, dtype=np.int64)
+    root = pitch_class(root)
+    # every octave placement keeping at least one voicing in range
+    octaves = np.arange((low - root - rows[:, 0].max()) // 12, (high - root - rows[:, -1].min()) // 12 + 1)
+    notes = rows[None, :, :] + (root + 12 * octaves)[:, None, None]
+    notes = notes[(notes[:, :, 0] >= low) & (notes[:, :, -1] <= high)]
+    return notes[np.lexsort(notes.T[::-1])]
+
+
+def chord_voicings(root, intervals, level: str = '7th_chord', kinds: tuple = kinds, low: int = 36,
+                   high: int = 84, max_span: int | None = 24) -> dict:
+    """
+    Voicings of the chord of a level built on a set of intervals
+    :param root: root note name or pitch class
+    :param intervals: scale intervals or pitch class set, from the root
+    :param level: 'triad_chord', '7th_chord', '9th_chord', '11th_chord' or '13th_chord'
+    :param kinds: voicing kinds
+    :param low: lowest allowed MIDI note
+    :param high: highest allowed MIDI note
+    :param max_span: largest interval between the lowest and the highest note (no limit if None)
+    :return: kind -> array of MIDI note numbers (see voicings); empty if no chord is found at this level
+    """
+    mask = Chord().chord_tones(intervals, level)
+    if not mask:
+        return {}
+    return {kind: voicings(root, mask, kind, low, high, max_span) for kind in kinds}
+
+
+def mode_voicings(root: str = 'C', scale: str = 'major', mode: int = 0, level: str = '7th_chord',
+                  kinds: tuple = kinds, low: int = 36, high: int = 84, max_span: int | None = 24,
+                  modal=None) -> list:
+    """
+    Voicings of every chord of a mode harmonization
+    :param root: root note
+    :param scale: scale name
+    :param mode: mode index
+    :param level: 'triad_chord', '7th_chord', '9th_chord', '11th_chord' or '13th_chord'
+    :param kinds: voicing kinds
+    :param low: lowest allowed MIDI note
+    :param high: highest allowed MIDI note
+    :param max_span: largest interval between the lowest and the highest note (no limit if None)
+    :param modal: Modal instance (a fresh one if None)
+    :return: list of (chord symbol, kind -> array of MIDI note numbers), one per degree
+    """
+    if modal is None:
+        from .modal import Modal
+        modal = Modal()
+    result = []
+    for md in modal.mode_harmonization(root=root, scale=scale, mode=mode):
+        degree_root = pitch_class(md['notes'][0])
+        intervals = rotate_mask(md['pitch_class_set'].mask, -degree_root)
+        result.append((md[level], chord_voicings(degree_root, intervals, level, kinds, low, high, max_span)))
+    return result
@@ -0,0 +1,20 @@
+import pytest
+
+from modal.modal import Modal
+
+
+def test_bulk_matches_get_mode():
+    modal = Modal()
+    bulk = modal.get_modes_bulk(roots=['D', 4], scales='harmonic minor')
+    assert len(bulk) == 2 * 7
+    for row in bulk:
+        md = modal.get_mode(str(row['root']), str(row['scale']), int(row['mode']))
+        assert str(row['mode name']) == md.name
+        assert [n for n in row['notes'].tolist() if n] == md.notes.tolist()
+        assert str(row['7th_chord']) == (md['7th_chord'] or '')
+
+
+@pytest.mark.parametrize('kwargs', [{'roots': []}, {'scales': []}, {'modes': []}])
+def test_bulk_empty_arguments(kwargs):
+    with pytest.raises(Exception, match='Not valid'):
+        Modal().get_modes_bulk(**kwargs)
@@ -0,0 +1,21 @@
+from modal.catalog import compile_catalog
+from modal.chord import Chord
+from modal.modal import Modal
+
+
+def test_catalog_round_trip(tmp_path):
+    path = str(tmp_path / 'modes.cat')
+    compile_catalog(path)
+    modal, catalog = Modal(), Modal.from_catalog(path)
+    for root in ('C', '♯F', 'Eb', '♭♭B'):
+        for scale in modal.scales():
+            for mode in range(7):
+                expected, md = modal.get_mode(root, scale, mode), catalog.get_mode(root, scale, mode)
+                assert md.name == expected.name
+                assert md.notes.tolist() == expected.notes.tolist()
+                assert md.pitch_class_set == expected.pitch_class_set
+                assert md.symbols == expected.symbols
+                for level in Chord.levels:
+                    if md.chord(level) is not None:
+                        assert md.chord(level).tones == expected.chord(level).tones
+    assert catalog.get_modes_name('major') == list(modal.get_modes_name('major'))
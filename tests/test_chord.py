@@ -0,0 +1,27 @@
+from modal.chord import Chord
+
+
+def test_register_chord_replaces_aliases():
+    Chord.register_chord('t7', [0, 1, 5, 8], priority=100, aliases=('t7old',))
+    try:
+        assert Chord.symbol_mask('t7old') is not None
+        Chord.register_chord('t7', [0, 1, 5, 8], priority=100, aliases=('t7new',))
+        assert Chord.symbol_mask('t7old') is None
+        assert Chord.symbol_mask('t7new') == Chord.symbol_mask('t7')
+        assert 't7old' not in Chord._aliases
+    finally:
+        Chord.unregister_chord('t7')
+    assert 't7new' not in Chord._aliases
+
+
+def test_set_vocabulary():
+    default = Chord.vocabulary()
+    Chord.set_vocabulary(default[:2] + [{'symbol': 'x7', 'intervals': [0, 4, 7, 10], 'aliases': ['x']}])
+    try:
+        assert [entry['symbol'] for entry in Chord.vocabulary()] == ['maj', 'm', 'x7']
+        assert Chord().find_7th_chord([0, 4, 7, 10])[0] == 'x7'
+        assert Chord().find_triad_chord([0, 3, 6]) is None
+    finally:
+        Chord.set_vocabulary(default)
+    assert Chord.vocabulary() == default
+    assert Chord().find_7th_chord([0, 4, 7, 10])[0] == '7'
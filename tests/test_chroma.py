@@ -0,0 +1,29 @@
+import numpy as np
+
+from modal.chroma import ChromaRecognizer
+
+
+def _frames(pcs: list, n: int) -> np.ndarray:
+    frames = np.zeros((n, 12), dtype=np.float32)
+    frames[:, pcs] = 1.0
+    return frames
+
+
+def test_decode_segments():
+    chroma = np.vstack([_frames([0, 4, 7], 20), _frames([7, 11, 2, 5], 20), np.zeros((5, 12))])
+    # a noisy frame in the first chord, labelled differently frame by frame but smoothed away
+    chroma[10] = _frames([0, 4, 9], 1)
+    recognizer = ChromaRecognizer(chunk_size=8)
+    assert recognizer.labels[recognizer.match(chroma)[10]] != recognizer.labels[recognizer.match(chroma)[0]]
+    segments = recognizer.segments(recognizer.decode(chroma), frame_rate=10.0)
+    assert [(start, end, root) for start, end, root, _ in segments] == [(0.0, 2.0, 'C'), (2.0, 4.0, 'G')]
+    assert segments[0][3] == recognizer.labels[recognizer.match(chroma)[0]][1]
+
+
+def test_chunks():
+    rng = np.random.default_rng(0)
+    chroma = rng.random((100, 12), dtype=np.float32)
+    whole = ChromaRecognizer(chunk_size=1000).decode(chroma)
+    assert whole.tolist() == ChromaRecognizer(chunk_size=7).decode(chroma).tolist()
+    assert whole.tolist() == ChromaRecognizer().decode(iter([chroma[:30], chroma[30:]])).tolist()
+    assert ChromaRecognizer().decode(np.empty((0, 12))).tolist() == []
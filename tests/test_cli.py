@@ -0,0 +1,42 @@
+import io
+import json
+
+import pytest
+
+from modal.cli import batch, main
+
+
+def _main(capsys, *argv) -> dict:
+    assert main(list(argv)) == 0
+    return json.loads(capsys.readouterr().out)
+
+
+def test_mode_and_harmonize(capsys):
+    assert _main(capsys, 'mode', 'D', 'major', 'dorian')['7th_chord'] == 'Dm7'
+    assert [md['triad_chord'] for md in _main(capsys, 'harmonize', 'C', 'major')][:3] == ['Cmaj', 'Dm', 'Em']
+
+
+def test_chord_bass(capsys):
+    by_name = _main(capsys, 'chord', 'C', 'E', 'G', '♭B', '--bass', 'E')
+    by_pitch_class = _main(capsys, 'chord', '0', '4', '7', '10', '--bass', '4')
+    assert by_name == by_pitch_class
+    assert by_name['root'] == 'C' and by_name['7th_chord'] == '7'
+
+
+def test_chord_rejects_bad_notes(capsys):
+    with pytest.raises(SystemExit):
+        main(['chord', 'C', 'E', 'G', '--bass', 'bE'])
+    with pytest.raises(SystemExit):
+        main(['chord', 'C', 'H'])
+    assert 'not a note name or pitch class' in capsys.readouterr().err
+
+
+def test_batch():
+    lines = ['{"id": 1, "method": "modes_name", "params": {"scale": "melodic minor"}}', '', 'not json',
+             '{"id": 2, "method": "get_mode", "params": {"root": "X"}}']
+    out = io.StringIO()
+    assert batch(lines, out) == 3
+    answers = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert answers[0]['id'] == 1 and answers[0]['result'][:3] == ['ionian ♭3', 'dorian ♭2', 'lydian ♯5']
+    assert answers[1] == {'id': None, 'error': 'Not valid JSON.'}
+    assert answers[2]['id'] == 2 and 'error' in answers[2]
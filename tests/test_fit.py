@@ -0,0 +1,20 @@
+from modal.fit import ProgressionFitter, chord_mask
+
+
+def test_chord_mask():
+    assert chord_mask('Cmaj7') == 0b100010010001
+    assert chord_mask('Dm7') == chord_mask(['D', 'F', 'A', 'C'])
+
+
+def test_fit_single_mode():
+    result = ProgressionFitter().fit(['Dm7', 'G7', 'Cmaj7'])
+    assert result['changes'] == 0
+    assert result['coverage'][:, result['path'][0]].tolist() == [1.0, 1.0, 1.0]
+    start, end, root, scale, mode = result['segments'][0]
+    assert (start, end, scale) == (0, 3, 'major')
+
+
+def test_fit_modulation():
+    result = ProgressionFitter().fit(['Cmaj7', 'Fmaj7', 'G7', 'Cmaj7', 'Ebmaj7', 'Abmaj7', 'Bb7', 'Ebmaj7'])
+    assert result['changes'] == 1
+    assert [segment[:2] for segment in result['segments']] == [(0, 4), (4, 8)]
@@ -0,0 +1,56 @@
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from modal.chord import Chord
+from modal.generate import generate_catalog, _init_worker, _render_shards
+from modal.modal import Modal
+
+
+def _read(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_generate_and_resume(tmp_path):
+    out = str(tmp_path)
+    manifest = generate_catalog(out, formats=('json',), scales=['major'], roots=['D'], workers=1)
+    assert list(manifest['shards']) == ['json/major/D.jsonl']
+    tables = _read(os.path.join(out, 'json/major/D.jsonl'))
+    assert len(tables) == 7 and tables[0]['7th'][0] == 'Dmaj7'
+
+    mtime = os.stat(os.path.join(out, 'manifest.json')).st_mtime_ns
+    assert generate_catalog(out, formats=('json',), scales=['major'], roots=['D'], workers=1) == manifest
+    assert os.stat(os.path.join(out, 'manifest.json')).st_mtime_ns == mtime
+
+
+def test_vocabulary_changes_fingerprint(tmp_path):
+    out = str(tmp_path)
+    before = generate_catalog(out, formats=('json',), scales=['major'], roots=['C'], workers=1)
+    Chord.register_chord('M7gen', [0, 4, 7, 11], priority=10)
+    try:
+        after = generate_catalog(out, formats=('json',), scales=['major'], roots=['C'], workers=1)
+        assert after['shards'] != before['shards']
+        assert _read(os.path.join(out, 'json/major/C.jsonl'))[0]['7th'][0] == 'CM7gen'
+    finally:
+        Chord.unregister_chord('M7gen')
+
+
+def test_stale_entries_pruned(tmp_path):
+    out = str(tmp_path)
+    Modal.register_scale('test generate', [0, 2, 4, 7, 9])
+    generate_catalog(out, formats=('csv',), scales=['major', 'test generate'], roots=['C'], workers=1)
+    Modal.register_scale('test generate', [0, 3, 5, 7, 10])
+    manifest = generate_catalog(out, formats=('csv',), scales=['major'], roots=['C'], workers=1)
+    assert list(manifest['shards']) == ['csv/major/C.csv']
+
+
+def test_spawned_worker_gets_vocabulary(tmp_path):
+    vocabulary = Chord.vocabulary() + [{'symbol': 'M7spawn', 'intervals': [0, 4, 7, 11], 'level': '7th_chord',
+                                   'priority': 10, 'aliases': []}]
+    definitions = [('major', [0, 2, 4, 5, 7, 9, 11], list(Modal.modes('major')))]
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('spawn'), initializer=_init_worker,
+                             initargs=(str(tmp_path), definitions, vocabulary)) as pool:
+        list(pool.map(_render_shards, [[('x.jsonl', 'json', 'major', 'C', 7, '')]]))
+    assert _read(os.path.join(str(tmp_path), 'x.jsonl'))[0]['7th'][0] == 'CM7spawn'
@@ -0,0 +1,45 @@
+import threading
+
+from modal.modal import HarmonizationCache, Modal
+
+
+def test_degrees_shared_by_roots():
+    modal = Modal()
+    modal.harmonization_cache = HarmonizationCache()
+    first = modal.mode_harmonization('D', 'harmonic minor', 4)
+    assert [md.name for md in first] == ['D phrygian dominant', '♭E lydian ♯2', '♯F super locrian ♭♭7',
+                                         'G ionian ♭3 ♭6', 'A locrian 6', '♭B ionian ♯5', 'C dorian ♭11']
+    for root in ('♭B', 'F', '♯C'):
+        modes = modal.mode_harmonization(root, 'harmonic minor', 4)
+        # the same interned Modes as get_mode, built from the degrees of (scale, mode) computed once
+        assert all(md is modal.get_mode(md.root, 'harmonic minor', md.mode) for md in modes)
+        assert [md.mode for md in modes] == [md.mode for md in first]
+        assert [md.chord('7th_chord').symbol for md in modes] == [md.chord('7th_chord').symbol for md in first]
+    info = modal.harmonization_cache.cache_info()
+    assert info['degree_misses'] == 1 and info['degree_hits'] == 3 and info['misses'] == 4
+    assert modal.mode_harmonization('♯C', 'harmonic minor', 4) is modes
+    assert modal.harmonization_cache.cache_info()['hits'] == 1
+
+
+def test_threads():
+    cache = HarmonizationCache(maxsize=8)
+    errors = []
+
+    def work(i):
+        try:
+            for j in range(2000):
+                key = ('C', 'major', (i + j) % 16)
+                if cache.get(key) is None:
+                    cache.put(key, (j,))
+                cache.degrees('major', j % 16, lambda scale, mode: (mode,))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    info = cache.cache_info()
+    assert not errors and info['size'] <= 8 and info['degree_size'] <= 8
+    assert info['hits'] + info['misses'] == 8 * 2000
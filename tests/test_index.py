@@ -0,0 +1,38 @@
+from modal.chord import Chord
+from modal.index import ModeIndex
+from modal.modal import Modal
+
+
+def test_modes_with_chord():
+    found = ModeIndex().modes_with_chord('F#m7')
+    assert ('D', 'major', 0, 2, '7th_chord') in found
+    assert ('♯F', 'major', 1, 0, '7th_chord') in found
+    modal = Modal()
+    for root, scale, mode, degree, level in found:
+        assert modal.mode_harmonization(root, scale, mode)[degree][level] == '♯Fm7'
+
+
+def test_modes_with_notes():
+    index = ModeIndex()
+    assert ('C', 'major', 0) in index.modes_with_notes(['C', 'E', 'G'])
+    exact = index.modes_with_notes(['C', 'D', 'E', 'F', 'G', 'A', 'B'], exact=True)
+    assert ('D', 'major', 1) in exact and len(exact) == 7
+
+
+def test_follows_chord_vocabulary():
+    index = ModeIndex()
+    before = index.modes_with_chord('Cmaj7')
+    Chord.register_chord('M7test', [0, 4, 7, 11], priority=10, aliases=('Δtest',))
+    try:
+        assert index.modes_with_chord('Cmaj7') == []
+        assert index.modes_with_chord('CΔtest') == before
+    finally:
+        Chord.unregister_chord('M7test')
+    assert index.modes_with_chord('Cmaj7') == before
+
+
+def test_follows_register_scale():
+    index = ModeIndex()
+    assert index.modes_with_notes([0, 1, 2], exact=True) == []
+    Modal.register_scale('test cluster', [0, 1, 2])
+    assert ('C', 'test cluster', 0) in index.modes_with_notes([0, 1, 2], exact=True)
@@ -0,0 +1,39 @@
+import threading
+
+from modal.instrument import Instrumentation
+from modal.modal import Modal
+from modal.stream import identify
+
+
+def test_snapshot():
+    with Instrumentation() as inst:
+        Modal().get_mode('E', 'major', 2)
+        Modal().get_mode('E', 'major', 2)
+        identify(0b10010001)
+    snapshot = inst.snapshot()
+    assert snapshot['functions']['Modal.get_mode']['calls'] == 2
+    assert snapshot['functions']['Modal.get_mode']['repeated_args'] == 1
+    for name in ('modal.harmonization', 'modal.interned', 'chord.lookup_table', 'stream.candidates',
+                 'voicing.patterns'):
+        assert {'hits', 'misses', 'hit_ratio'} <= set(snapshot['caches'][name])
+
+
+def test_threads():
+    modal = Modal()
+    original = Modal.__dict__['get_mode']
+    instances = [Instrumentation() for _ in range(8)]
+
+    def work(inst):
+        for _ in range(50):
+            with inst:
+                modal.get_mode('A', 'melodic minor', 3)
+
+    threads = [threading.Thread(target=work, args=(inst,)) for inst in instances]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert Modal.__dict__['get_mode'] is original
+    # every instance saw at least its own calls
+    for inst in instances:
+        assert inst.snapshot()['functions']['Modal.get_mode']['calls'] >= 50
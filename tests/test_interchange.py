@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from modal.chord import Chord
+from modal.modal import Modal
+
+
+def test_borrowed_chords():
+    modal = Modal()
+    found = modal.interchange_matrix('C', home=('major', 0), scales=['major', 'harmonic minor'])
+    modes = [name for _, _, name in found['modes']]
+    assert found['home'] == 0 and modes[:2] == ['ionian', 'dorian']
+    aeonian = modes.index('aeonian')
+    seventh = Chord.levels.index('7th_chord')
+    assert found['degrees'][aeonian].tolist() == ['C', 'D', '♭E', 'F', 'G', '♭A', '♭B']
+    assert found['chords'][aeonian, :, seventh].tolist() == ['Cm7', 'Dm7♭5', '♭Emaj7', 'Fm7', 'Gm7', '♭Amaj7', '♭B7']
+    # the home row never differs from itself; the tones of the differing chords are in 'diff'
+    assert not found['changed'][0].any() and not found['diff'][0].any()
+    assert (found['diff'] == found['tones'] ^ found['tones'][found['home']]).all()
+    assert (found['changed'] == (found['diff'] != 0)).all()
+    # C dorian keeps the Dm and F triads of C major
+    assert found['changed'][1, :, 0].tolist() == [True, False, True, False, True, True, True]
+
+
+def test_against_harmonization():
+    modal = Modal()
+    found = modal.interchange_matrix('♭E', home='aeonian')
+    for p, (scale, mode, _) in enumerate(found['modes']):
+        for degree, md in enumerate(modal.mode_harmonization('♭E', scale, mode)):
+            assert found['degrees'][p, degree] == md['notes'][0]
+            assert found['chords'][p, degree].tolist() == [md[level] for level in Chord.levels]
+    with pytest.raises(Exception):
+        modal.interchange_matrix('C', home='nothing')
+    assert np.all(found['intervals'][:, 0] == 0)
@@ -0,0 +1,73 @@
+import numpy as np
+
+from modal.chord import Chord
+
+
+def _subset(mask: int, intervals) -> bool:
+    chord = sum(1 << int(i) for i in intervals)
+    return mask & chord == chord
+
+
+def _reference(mask: int) -> dict:
+    # the search the lookup table replaced: first matching chord in vocabulary order, then the extensions
+    # from the notes left over
+    intervals = [i for i in range(12) if mask >> i & 1]
+    triad = next((c['symbol'] for c in Chord.triads.values() if _subset(mask, c['intervals'])), None)
+    seventh = next((c for c in Chord.chords7th.values() if _subset(mask, c['intervals'])), None)
+    found = {'triad_chord': triad, '7th_chord': None, '9th_chord': None, '11th_chord': None, '13th_chord': None}
+    if seventh is None:
+        return found
+    symbol = seventh['symbol']
+    diff = [i for i in intervals if i not in seventh['intervals']]
+    c9, c11, c13 = Chord.check9th(diff), Chord.check11th(diff), Chord.check13th(diff)
+    found['7th_chord'] = symbol
+    if c9 == '9':
+        found['9th_chord'] = symbol.replace('7', '9')
+    elif c9 is not None:
+        found['9th_chord'] = symbol + '(' + c9 + ')'
+    if c9 == '9' and c11 == '11':
+        found['11th_chord'] = symbol.replace('7', '11')
+    elif c9 == '9' and c11 is not None:
+        found['11th_chord'] = symbol.replace('7', '9') + '(' + c11 + ')'
+    elif c9 is not None and c11 is not None:
+        found['11th_chord'] = symbol + '(' + c9 + ',' + c11 + ')'
+    if c13 is not None:
+        if c9 == '9' and c11 == '11' and c13 == '13':
+            found['13th_chord'] = symbol.replace('7', '13')
+        elif c9 == '9' and c11 == '11':
+            found['13th_chord'] = symbol.replace('7', '11') + '(' + c13 + ')'
+        elif c9 == '9' and c11 is not None:
+            found['13th_chord'] = symbol.replace('7', '9') + '(' + c11 + ',' + c13 + ')'
+        elif c9 is not None and c11 is not None:
+            found['13th_chord'] = symbol + '(' + c9 + ',' + c11 + ',' + c13 + ')'
+    return found
+
+
+def test_table_matches_search():
+    chord = Chord()
+    finders = {'triad_chord': chord.find_triad_chord, '9th_chord': chord.find_9th_chord,
+               '11th_chord': chord.find_11th_chord, '13th_chord': chord.find_13th_chord}
+    for mask in range(4096):
+        intervals = np.flatnonzero((mask >> np.arange(12)) & 1)
+        expected = _reference(mask)
+        for level, find in finders.items():
+            assert find(intervals) == expected[level], (mask, level)
+        symbol, diff = chord.find_7th_chord(intervals)
+        assert symbol == expected['7th_chord'], mask
+        if symbol is not None:
+            tones = Chord.chords7th[next(k for k, c in Chord.chords7th.items() if c['symbol'] == symbol)]
+            assert diff.tolist() == [i for i in intervals.tolist() if i not in tones['intervals']]
+
+
+def test_identify_many():
+    chord = Chord()
+    masks = np.arange(4096)
+    found = chord.identify_many(masks)
+    for mask in range(0, 4096, 7):
+        expected = _reference(mask)
+        for level in Chord.levels:
+            assert found[level][mask] == expected[level]
+    matrix = (masks[:, None] >> np.arange(12)) & 1
+    by_matrix = chord.identify_many(matrix.astype(bool))
+    for level in Chord.levels:
+        assert by_matrix[level].tolist() == found[level].tolist()
@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+from modal.midi import MidiWriter, mode_files, progression_notes
+
+
+def test_encode():
+    data = MidiWriter().encode([[(0, 480, 60), (480, 480, 64, 100)]])
+    assert data[:14] == b'MThd\x00\x00\x00\x06\x00\x00\x00\x01\x01\xe0'
+    assert data[14:22] == b'MTrk\x00\x00\x00\x1a'
+    # tempo, then note events with running status: the note off of 60 before the note on of 64
+    assert data[22:] == bytes.fromhex('00ff510307a120' '00903c50' '83603c00' '004064' '83604000' '00ff2f00')
+
+
+def test_buffer_grows_and_is_reused():
+    writer = MidiWriter(capacity=16)
+    tracks = [{'name': 'chords', 'channel': 2, 'program': 1, 'notes': progression_notes(['Dm7', 'G7', 'Cmaj7'])}]
+    first = writer.encode(tracks)
+    assert len(first) > 16 and writer.encode(tracks) == first
+    assert MidiWriter().encode(tracks) == first
+    assert first[9] == 0 and b'\xc2\x01' in first and b'chords' in first
+    with pytest.raises(Exception):
+        writer.encode([[(0, 480, 128)]])
+
+
+def test_write_many(tmp_path):
+    files = mode_files(roots=['♭E'], scales=['harmonic minor'])
+    written = MidiWriter().write_many(files, str(tmp_path))
+    names = sorted(os.listdir(tmp_path / 'harmonic-minor' / 'bE'))
+    assert written['files'] == len(names) == 7 and names[0] == '0-ionian-b3-b6.mid'
+    sizes = sum(os.path.getsize(tmp_path / 'harmonic-minor' / 'bE' / name) for name in names)
+    assert written['bytes'] == sizes
+    with open(tmp_path / 'harmonic-minor' / 'bE' / names[0], 'rb') as f:
+        head = f.read(12)
+    # format 1, one track for the scale and one per chord level
+    assert head[8:12] == b'\x00\x01\x00\x06'
@@ -0,0 +1,38 @@
+import copy
+import pickle
+
+from modal.chord import Chord
+from modal.modal import Modal
+
+
+def _same(a, b):
+    assert a.name == b.name
+    assert (a.root, a.scale, a.mode, a.mode_name) == (b.root, b.scale, b.mode, b.mode_name)
+    assert a.notes.tolist() == b.notes.tolist()
+    assert not b.notes.flags.writeable
+    assert a.pitch_class_set == b.pitch_class_set
+    assert a.symbols == b.symbols
+    for level in Chord.levels:
+        x, y = a.chord(level), b.chord(level)
+        assert (x is None) == (y is None)
+        if x is not None:
+            assert (x.name, x.root, x.symbol, x.level, x.tones) == (y.name, y.root, y.symbol, y.level, y.tones)
+
+
+def test_pickle_round_trip():
+    md = Modal().get_mode('D', 'melodic minor', 3)
+    _same(md, pickle.loads(pickle.dumps(md)))
+
+
+def test_pickle_harmonization():
+    modes = Modal().mode_harmonization('♭E', 'harmonic minor', 0)
+    for md, restored in zip(modes, pickle.loads(pickle.dumps(modes))):
+        _same(md, restored)
+
+
+def test_copy():
+    md = Modal().get_mode('G', 'major', 1)
+    _same(md, copy.copy(md))
+    _same(md, copy.deepcopy(md))
+    chord = md.chord('7th_chord')
+    assert copy.copy(chord).name == chord.name
@@ -0,0 +1,17 @@
+import copy
+import pickle
+
+from modal.pitchclass import PitchClassSet
+
+
+def test_pickle_round_trip():
+    pcs = PitchClassSet.from_intervals([0, 2, 4, 5, 7, 9, 11])
+    restored = pickle.loads(pickle.dumps(pcs))
+    assert restored == pcs
+    assert restored.mask == pcs.mask
+
+
+def test_copy():
+    pcs = PitchClassSet.from_intervals([0, 4, 7])
+    assert copy.copy(pcs) == pcs
+    assert copy.deepcopy(pcs) == pcs
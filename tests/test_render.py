@@ -0,0 +1,22 @@
+import json
+
+from modal.modal import Modal
+from modal.render import Renderer
+
+
+def test_templates_follow_register_scale():
+    modal = Modal()
+    Modal.register_scale('test render', [0, 2, 4, 6, 8, 10])
+    assert '|VI|' in modal.print_mode_harmonization('C', 'test render', 0)
+    Modal.register_scale('test render', [0, 3, 7, 10])
+    table = modal.print_mode_harmonization('C', 'test render', 0)
+    assert '| Chord |i|II|III|IV|\n' in table
+
+
+def test_json_missing_chord_is_null():
+    Modal.register_scale('test json', [0, 4, 7])
+    table = json.loads(Renderer().render('C', 'test json', 0, fmt='json'))
+    assert table['triad'][0] == 'Cmaj'
+    assert table['7th'] == [None, None, None]
+    markdown = Renderer().render('C', 'test json', 0)
+    assert 'None' not in markdown
@@ -0,0 +1,54 @@
+import itertools
+
+from modal.search import ProgressionSearch
+
+
+def _brute(search: ProgressionSearch, start=None, ends=(), transitions=None, repeat=False, distinct=False,
+           min_levels=None) -> set:
+    options = [(d, search.levels[i]) for d, found in enumerate(search._options) for i in found]
+    result = set()
+    for steps in itertools.product(options, repeat=search.length):
+        degrees = [d for d, _ in steps]
+        if start is not None and degrees[0] not in start:
+            continue
+        if ends and not any(tuple(degrees[len(degrees) - len(e):]) == e for e in ends):
+            continue
+        pairs = list(zip(degrees, degrees[1:]))
+        if not repeat and any(a == b for a, b in pairs):
+            continue
+        if transitions is not None and any(p not in transitions for p in pairs):
+            continue
+        if distinct and len(set(degrees)) < len(degrees):
+            continue
+        if any(sum(lv == level for _, lv in steps) < n for level, n in (min_levels or {}).items()):
+            continue
+        result.add(steps)
+    return result
+
+
+def test_matches_brute_force():
+    transitions = {(a, b) for a in range(7) for b in range(7) if (b - a) % 7 in (1, 3, 4)}
+    cases = [
+        dict(),
+        dict(start=(0,), ends=((4, 0), (3, 0))),
+        dict(transitions=transitions, min_levels={'7th_chord': 2}),
+        dict(distinct=True, ends=((1, 4, 0),)),
+        dict(repeat=True, start=(5,)),
+    ]
+    for case in cases:
+        search = ProgressionSearch(length=4, start=case.get('start'), end=list(case.get('ends', ())) or None,
+                                   transitions=sorted(case['transitions']) if 'transitions' in case else None,
+                                   repeat=case.get('repeat', False), distinct=case.get('distinct', False),
+                                   min_levels=case.get('min_levels'))
+        expected = _brute(search, **case)
+        found = list(search.steps())
+        assert len(found) == len(set(found)) and set(found) == expected, case
+        assert search.count() == len(expected)
+
+
+def test_progressions_and_workers():
+    search = ProgressionSearch(length=3, end='authentic', levels=('triad_chord',))
+    assert list(search) == [('Cmaj', 'Gmaj', 'Cmaj'), ('Dm', 'Gmaj', 'Cmaj'), ('Em', 'Gmaj', 'Cmaj'),
+                            ('Fmaj', 'Gmaj', 'Cmaj'), ('Am', 'Gmaj', 'Cmaj'), ('Bdim', 'Gmaj', 'Cmaj')]
+    search = ProgressionSearch(length=5, end='ii-V-I', min_levels={'7th_chord': 1})
+    assert search.count(workers=2) == search.count() == sum(1 for _ in search.steps())
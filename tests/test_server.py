@@ -0,0 +1,110 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+from modal.chord import Chord
+from modal.server import Service, serve
+
+
+async def _exchange(port: int, data: bytes) -> bytes:
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(data)
+    writer.write_eof()
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return response
+
+
+def _run(service: Service, *payloads) -> list:
+    async def main():
+        server = await serve(port=0, service=service)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return [await _exchange(port, payload) for payload in payloads]
+    return asyncio.run(main())
+
+
+def _lines(data: bytes) -> list:
+    return [json.loads(line) for line in data.splitlines()]
+
+
+def test_ndjson_and_cache():
+    service = Service()
+    request = json.dumps({'id': 1, 'method': 'get_mode', 'params': {'root': 'D', 'mode': 1}}).encode() + b'\n'
+    first, second = _run(service, request, request * 2)
+    assert _lines(first)[0]['result']['mode name'] == 'D dorian'
+    assert [r['id'] for r in _lines(second)] == [1, 1]
+    assert service.stats['misses'] == 1 and service.stats['hits'] == 2
+
+
+def test_http():
+    body = json.dumps({'root': 'G', 'scale': 'major'}).encode()
+    request = b'POST /mode_harmonization HTTP/1.1\r\nContent-Length: %d\r\nConnection: close\r\n\r\n' % len(body)
+    response, = _run(Service(), request + body)
+    head, payload = response.split(b'\r\n\r\n', 1)
+    assert head.startswith(b'HTTP/1.1 200')
+    assert [md['7th_chord'] for md in json.loads(payload)['result']][:2] == ['Gmaj7', 'Am7']
+
+
+def test_long_lines():
+    service = Service(max_line=1024)
+    ok = json.dumps({'id': 2, 'method': 'modes_name'}).encode() + b'\n'
+    long_ndjson, long_header, after = _run(service, b'x' * 4096 + b'\n',
+                                           b'GET /health HTTP/1.1\r\nX: ' + b'y' * 4096 + b'\r\n\r\n', ok)
+    assert _lines(long_ndjson) == [{'id': None, 'error': 'Request line too long.'}]
+    assert long_header.startswith(b'HTTP/1.1 400')
+    assert _lines(after)[0]['result'][0] == 'ionian'
+
+
+def test_batch():
+    service = Service(max_pending=3)
+    item = {'method': 'get_mode', 'params': {'root': 'E'}}
+    batch = {'id': 3, 'method': 'batch', 'params': {'requests': [item, item, {'method': 'batch'}]}}
+    too_big = {'id': 4, 'method': 'batch', 'params': {'requests': [item] * 4}}
+    response, = _run(service, (json.dumps(batch) + '\n' + json.dumps(too_big) + '\n').encode())
+    answers = sorted(_lines(response), key=lambda answer: answer['id'])
+    results = answers[0]['result']
+    assert results[0]['result'] == results[1]['result'] and 'nested' in results[2]['error']
+    assert service.stats['misses'] == 1 and service.stats['hits'] + service.stats['coalesced'] == 1
+    assert answers[1]['overloaded']
+
+
+def test_workers_use_registered_chords():
+    Chord.register_chord('M7srv', [0, 4, 7, 11], priority=10)
+    try:
+        service = Service(workers=1)
+        try:
+            request = json.dumps({'id': 5, 'method': 'get_mode', 'params': {'root': 'F'}}).encode() + b'\n'
+            response, = _run(service, request)
+        finally:
+            service.close()
+    finally:
+        Chord.unregister_chord('M7srv')
+    assert _lines(response)[0]['result']['7th_chord'] == 'FM7srv'
+
+
+def test_serve_command(tmp_path):
+    path = str(tmp_path / 'modal.sock')
+    process = subprocess.Popen([sys.executable, '-m', 'modal', 'serve', '--socket', path],
+                               cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    try:
+        for _ in range(100):
+            if os.path.exists(path):
+                break
+            time.sleep(0.05)
+
+        async def query():
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(b'{"id": 6, "method": "modes_name", "params": {"scale": "harmonic minor"}}\n')
+            line = await reader.readline()
+            writer.close()
+            return json.loads(line)
+
+        assert asyncio.run(query())['result'][4] == 'phrygian dominant'
+    finally:
+        process.terminate()
+        process.wait()
@@ -0,0 +1,40 @@
+import pytest
+
+from modal.modal import Modal
+from modal.spelling import pitch_class, normalize, spell
+
+
+def test_heptatonic():
+    assert spell('D', [0, 2, 4, 5, 7, 9, 11]) == ['D', 'E', '♯F', 'G', 'A', 'B', '♯C']
+    assert spell('♭E', [0, 2, 3, 5, 7, 8, 11]) == ['♭E', 'F', '♭G', '♭A', '♭B', '♭C', 'D']
+
+
+def test_pentatonic():
+    assert spell('E', [0, 2, 4, 7, 9]) == ['E', '♯F', '♯G', 'B', '♯C']
+    assert spell('C', [0, 3, 5, 7, 10]) == ['C', '♭E', 'F', 'G', '♭B']
+    assert spell('♯F', [0, 2, 4, 7, 9]) == ['♯F', '♯G', '♯A', '♯C', '♯D']
+
+
+def test_other_sizes():
+    # no two consecutive degrees on the same letter where an alternative spelling avoids it
+    assert spell('C', [0, 3, 4, 7, 8, 11]) == ['C', '♯D', 'E', 'G', '♭A', 'B']
+    assert spell('C', [0, 2, 4, 6, 8, 10]) == ['C', 'D', 'E', '♯F', '♭A', '♭B']
+    assert spell('C', range(12)) == ['C', '♭D', 'D', '♭E', 'E', 'F', '♯F', 'G', '♭A', 'A', '♭B', 'B']
+
+
+def test_registered_scale_notes():
+    Modal.register_scale('test pentatonic', [0, 2, 4, 7, 9])
+    assert Modal().get_mode('E', 'test pentatonic', 0).notes.tolist() == ['E', '♯F', '♯G', 'B', '♯C']
+
+
+@pytest.mark.parametrize('name, pc', [('C#', 1), ('Db', 1), ('♭D', 1), ('D♭', 1), ('F##', 7), ('♭♭B', 9), ('E', 4)])
+def test_accepted(name, pc):
+    assert pitch_class(name) == pc
+
+
+@pytest.mark.parametrize('name', ['bE', '#F', 'bbB', 'H', 'E#b', ''])
+def test_rejected(name):
+    with pytest.raises(Exception, match='Not valid note'):
+        pitch_class(name)
+    with pytest.raises(Exception, match='Not valid note'):
+        normalize(name)
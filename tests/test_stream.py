@@ -0,0 +1,23 @@
+from modal.stream import identify, label_events
+
+
+def test_identify():
+    # C E G B♭: C7, whatever the bass
+    assert identify(0b10010010001) == (0, '7')
+    # C E A is both Am and (in this vocabulary) Caug: the bass decides, then the lowest root
+    assert identify(0b1000010001, bass=9) == (9, 'm')
+    assert identify(0b1000010001) == (0, 'aug')
+    assert identify(0b11) == (None, None)
+
+
+def test_label_events():
+    events = [(0, 60, True), (0, 64, True), (0, 67, True),
+              (480, 60, False), (480, 64, False), (480, 67, False),
+              (480, 57, True), (480, 60, True), (480, 64, True),
+              (960, 57, False), (960, 60, False), (960, 64, False)]
+    assert list(label_events(events)) == [(0, 480, 'C', 'maj'), (480, 960, 'A', 'm')]
+
+
+def test_label_events_skips_unrecognized():
+    events = [(0, 60, True), (10, 61, True), (20, 61, False), (20, 64, True), (20, 67, True), (30, 60, False)]
+    assert list(label_events(events)) == [(20, 30, 'C', 'maj')]
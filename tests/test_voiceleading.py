@@ -0,0 +1,35 @@
+import itertools
+
+import numpy as np
+
+from modal.chord import Chord
+from modal.voiceleading import VoiceLeader, movement, parallel_fifths
+
+
+def test_solve_is_optimal():
+    leader = VoiceLeader(kinds=('close', 'drop2'), low=55, high=72)
+    progression = ['Dm7', 'G7', 'Cmaj7']
+    solved = leader.solve(progression)
+    candidates = solved['candidates']
+    matrices = [leader.cost_matrix(a, b) for a, b in zip(candidates, candidates[1:])]
+    unary = leader._unary(candidates[0])
+    best = min(unary[p[0]] + sum(m[i, j] for m, i, j in zip(matrices, p, p[1:]))
+               for p in itertools.product(*(range(len(c)) for c in candidates)))
+    assert np.isclose(solved['cost'], best)
+    assert [v.tolist() for v in solved['voicings']] == [c[p].tolist() for c, p in zip(candidates, solved['path'])]
+
+
+def test_candidates():
+    leader = VoiceLeader(kinds=('close', 'rootless'), low=48, high=72)
+    candidates = leader.candidates('G7')
+    assert candidates.shape[1] == 4
+    assert set((candidates % 12).ravel().tolist()) <= {7, 11, 2, 5}
+    assert leader.candidates((7, Chord.symbol_mask('7'))).tolist() == candidates.tolist()
+
+
+def test_terms():
+    a = np.array([[48, 55, 64]])
+    assert movement(a, a + 2).tolist() == [[6.0]]
+    # C-G moving in parallel to D-A
+    assert parallel_fifths(np.array([[48, 55]]), np.array([[50, 57]])).tolist() == [[1]]
+    assert parallel_fifths(np.array([[48, 55]]), np.array([[47, 55]])).tolist() == [[0]]
@@ -0,0 +1,31 @@
+import numpy as np
+
+from modal import voicing
+from modal.chord import Chord
+
+
+def test_pattern():
+    mask = Chord.symbol_mask('maj7')
+    assert voicing.pattern(mask, 'close').tolist() == [[0, 4, 7, 11], [4, 7, 11, 12], [7, 11, 12, 16],
+                                                       [11, 12, 16, 19]]
+    assert voicing.pattern(mask, 'drop2').tolist()[0] == [-5, 0, 4, 11]
+    assert voicing.pattern(mask, 'rootless').tolist()[0] == [4, 7, 11]
+    assert voicing.pattern(mask, 'spread', max_span=23).tolist() == [[0, 16, 19, 23]]
+    # drop voicings need four notes
+    assert voicing.pattern(Chord.symbol_mask('m'), 'drop2').shape == (0, 0)
+
+
+def test_voicings_in_range():
+    found = voicing.voicings('D', Chord.symbol_mask('maj7'), 'close', low=60, high=75)
+    assert found.tolist() == [[61, 62, 66, 69], [62, 66, 69, 73], [66, 69, 73, 74]]
+    wide = voicing.voicings('D', Chord.symbol_mask('maj7'), 'drop3', low=36, high=84)
+    assert wide.min() >= 36 and wide.max() <= 84
+    assert (np.diff(wide, axis=1) >= 0).all()
+    assert set((wide % 12).ravel().tolist()) == {1, 2, 6, 9}
+
+
+def test_mode_voicings():
+    found = voicing.mode_voicings('C', 'major', 0, kinds=('close',))
+    assert [symbol for symbol, _ in found] == ['Cmaj7', 'Dm7', 'Em7', 'Fmaj7', 'G7', 'Am7', 'Bm7♭5']
+    g7 = found[4][1]['close']
+    assert set((g7 % 12).ravel().tolist()) == {7, 11, 2, 5}